@@ -34,8 +34,10 @@ setup(
       license='AGPLv3',
       packages=['openbandparams',
                 'openbandparams.tests',
-                'openbandparams.examples'],
+                'openbandparams.examples',
+                'openbandparams.benchmarks'],
       package_dir={'openbandparams': 'src/openbandparams'},
+      install_requires=['numpy'],
       test_suite='openbandparams.tests',
       zip_safe=True,
       use_2to3=True,
@@ -18,10 +18,17 @@
 #
 #############################################################################
 
+import importlib
+import sys
+
 from . import version
 from .version import __version__
 __all__ = ['__version__']
 
+from . import dual
+__all__ += dual.__all__
+from .dual import *
+
 from . import parameter
 __all__ += parameter.__all__
 from .parameter import *
@@ -46,14 +53,41 @@ from . import iii_v_zinc_blende_quaternary
 __all__ += iii_v_zinc_blende_quaternary.__all__
 from .iii_v_zinc_blende_quaternary import *
 
-from . import iii_v_zinc_blende_binaries
-__all__ += iii_v_zinc_blende_binaries.__all__
-from .iii_v_zinc_blende_binaries import *
+# The built-in alloys are constructed when they are first used, rather than
+# when openbandparams is imported, by importing the module that defines
+# them (see `__getattr__`). Their names are read from a generated index of
+# their modules' `__all__`, so that the alloys aren't needed for `__all__`.
+from ._alloy_index import alloy_modules as _alloy_modules
+_alloy_module_names = {}
+for _module_name, _names in _alloy_modules:
+    __all__ += _names
+    for _name in _names:
+        _alloy_module_names[_name] = _module_name
+
+
+def _import_alloys(module_name):
+    '''
+    Imports the module of built-in alloys with the given name, and adds the
+    alloys to this package. This replaces the module itself as an attribute
+    of the package, since each module exports a list of its alloys with the
+    same name.
+    '''
+    module = importlib.import_module('.' + module_name, __name__)
+    for name in module.__all__:
+        globals()[name] = getattr(module, name)
+
 
-from . import iii_v_zinc_blende_ternaries
-__all__ += iii_v_zinc_blende_ternaries.__all__
-from .iii_v_zinc_blende_ternaries import *
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _alloy_module_names:
+            raise AttributeError('module {!r} has no attribute {!r}'
+                                 ''.format(__name__, name))
+        _import_alloys(_alloy_module_names[name])
+        return globals()[name]
 
-from . import iii_v_zinc_blende_quaternaries
-__all__ += iii_v_zinc_blende_quaternaries.__all__
-from .iii_v_zinc_blende_quaternaries import *
+    def __dir__():
+        return sorted(set(globals()) | set(_alloy_module_names))
+else:
+    # module `__getattr__` requires Python 3.7 (PEP 562)
+    for _module_name, _names in _alloy_modules:
+        _import_alloys(_module_name)
@@ -0,0 +1,94 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+The names that each module of built-in alloys exports (its `__all__`), so
+that the package can list the alloys without constructing them (see
+`openbandparams.__getattr__`).
+
+`alloy_modules` is generated from the modules of alloys, and must be
+regenerated when alloys are added or removed, by running::
+
+    python -m openbandparams._alloy_index
+
+`tests.test_package` checks that it is up to date. New modules of alloys are
+added by adding their names to `alloy_modules`, with empty lists of names,
+and regenerating it.
+'''
+
+alloy_modules = [
+    ('iii_v_zinc_blende_binaries', [
+        'iii_v_zinc_blende_binaries', 'AlN', 'GaN', 'InN', 'AlP', 'GaP', 'InP',
+        'AlAs', 'GaAs', 'InAs', 'AlSb', 'GaSb', 'InSb']),
+    ('iii_v_zinc_blende_ternaries', [
+        'iii_v_zinc_blende_ternaries', 'AlGaN', 'AlInN', 'GaInN', 'AlGaP',
+        'AlInP', 'GaInP', 'AlGaAs', 'AlInAs', 'GaInAs', 'AlGaSb', 'AlInSb',
+        'GaInSb', 'AlNP', 'GaNP', 'InNP', 'AlNAs', 'GaNAs', 'InNAs', 'AlPAs',
+        'GaPAs', 'InPAs', 'AlPSb', 'GaPSb', 'InPSb', 'AlAsSb', 'GaAsSb',
+        'InAsSb']),
+    ('iii_v_zinc_blende_quaternaries', [
+        'iii_v_zinc_blende_quaternaries', 'AlNPAs', 'AlPAsSb', 'GaNPAs',
+        'GaPAsSb', 'InNPAs', 'InPAsSb', 'AlGaInN', 'AlGaInP', 'AlGaInAs',
+        'AlGaInSb', 'AlGaNP', 'AlInNP', 'GaInNP', 'AlGaNAs', 'AlInNAs',
+        'GaInNAs', 'AlGaPAs', 'AlInPAs', 'GaInPAs', 'AlGaPSb', 'AlInPSb',
+        'GaInPSb', 'AlGaAsSb', 'AlInAsSb', 'GaInAsSb']),
+]
+
+
+def get_alloy_modules():
+    '''
+    Returns the names that each module of built-in alloys exports, by
+    importing the modules, as a list of (module name, names) pairs.
+    '''
+    import importlib
+    return [(module_name, list(importlib.import_module(
+                'openbandparams.' + module_name).__all__))
+            for module_name, _ in alloy_modules]
+
+
+def get_source():
+    '''
+    Returns the source of `alloy_modules`, as generated from the modules.
+    '''
+    import textwrap
+    lines = ['alloy_modules = [']
+    for module_name, names in get_alloy_modules():
+        lines.append("    ('{}', [".format(module_name))
+        lines.extend(textwrap.wrap(
+            ', '.join("'{}'".format(name) for name in names) + ']),',
+            width=79, initial_indent=' ' * 8, subsequent_indent=' ' * 8,
+            break_on_hyphens=False))
+    lines.append(']')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    '''
+    Regenerates `alloy_modules` in this file.
+    '''
+    with open(__file__) as f:
+        source = f.read()
+    start = source.index('alloy_modules = [')
+    end = source.index('\n]\n', start) + len('\n]\n')
+    with open(__file__, 'w') as f:
+        f.write(source[:start] + get_source() + source[end:])
+
+
+if __name__ == '__main__':
+    main()
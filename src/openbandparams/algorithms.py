@@ -19,55 +19,46 @@
 #############################################################################
 
 
-def sign(x):
-    """
-    Returns -1, 0, or 1 if `x` is negative, zero, or positive, respectively.
-    """
-    return cmp(x, 0)
+import numpy
+
+
+# bisect has moved to the roots module, and is imported here for
+# backwards compatibility
+from .roots import bisect
 
 
-def bisect(func, a, b, xtol=1e-12, maxiter=100):
+def quadratic_root(a, b, c, lower=0., upper=1., tol=1e-9):
     """
-    Finds the root of `func` using the bisection method.
+    Returns the root of `a*x**2 + b*x + c` that lies within
+    `[lower, upper]`, or `nan` if there is none. If `a` is zero, the root
+    of `b*x + c` is returned instead, and if `a` and `b` are both zero,
+    `lower` is returned.
 
-    Requirements
-    ------------
-    - func must be continuous function that accepts a single number input
-      and returns a single number
-    - `func(a)` and `func(b)` must have opposite sign
+    The coefficients may be arrays, in which case they are broadcast
+    against each other and an array of roots is returned.
 
     Parameters
     ----------
-    func : function
-        the function that we want to find the root of
-    a : number
-        one of the bounds on the input
-    b : number
-        the other bound on the input
-    xtol : number, optional
-        the solution tolerance of the input value. The algorithm is
-        considered converged if `abs(b-a)2. < xtol`
-    maxiter : number, optional
-        the maximum number of iterations allowed for convergence
+    a, b, c : number or array
+        the quadratic, linear and constant coefficients
+    lower : number, optional
+        the lower bound on the root
+    upper : number, optional
+        the upper bound on the root
+    tol : number, optional
+        roots within `tol` outside of the bounds are clipped to the bounds,
+        which allows for rounding errors at the ends of the interval
     """
-    fa = func(a)
-    if fa == 0.:
-        return a
-
-    fb = func(b)
-    if fb == 0.:
-        return b
-
-    assert sign(fa) != sign(fb)
-
-    for i in xrange(maxiter):
-        c = (a + b) / 2.
-        fc = func(c)
-        if fc == 0. or abs(b - a) / 2. < xtol:
-            return c
-        if sign(fc) == sign(func(a)):
-            a = c
-        else:
-            b = c
-    else:
-        raise RuntimeError('Failed to converge after %d iterations.' % maxiter)
+    a, b, c = numpy.broadcast_arrays(*[numpy.asarray(v, dtype=float)
+                                       for v in (a, b, c)])
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        # numerically stable form of the quadratic formula
+        sqrt_disc = numpy.sqrt(b * b - 4. * a * c)
+        q = -0.5 * (b + numpy.where(b < 0., -sqrt_disc, sqrt_disc))
+        linear = numpy.where(b == 0., lower, -c / b)
+        root1 = numpy.where(a == 0., linear, q / a)
+        root2 = numpy.where(a == 0., linear, c / q)
+    in_range1 = (lower - tol <= root1) & (root1 <= upper + tol)
+    in_range2 = (lower - tol <= root2) & (root2 <= upper + tol)
+    root = numpy.select([in_range1, in_range2], [root1, root2], numpy.nan)
+    return numpy.clip(root, lower, upper)[()]
@@ -18,18 +18,74 @@
 #
 #############################################################################
 
-from .parameter import Parameter, MethodParameter
+import numpy
 
-__all__ = ['Alloy']
+from .parameter import Parameter, MethodParameter, descriptions
+from .cache import LRUCache
+from .dual import Dual
 
+__all__ = ['Alloy', 'MissingParameterError']
 
-class Alloy(object):
+
+class MissingParameterError(AttributeError):
+    '''
+    Raised when a parameter, or a parameter that it depends on, is not
+    defined for an alloy.
+    '''
+
+
+class AlloyType(type):
+    '''
+    The metaclass of alloys, which registers the parameters defined with
+    each class (including those inherited from its bases) when the class is
+    created, so they can be listed and looked up without searching the
+    attributes of the class.
+    '''
+    def __init__(cls, name, bases, attributes):
+        super(AlloyType, cls).__init__(name, bases, attributes)
+        parameters = {}
+        for base in reversed(cls.__mro__):
+            for key, value in vars(base).items():
+                if isinstance(value, Parameter):
+                    parameters[key] = value
+                else:
+                    # overridden by an attribute that isn't a parameter
+                    parameters.pop(key, None)
+        cls._class_parameters = parameters
+        cls._class_parameter_names = tuple(sorted(parameters))
+
+# Python 2 and 3 use different syntax for metaclasses, so create the base
+# class by calling the metaclass directly
+_AlloyBase = AlloyType('_AlloyBase', (object,), {})
+
+
+class Alloy(_AlloyBase):
 
     def __init__(self, name, elements, parameters=None):
         self.name = name
         self.elements = elements
         self._parameters = {}
         self._aliases = {}
+        # True if `_parameters` and `_aliases` are shared with other alloys,
+        # in which case they are copied before they are modified
+        self._parameters_shared = False
+        # MethodParameters bound to this Alloy lazily, on first access
+        self._bound_parameters = {}
+        # incremented whenever a parameter is added, to invalidate the
+        # cached parameter values of this and any derived alloys
+        self._version = 0
+        self._cache = None
+        self._lineage = None
+        # values memoized while evaluating several parameters at once
+        # (see `evaluate`)
+        self._memo = None
+        # evaluation plans, by the names they were requested for
+        self._plans = {}
+        # the references of MethodParameters (see `_get_references`), and
+        # the versions of the alloys they were found from, by parameter
+        # name. This is shared with instances of the alloy until either
+        # adds a parameter.
+        self._references = {}
         if parameters is not None:
             for parameter in parameters:
                 self.set_parameter(parameter)
@@ -40,26 +96,51 @@ class Alloy(object):
                 self.elements == other.elements,
                 self._parameters == other._parameters)
     
-    def __getattribute__(self, name):
-        if name in ['_parameters', '_aliases']:
-            return super(Alloy, self).__getattribute__(name)
-        if name in self._parameters:
-            return self._parameters[name]
-        elif name in self._aliases:
-            return self._parameters[self._aliases[name]]
-        
-        try:
-            item = super(Alloy, self).__getattribute__(name)
-        except AttributeError as e:
-            msg = e.message.replace('object',
-                                    "object '{}'".format(self.name))
-            raise AttributeError(msg)
-        if isinstance(item, MethodParameter):
-            # make sure MethodParameters defined with the class
-            # are bound to this Alloy
-            return item.bind(alloy=self)
+    def __getattr__(self, name):
+        # This is only called if the normal attribute lookup fails, i.e. for
+        # parameters that were added to the alloy, rather than defined with
+        # the class. Parameters defined with the class are looked up by
+        # `MethodParameter.__get__`.
+        item = self._get_added_parameter(name)
+        if item is None:
+            # the names of known parameters are missing parameters
+            error = (MissingParameterError if name in descriptions
+                     else AttributeError)
+            raise error("'{}' object '{}' has no attribute '{}'"
+                        "".format(type(self).__name__,
+                                  self.__dict__.get('name'), name))
+        return item
+
+    def _get_added_parameter(self, name):
+        '''
+        Returns the parameter that was added to the alloy with the given name
+        or alias, or None if there isn't one.
+        '''
+        # use __dict__ directly, so this works before __init__ is finished
+        attributes = self.__dict__
+        parameters = attributes.get('_parameters')
+        if parameters is None:
+            return None
+        if name in parameters:
+            return self._bind(parameters[name])
+        aliases = attributes['_aliases']
+        if name in aliases:
+            return self._bind(parameters[aliases[name]])
+        return None
+
+    def _bind(self, parameter):
+        '''
+        Returns `parameter`, bound to this alloy if it is a MethodParameter.
+        MethodParameters may be defined with the class or shared with other
+        alloys, so each of them is bound only once, when first accessed.
+        '''
+        if isinstance(parameter, MethodParameter):
+            bound_parameters = self._bound_parameters
+            if parameter.name not in bound_parameters:
+                bound_parameters[parameter.name] = parameter.bind(alloy=self)
+            return bound_parameters[parameter.name]
         else:
-            return item
+            return parameter
 
     def __str__(self):
         return self.name
@@ -79,16 +160,314 @@ class Alloy(object):
         '''
         raise NotImplementedError()
 
+    def _get_parents(self):
+        '''
+        Returns a list of the alloys that this alloy's parameters are derived
+        from, e.g. the binaries of a ternary.
+        '''
+        return []
+
+    def _get_lineage(self):
+        '''
+        Returns a list of this alloy and all of the alloys that its
+        parameters are derived from, directly or indirectly (no duplicates).
+        '''
+        lineage = [self]
+        for parent in self._get_parents():
+            for alloy in parent._get_lineage():
+                if not any(alloy is a for a in lineage):
+                    lineage.append(alloy)
+        return lineage
+
+    def enable_cache(self, maxsize=128):
+        '''
+        Enables caching of the values returned by the `MethodParameter`s of
+        this alloy, keyed by the parameter name and the keyword arguments.
+        At most `maxsize` values are kept, and the least recently used values
+        are evicted first.
+
+        The cache is cleared whenever a parameter is added to this alloy, or
+        to any of the alloys its parameters are derived from (e.g. the
+        binaries of a ternary). Values computed with unhashable keyword
+        arguments (e.g. arrays) are not cached, and cached arrays are made
+        read-only, since they are shared between calls.
+        '''
+        self._cache = LRUCache(maxsize)
+        self._lineage = self._get_lineage()
+
+    def disable_cache(self):
+        '''
+        Disables caching of parameter values, and discards the cache.
+        '''
+        self._cache = None
+        self._lineage = None
+
+    def clear_cache(self):
+        '''
+        Clears the cached parameter values, if caching is enabled.
+        '''
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _call_cached(self, parameter, kwargs):
+        '''
+        Returns the value of the bound `MethodParameter`, `parameter`, from
+        the cache if possible, or computes and caches it, otherwise.
+        '''
+        key = self._get_cache_key(parameter, kwargs)
+        if key is None:
+            return parameter.method(self, **kwargs)
+        cache = self._cache
+        cache.validate(tuple(alloy._version for alloy in self._lineage))
+        if key in cache:
+            return cache.get(key)
+        value = parameter.method(self, **kwargs)
+        if isinstance(value, numpy.ndarray):
+            value.setflags(write=False)
+        cache.set(key, value)
+        return value
+
+    def _get_cache_key(self, parameter, kwargs, by_id=False):
+        '''
+        Returns the key that the value of `parameter` is cached by, with the
+        default temperature filled in, so that e.g. `Eg()` and `Eg(T=300.)`
+        share a value. Returns None if any of the keyword arguments is an
+        array or is otherwise unhashable, since those aren't cached, unless
+        `by_id` is True, in which case they are identified by their ids
+        instead (see `_call_memoized`).
+        '''
+        items = []
+        for name, value in kwargs.items():
+            if isinstance(value, numpy.ndarray) and value.ndim == 0:
+                value = value[()]
+            try:
+                hash(value)
+            except TypeError:
+                if not by_id:
+                    return None
+                value = id(value)
+            items.append((name, value))
+        if 'T' not in kwargs:
+            items.append(('T', 300.))
+        return (parameter.name, tuple(sorted(items)))
+
+    def _call_memoized(self, parameter, kwargs):
+        '''
+        Returns the value of the bound `MethodParameter`, `parameter`, from
+        the memo of the current `evaluate` call if possible, or computes and
+        memoizes it, otherwise. The memo is keyed like the cache (see
+        `_get_cache_key`), except that unhashable values, such as arrays,
+        are identified by their ids (the memo keeps them alive, so their
+        ids aren't reused).
+        '''
+        key = (id(self),) + self._get_cache_key(parameter, kwargs,
+                                                 by_id=True)
+        memo = self._memo
+        if key in memo:
+            return memo[key][0]
+        value = parameter.method(self, **kwargs)
+        memo[key] = (value, kwargs)
+        return value
+
+    def _get_references(self, parameter):
+        '''
+        Returns a tuple of the references of the bound `MethodParameter`,
+        `parameter`, and of the parameters it depends on, in this alloy and
+        in its binaries and ternaries (no duplicates).
+
+        The references are indexed by parameter name, and found again only
+        if a parameter has been added to this alloy or to any of the alloys
+        it is derived from.
+        '''
+        versions = tuple(alloy._version for alloy in self._get_lineage()[1:])
+        entry = self._references.get(parameter.name)
+        if entry is None or entry[1] != versions:
+            entry = (self._find_references(parameter), versions)
+            self._references[parameter.name] = entry
+        return entry[0]
+
+    def _find_references(self, parameter):
+        parents = (list(getattr(self, 'binaries', ())) +
+                   list(getattr(self, 'ternaries', ())))
+        references = []
+        found = set()
+        visited = set()
+
+        def add(refs):
+            for ref in refs:
+                if ref not in found:
+                    found.add(ref)
+                    references.append(ref)
+
+        def visit(parameter):
+            visited.add(parameter.name)
+            add(parameter._references)
+            for name in parameter.dependencies:
+                p = self.get_parameter(name, default=None)
+                # dependencies that would be circular are on the alloys this
+                # alloy is derived from (see `get_evaluation_plan`)
+                if p is None or p.name in visited:
+                    continue
+                if isinstance(p, MethodParameter):
+                    visit(p)
+                else:
+                    add(p.get_references())
+            for alloy in parents:
+                for name in parameter.dependencies:
+                    p = alloy.get_parameter(name, default=None)
+                    if p is not None:
+                        add(p.get_references())
+
+        visit(parameter)
+        return tuple(references)
+
+    def get_evaluation_plan(self, names):
+        '''
+        Returns the names of the parameters of this alloy that the named
+        parameters depend on, including themselves, ordered such that every
+        parameter comes after the parameters it depends on (as declared by
+        `method_parameter`).
+        '''
+        key = tuple(names)
+        if key not in self._plans:
+            self._plans[key] = self._get_evaluation_plan(names)
+        return list(self._plans[key])
+
+    def _get_evaluation_plan(self, names):
+        plan = []
+        visiting = set()
+        planned = set()
+
+        def visit(name):
+            parameter = self.get_parameter(name, default=None)
+            if parameter is None:
+                raise MissingParameterError(
+                    '"{}" is missing a required parameter: "{}".'
+                    ''.format(self.name, name))
+            name = parameter.name
+            if name in planned:
+                return
+            visiting.add(name)
+            for dependency in getattr(parameter, 'dependencies', ()):
+                # dependencies that would be circular, including those on
+                # the parameter itself, are on the alloys this alloy is
+                # derived from, e.g. the binaries of a ternary
+                if (dependency not in visiting and
+                        self.get_parameter(dependency) is not None):
+                    visit(dependency)
+            visiting.remove(name)
+            planned.add(name)
+            plan.append(name)
+
+        for name in names:
+            visit(name)
+        return plan
+
+    def evaluate(self, names, **kwargs):
+        '''
+        Returns a dictionary of the values of the named parameters, evaluated
+        with the keyword arguments, `kwargs` (e.g. `T`).
+
+        The parameters and everything they depend on are evaluated in the
+        order given by `get_evaluation_plan`, and each is evaluated only
+        once, for this alloy and the alloys it is derived from, rather than
+        once for every parameter that uses it. `kwargs` may include arrays.
+
+        Examples
+        --------
+        >>> values = GaInAs(x=0.47).evaluate(['Eg', 'CBO', 'VBO'], T=77.)
+        >>> values['Eg']
+        '''
+        plan = self.get_evaluation_plan(names)
+        lineage = [alloy for alloy in self._get_lineage()
+                   if alloy._memo is None]
+        memo = {}
+        for alloy in lineage:
+            alloy._memo = memo
+        try:
+            for name in plan:
+                getattr(self, name)(**kwargs)
+            return dict((name, getattr(self, name)(**kwargs))
+                        for name in names)
+        finally:
+            for alloy in lineage:
+                alloy._memo = None
+
+    def evaluate_table(self, names, **conditions):
+        '''
+        Returns a numpy structured array of the values of the named
+        parameters, with a field (column) for each of them.
+
+        The conditions are the composition, as accepted by `__call__` (e.g.
+        `x` and `y`, or `a` to lattice match), and the temperature, `T`, at
+        which the parameters are evaluated, and at which the alloy is lattice
+        matched. They may be arrays (or lists), which are broadcast against
+        each other to give the shape of the returned array. All of the
+        parameters are evaluated over the whole arrays at once, by
+        `evaluate`.
+
+        Examples
+        --------
+        >>> table = GaInAs.evaluate_table(['Eg', 'CBO'],
+        ...                               x=numpy.linspace(0, 1, 5), T=77.)
+        >>> table['Eg']
+        array([0.40737409, 0.59299198, 0.83823487, 1.14310276, 1.50759564])
+        '''
+        conditions = dict((key, numpy.asarray(value))
+                          for key, value in conditions.items())
+        kwargs = {}
+        if 'T' in conditions:
+            kwargs['T'] = conditions.pop('T')
+        composition = dict(conditions)
+        if 'a' in composition:
+            # lattice match at the same temperatures
+            composition.update(kwargs)
+        alloy = self._with_composition(**composition) if conditions else self
+        values = alloy.evaluate(names, **kwargs)
+        columns = numpy.broadcast_arrays(*([values[name] for name in names] +
+                                           list(conditions.values()) +
+                                           [kwargs.get('T', 300.)]))
+        table = numpy.empty(columns[-1].shape,
+                            dtype=[(name, numpy.result_type(column, float))
+                                   for name, column in zip(names, columns)])
+        for name, column in zip(names, columns):
+            table[name] = column
+        return table
+
+    def _copy(self):
+        '''
+        Returns a shallow copy of the alloy. The copy shares the parameters
+        of the original until either of them adds a parameter
+        (copy-on-write).
+        '''
+        alloy = object.__new__(type(self))
+        alloy.__dict__.update(self.__dict__)
+        alloy._bound_parameters = {}
+        alloy._version = 0
+        alloy._cache = None
+        alloy._lineage = None
+        alloy._memo = None
+        alloy._plans = {}
+        self._parameters_shared = True
+        alloy._parameters_shared = True
+        return alloy
+
     def _add_parameter(self, parameter):
         '''
         Force adds a `Parameter` object to the instance.
         '''
-        if isinstance(parameter, MethodParameter):
-            # create a bound instance of the MethodParameter
-            parameter = parameter.bind(alloy=self)
+        if self._parameters_shared:
+            self._parameters = dict(self._parameters)
+            self._aliases = dict(self._aliases)
+            self._parameters_shared = False
         self._parameters[parameter.name] = parameter
         for alias in parameter.aliases:
-            self._aliases[alias] = parameter
+            self._aliases[alias] = parameter.name
+        # MethodParameters are bound on access, so discard any stale binding
+        self._bound_parameters.pop(parameter.name, None)
+        self._plans.clear()
+        self._references = {}
+        self._version += 1
     
     def add_parameter(self, parameter, overload=False):
         '''
@@ -133,29 +512,73 @@ class Alloy(object):
         '''
         Returns True if the named parameter is present, or False, otherwise.
         '''
-        return self.get_parameter(name, default=None) is not None
+        return (name in self._parameters or name in self._aliases or
+                name in self._class_parameters)
     
     def get_parameter(self, name, default=None):
         '''
         Returns the named parameter if present, or the value of `default`,
         otherwise.
         '''
-        if hasattr(self, name):
-            item = getattr(self, name)
-            if isinstance(item, Parameter):
-                return item
+        item = self._get_added_parameter(name)
+        if item is not None:
+            return item
+        if name in self._class_parameters:
+            return getattr(self, name)
         return default
     
+    def _with_composition(self, **kwargs):
+        '''
+        Returns an instance of the alloy with the composition given by
+        `kwargs`, as accepted by `__call__`.
+        '''
+        raise TypeError('"{}" does not have a variable composition.'
+                        ''.format(self.name))
+
+    def _with_composition_variables(self, variable):
+        '''
+        Returns a copy of the alloy with each of its composition variables
+        replaced by `variable(name, value)` (e.g. a `Dual` number), and the
+        names of those variables. `value` is None if the composition has not
+        been specified. Alloys without composition variables return
+        themselves.
+        '''
+        return self, []
+
+    def differentiate(self, name, **kwargs):
+        '''
+        Returns the value of the named parameter and its derivatives with
+        respect to the composition variables of the alloy (e.g. 'x' for
+        ternaries, or 'x' and 'y' for quaternaries) and the temperature,
+        'T', as a `Dual` number.
+
+        The derivatives are found by forward-mode automatic differentiation,
+        so they are exact, and unaffected by the rounding of compositions.
+
+        Examples
+        --------
+        >>> Eg = GaInAs(x=0.47).differentiate('Eg', T=300.)
+        >>> Eg.value, Eg.derivative('x'), Eg.derivative('T')
+        '''
+        def variable(name, value):
+            if value is None:
+                raise TypeError('Alloy composition has not been specified.')
+            return Dual(value, {name: 1.})
+        alloy, variables = self._with_composition_variables(variable)
+        kwargs['T'] = Dual(kwargs.get('T', 300.), {'T': 1.})
+        value = getattr(alloy, name)(**kwargs)
+        if not isinstance(value, Dual):
+            value = Dual(value)
+        return value.expand(variables + ['T'])
+    
     def get_unique_parameters(self):
         '''
         Returns a list of the unique parameters (no duplicates).
         '''
         # start with parameters in the `_parameters` dictionary
-        parameters = self._parameters.values()
-        # add parameters defined with the class
-        for name in dir(self):
-            item = getattr(self, name)
-            if isinstance(item, Parameter):
-                if item.name not in self._parameters:
-                    parameters.append(item)
+        parameters = [getattr(self, name) for name in self._parameters]
+        # add parameters defined with the class, unless they were replaced
+        for name in self._class_parameter_names:
+            if name not in self._parameters and name not in self._aliases:
+                parameters.append(getattr(self, name))
         return parameters
\ No newline at end of file
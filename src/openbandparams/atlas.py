@@ -0,0 +1,283 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Exporting the parameters of many alloys, evaluated over a grid of
+compositions and temperatures, to an atlas, so that they can be looked up
+without importing openbandparams or evaluating them again.
+
+An atlas is a `.npz` file (a zip archive of `.npy` files, which is read
+with `numpy.load`). The values of each parameter of each alloy are stored
+in an array named '<alloy>/<parameter>', with the shape `(nT,)` for
+binaries, `(nx, nT)` for ternaries, and `(nx, nx, nT)` for quaternaries,
+where the first axis is x and the second is y. Compositions that are
+outside of the composition space of a quaternary (i.e. x + y > 1 for
+quaternaries of type 1 and 2) are filled with nan. Parameters that depend
+on a parameter that is missing for an alloy (e.g. the lattice parameters of
+the nitrides, which are missing thermal expansion coefficients) are left
+out. Bowing parameters are evaluated at each composition, as they may be
+functions of it.
+
+The atlas also contains the grid, 'x', 'y' and 'T', the names of the
+'alloys', the names of the 'parameters' and their 'units', the 'version' of
+openbandparams, and the 'database_hash' (see `get_atlas_hash`).
+
+An atlas is exported with `export_atlas`, or from the command line::
+
+    python -m openbandparams.atlas atlas.npz --nx 51 --nT 11
+
+Examples
+--------
+>>> from openbandparams.atlas import export_atlas
+>>> export_atlas('atlas.npz', alloys=[GaAs, GaInAs], nx=11, nT=3)
+>>> atlas = numpy.load('atlas.npz')
+>>> atlas['GaInAs/Eg'][3, 2]  # x=0.3, T=1000 K
+'''
+
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy
+from numpy.lib import format as npy_format
+
+from .codegen import get_database_hash
+from .iii_v_zinc_blende_binary import IIIVZincBlendeBinary
+from .iii_v_zinc_blende_ternary import IIIVZincBlendeTernary
+from .version import __version__
+
+__all__ = ['export_atlas', 'get_atlas_hash']
+
+
+def _get_builtin_alloys():
+    # the lists of alloys, which the package imports when first used
+    from . import (iii_v_zinc_blende_binaries, iii_v_zinc_blende_ternaries,
+                   iii_v_zinc_blende_quaternaries)
+    return (iii_v_zinc_blende_binaries + iii_v_zinc_blende_ternaries +
+            iii_v_zinc_blende_quaternaries)
+
+
+def get_atlas_hash(alloys=None):
+    '''
+    Returns a hash of the parameter database that the parameters of the
+    `alloys` (by default, all of the built-in alloys) are evaluated from,
+    which changes if openbandparams or the parameters of any of the alloys
+    are changed (see `codegen.get_database_hash`).
+    '''
+    if alloys is None:
+        alloys = _get_builtin_alloys()
+    sha = hashlib.sha1()
+    for alloy in alloys:
+        sha.update(get_database_hash(alloy).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _get_compositions(alloy, x):
+    '''
+    Returns the shape of the grid of compositions of `alloy` (without the
+    temperature axis), the flat indices of the valid compositions in the
+    grid, and a function that returns the alloy at the compositions with
+    the given indices, as a column (so that they broadcast against T).
+    '''
+    if isinstance(alloy, IIIVZincBlendeBinary):
+        return (), numpy.array([0]), lambda indices: alloy
+    if isinstance(alloy, IIIVZincBlendeTernary):
+        return ((len(x),), numpy.arange(len(x)),
+                lambda indices: alloy(x=x[indices, numpy.newaxis]))
+    X, Y = numpy.meshgrid(x, x, indexing='ij')
+    X, Y = X.ravel(), Y.ravel()
+    if alloy._type == 3:
+        valid = numpy.arange(len(X))
+    else:
+        valid = numpy.flatnonzero(alloy._round_fraction(1. - X - Y) >= 0.)
+    return ((len(x), len(x)), valid,
+            lambda indices: alloy(x=X[indices, numpy.newaxis],
+                                  y=Y[indices, numpy.newaxis]))
+
+
+def _is_bowing(alloy, name):
+    return name.endswith('_bowing') and hasattr(alloy, '_get_bowing')
+
+
+def _evaluate(instance, names, T):
+    '''
+    Returns a dict of the values of the named parameters of `instance` at
+    the temperatures `T`. Bowing parameters are evaluated at the composition
+    of the alloy, as they are when they're used, since they may be functions
+    of the composition (e.g. `AlGaAs.Eg_Gamma_bowing`).
+    '''
+    bowings = [name for name in names if _is_bowing(instance, name)]
+    values = instance.evaluate([name for name in names
+                                if name not in bowings], T=T)
+    for name in bowings:
+        values[name] = instance._get_bowing(name[:-len('_bowing')],
+                                            {'T': T})
+    return values
+
+
+def _get_names(alloy, instance):
+    '''
+    Returns the sorted names of the unique parameters of `alloy`, except
+    for those that are missing a parameter they depend on at the
+    compositions of `instance`.
+    '''
+    from .alloy import MissingParameterError
+    names = []
+    for name in sorted(set(parameter.name for parameter
+                           in alloy.get_unique_parameters())):
+        try:
+            _evaluate(instance, [name], 300.)
+        except MissingParameterError:
+            continue
+        names.append(name)
+    return names
+
+
+def _write_array(archive, key, array):
+    buffer = io.BytesIO()
+    npy_format.write_array(buffer, numpy.asanyarray(array))
+    archive.writestr(key + '.npy', buffer.getvalue())
+
+
+def _export_alloy(archive, directory, alloy, x, T, chunk_size):
+    '''
+    Writes the parameters of `alloy` to the `archive`, and returns a dict
+    of their units by name. The parameters are evaluated together (by
+    `Alloy.evaluate`) for chunks of up to `chunk_size` points at a time,
+    and are written to memory mapped arrays in `directory`, so that only
+    one chunk is held in memory at once.
+    '''
+    shape, valid, instance = _get_compositions(alloy, x)
+    names = _get_names(alloy, instance(valid[:1]))
+    arrays = {}
+    for name in names:
+        arrays[name] = npy_format.open_memmap(
+            os.path.join(directory, name + '.npy'), mode='w+',
+            dtype=float, shape=shape + (len(T),))
+        arrays[name][...] = numpy.nan
+    step = max(1, chunk_size // len(T))
+    for start in range(0, len(valid), step):
+        indices = valid[start:start + step]
+        values = _evaluate(instance(indices), names, T)
+        for name in names:
+            arrays[name].reshape(-1, len(T))[indices] = values[name]
+    units = {}
+    for name in names:
+        units[name] = alloy.get_parameter(name).units
+        arrays[name].flush()
+        del arrays[name]
+        path = os.path.join(directory, name + '.npy')
+        archive.write(path, '{}/{}.npy'.format(alloy.name, name))
+        os.remove(path)
+    return units
+
+
+def export_atlas(file, alloys=None, nx=51, T_min=0., T_max=1000., nT=11,
+                 chunk_size=100000):
+    '''
+    Evaluates every parameter of the `alloys` over a grid of compositions
+    and temperatures, and exports them to an atlas (see `atlas`).
+
+    Parameters
+    ----------
+    file : string or file
+        the file name or open file to write the atlas to. A `.npz`
+        extension is expected by convention, but is not added.
+    alloys : list of alloys (default=None)
+        the binaries, ternaries and quaternaries to export. By default, all
+        of the built-in III-V zinc blende alloys are exported.
+    nx : int (default=51)
+        the number of compositions from 0 to 1 along x (and y)
+    T_min, T_max : number (default=0., 1000.)
+        the range of temperatures (K)
+    nT : int (default=11)
+        the number of temperatures
+    chunk_size : int (default=100000)
+        the largest number of points at which the parameters are evaluated
+        at once, which bounds the memory used
+    '''
+    if nx < 2 or nT < 1:
+        raise ValueError('`nx` must be at least 2, and `nT` at least 1')
+    if alloys is None:
+        alloys = _get_builtin_alloys()
+    x = numpy.round(numpy.linspace(0., 1., nx), 6)
+    T = numpy.linspace(T_min, T_max, nT)
+    units = {}
+    directory = tempfile.mkdtemp()
+    try:
+        with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED,
+                             allowZip64=True) as archive:
+            for alloy in alloys:
+                units.update(_export_alloy(archive, directory, alloy, x, T,
+                                           chunk_size))
+            names = sorted(units)
+            _write_array(archive, 'x', x)
+            _write_array(archive, 'y', x)
+            _write_array(archive, 'T', T)
+            _write_array(archive, 'alloys', numpy.array(
+                [alloy.name for alloy in alloys], dtype='U'))
+            _write_array(archive, 'parameters', numpy.array(names, dtype='U'))
+            _write_array(archive, 'units', numpy.array(
+                [units[name] for name in names], dtype='U'))
+            _write_array(archive, 'version', numpy.array(__version__,
+                                                         dtype='U'))
+            _write_array(archive, 'database_hash', numpy.array(
+                get_atlas_hash(alloys), dtype='U'))
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Export the parameters of the built-in alloys over a '
+                    'grid of compositions and temperatures to an atlas.')
+    parser.add_argument('file', help='the .npz file to write')
+    parser.add_argument('--alloys', nargs='+', metavar='ALLOY',
+                        help='the names of the alloys to export '
+                             '(default: all)')
+    parser.add_argument('--nx', type=int, default=51,
+                        help='the number of compositions (default: 51)')
+    parser.add_argument('--T-min', type=float, default=0.,
+                        help='the lowest temperature, in K (default: 0)')
+    parser.add_argument('--T-max', type=float, default=1000.,
+                        help='the highest temperature, in K (default: 1000)')
+    parser.add_argument('--nT', type=int, default=11,
+                        help='the number of temperatures (default: 11)')
+    parser.add_argument('--chunk-size', type=int, default=100000,
+                        help='the largest number of points to evaluate at '
+                             'once (default: 100000)')
+    args = parser.parse_args(argv)
+
+    alloys = None
+    if args.alloys:
+        by_name = dict((alloy.name, alloy) for alloy in _get_builtin_alloys())
+        unknown = [name for name in args.alloys if name not in by_name]
+        if unknown:
+            parser.error('unknown alloys: {}'.format(', '.join(unknown)))
+        alloys = [by_name[name] for name in args.alloys]
+    export_atlas(args.file, alloys=alloys, nx=args.nx, T_min=args.T_min,
+                 T_max=args.T_max, nT=args.nT, chunk_size=args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
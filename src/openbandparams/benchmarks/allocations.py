@@ -0,0 +1,100 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Counts the `MethodParameter` objects allocated while evaluating parameters
+of binary, ternary, quaternary and strained alloys.
+
+The first evaluation on an alloy instance ("cold") binds the parameters
+defined with the class. Repeated evaluations on the same instance ("warm")
+reuse the bound parameters, so any allocations that remain come from the
+ternary instances created by quaternary interpolation.
+'''
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from openbandparams import GaAs, InP, GaInAs, AlGaInAs, GaInAsSb
+from openbandparams.parameter import MethodParameter
+
+
+class count_instances(object):
+    '''
+    Context manager that counts the instances of `cls` (and its subclasses)
+    created within the context. Instances are counted in `__new__`, so that
+    copies which bypass `__init__` are counted as well. `cls` must not
+    define its own `__new__`.
+    '''
+    def __init__(self, cls):
+        self.cls = cls
+        self.count = 0
+
+    def __enter__(self):
+        counter = self
+
+        def counting_new(cls, *args, **kwargs):
+            counter.count += 1
+            return object.__new__(cls)
+        self.cls.__new__ = staticmethod(counting_new)
+        return self
+
+    def __exit__(self, *exc_info):
+        del self.cls.__new__
+        return False
+
+
+def get_alloys():
+    '''
+    Returns a list of (label, factory) pairs, where `factory` returns a new
+    instance of the alloy to benchmark.
+    '''
+    return [('binary GaAs', lambda: GaAs),
+            ('ternary GaInAs', lambda: GaInAs(x=0.47)),
+            ('quaternary type 2 AlGaInAs', lambda: AlGaInAs(x=0.2, y=0.3)),
+            ('quaternary type 3 GaInAsSb', lambda: GaInAsSb(x=0.2, y=0.3)),
+            ('strained GaInAs/InP', lambda: GaInAs(x=0.4).strained_001(InP))]
+
+
+def count_allocations(alloy, name, calls=10, **kwargs):
+    '''
+    Returns the number of `MethodParameter` allocations for the first call
+    to the named parameter, and the average number for `calls` repeated calls.
+    '''
+    with count_instances(MethodParameter) as cold:
+        getattr(alloy, name)(**kwargs)
+    with count_instances(MethodParameter) as warm:
+        for _ in range(calls):
+            getattr(alloy, name)(**kwargs)
+    return cold.count, warm.count / float(calls)
+
+
+def main(names=('Eg', 'CBO')):
+    print('MethodParameter allocations per call')
+    print('{:<30} {:<6} {:>8} {:>8}'.format('alloy', 'param', 'cold', 'warm'))
+    for label, factory in get_alloys():
+        for name in names:
+            cold, warm = count_allocations(factory(), name, T=300.)
+            print('{:<30} {:<6} {:>8d} {:>8.1f}'.format(label, name,
+                                                         cold, warm))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Times attribute access on an alloy, as done inside `_interpolate`: plain
+attributes (`name`, `_x` and `binaries`), a parameter defined with the class
+(`Eg`), a parameter added to the alloy (`Eg_Gamma_bowing`), and a whole
+`_interpolate` call.
+'''
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import timeit
+
+from openbandparams import GaInAs
+
+
+def time_call(func, number=100000, repeat=3):
+    '''
+    Returns the best time per call of `func`, in seconds, excluding the
+    overhead of calling an empty function.
+    '''
+    def empty():
+        pass
+    overhead = min(timeit.Timer(empty).repeat(repeat, number))
+    best = min(timeit.Timer(func).repeat(repeat, number))
+    return max(best - overhead, 0.) / number
+
+
+def main():
+    alloy = GaInAs(x=0.47)
+    statements = [('alloy.name', lambda: alloy.name),
+                  ('alloy._x', lambda: alloy._x),
+                  ('alloy.binaries', lambda: alloy.binaries),
+                  ('alloy.Eg', lambda: alloy.Eg),
+                  ('alloy.Eg_Gamma_bowing', lambda: alloy.Eg_Gamma_bowing),
+                  ("alloy._interpolate('Eg_Gamma_0', {})",
+                   lambda: alloy._interpolate('Eg_Gamma_0', {}))]
+    print('Attribute access time per call')
+    for label, func in statements:
+        print('{:<40} {:>10.1f} ns'.format(label, time_call(func) * 1e9))
+
+
+if __name__ == '__main__':
+    main()
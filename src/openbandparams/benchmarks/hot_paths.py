@@ -0,0 +1,222 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Times the hot paths of openbandparams, and counts the allocations they make.
+
+For each benchmark, this reports the number of calls per second, the number
+of `MethodParameter` objects allocated per call, and (where `tracemalloc` is
+available) the peak memory allocated during a call. The results can be saved
+to a JSON file and compared against a previous run on the same machine::
+
+    python -m openbandparams.benchmarks.hot_paths -o before.json
+    (check out another commit)
+    python -m openbandparams.benchmarks.hot_paths -o after.json \\
+        --compare before.json
+'''
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import timeit
+
+import numpy
+
+from openbandparams import GaAs, InP, GaSb, GaInAs, AlGaInAs, GaInAsSb
+from openbandparams.parameter import MethodParameter
+from openbandparams.codegen import generate
+from openbandparams.benchmarks.allocations import count_instances
+
+
+def get_benchmarks():
+    '''
+    Returns a list of (label, func) pairs, where `func` exercises one hot
+    path. Alloy instances are created outside of `func`, except where
+    creating them is the hot path (lattice matching).
+    '''
+    GaInAs_047 = GaInAs(x=0.47)
+    AlGaInAs_02_03 = AlGaInAs(x=0.2, y=0.3)
+    GaInAsSb_02_03 = GaInAsSb(x=0.2, y=0.3)
+    strained = GaInAs(x=0.4).strained_001(InP)
+    a_InP = InP.a()
+    a_GaSb = GaSb.a()
+    Ts = numpy.linspace(300., 800., 100)
+    a_InP_Ts = InP.a(T=Ts)
+    GaInAs_table = GaInAs.get_lattice_table()
+    GaInAsSb_Eg = generate(GaInAsSb, 'Eg', cache_dir=False)
+    return [
+        ('binary Eg(T)', lambda: GaAs.Eg(T=300.)),
+        ('ternary Eg', lambda: GaInAs_047.Eg()),
+        ('quaternary type 2 Eg', lambda: AlGaInAs_02_03.Eg()),
+        ('quaternary type 3 Eg', lambda: GaInAsSb_02_03.Eg()),
+        ('quaternary type 3 Eg kernel', lambda: GaInAsSb_Eg(0.2, 0.3)),
+        ('strained_001 Eg_hh', lambda: strained.Eg_hh()),
+        ('ternary lattice matching', lambda: GaInAs(a=a_InP)),
+        ('quaternary type 2 lattice matching',
+         lambda: AlGaInAs(x=0.2, a=a_InP)),
+        ('quaternary type 3 lattice matching',
+         lambda: GaInAsSb(x=0.2, a=a_GaSb)),
+        ('ternary lattice matching x100',
+         lambda: GaInAs(a=a_InP_Ts, T=Ts)),
+        ('ternary lattice table x100',
+         lambda: GaInAs_table(a=a_InP_Ts, T=Ts)),
+        ('quaternary type 2 lattice matching x100',
+         lambda: AlGaInAs(x=0.2, a=a_InP_Ts, T=Ts)),
+        ('quaternary type 3 Eg contours',
+         lambda: GaInAsSb.iso_parameter_contours('Eg', [0.3, 0.5], n=51)),
+        ('quaternary get_references',
+         lambda: AlGaInAs_02_03.Eg.get_references()),
+    ]
+
+
+def get_peak_memory(func):
+    '''
+    Returns the peak memory in bytes allocated during one call to `func`,
+    or None if `tracemalloc` is not available.
+    '''
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def time_call(func, min_time=0.2, repeat=3):
+    '''
+    Returns the best time per call of `func`, in seconds. The number of
+    calls per timing is increased until a timing takes at least `min_time`
+    seconds, so that fast and slow benchmarks finish in similar times.
+    '''
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0. else max(2, int(min_time / elapsed))
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number
+
+
+def run_benchmark(func, min_time):
+    '''
+    Returns a dict with the calls per second, `MethodParameter` allocations
+    per call, and peak memory per call of `func`.
+    '''
+    func()  # warm up
+    with count_instances(MethodParameter) as counter:
+        func()
+    return {'calls_per_second': 1. / time_call(func, min_time=min_time),
+            'parameter_allocations': counter.count,
+            'peak_bytes': get_peak_memory(func)}
+
+
+def get_commit():
+    '''
+    Returns the git commit of the working tree, or None if unavailable.
+    '''
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def run(min_time=0.2):
+    '''
+    Runs all of the benchmarks, and returns a JSON-serializable dict of the
+    results (and their labels, in order) and the environment they were
+    measured in.
+    '''
+    labels = []
+    results = {}
+    for label, func in get_benchmarks():
+        labels.append(label)
+        results[label] = run_benchmark(func, min_time)
+    return {'commit': get_commit(),
+            'date': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'platform': platform.platform(),
+            'min_time': min_time,
+            'labels': labels,
+            'results': results}
+
+
+def print_results(data, baseline=None):
+    print('{:<36} {:>12} {:>8} {:>10}{}'.format(
+        'benchmark', 'calls/s', 'params', 'peak (B)',
+        ' {:>8}'.format('speedup') if baseline else ''))
+    for label in data['labels']:
+        result = data['results'][label]
+        peak = result['peak_bytes']
+        line = '{:<36} {:>12.1f} {:>8d} {:>10}'.format(
+            label, result['calls_per_second'], result['parameter_allocations'],
+            '-' if peak is None else peak)
+        if baseline:
+            old = baseline['results'].get(label)
+            if old is None:
+                line += ' {:>8}'.format('-')
+            else:
+                line += ' {:>7.2f}x'.format(result['calls_per_second'] /
+                                            old['calls_per_second'])
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the hot paths of openbandparams.')
+    parser.add_argument('-o', '--output',
+                        help='save the results to this JSON file')
+    parser.add_argument('-c', '--compare',
+                        help='compare against results in this JSON file')
+    parser.add_argument('-t', '--min-time', type=float, default=0.2,
+                        help='minimum duration of each timing, in seconds '
+                             '(default: 0.2)')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    data = run(min_time=args.min_time)
+    print_results(data, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
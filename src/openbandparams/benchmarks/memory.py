@@ -0,0 +1,91 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Measures the memory used by alloy instances and their bound parameters
+with `tracemalloc`, which is available in Python 3.4 and later.
+
+Each alloy instance binds the parameters that are accessed on it, so the
+memory per instance grows with the number of parameters that are
+evaluated.
+'''
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import gc
+
+from openbandparams import GaInAs, AlGaInAs, InP
+
+
+def get_alloys():
+    '''
+    Returns a list of (label, factory) pairs, where `factory(x)` returns a
+    new alloy instance with composition `x`.
+    '''
+    return [('ternary GaInAs', lambda x: GaInAs(x=x)),
+            ('quaternary AlGaInAs', lambda x: AlGaInAs(x=x / 2., y=x / 2.)),
+            ('strained GaInAs/InP', lambda x: GaInAs(x=x).strained_001(InP))]
+
+
+def measure_memory(factory, names, count=1000):
+    '''
+    Returns the memory in bytes retained per alloy instance, after creating
+    `count` instances with `factory` and accessing the named parameters on
+    each of them.
+    '''
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        alloys = []
+        for i in range(count):
+            alloy = factory(i / float(count))
+            for name in names:
+                getattr(alloy, name)
+            alloys.append(alloy)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    total = sum(stat.size_diff for stat in stats)
+    return total / float(count)
+
+
+def main(names=('Eg', 'VBO', 'CBO', 'CBO_Gamma', 'CBO_L', 'CBO_X',
+                'meff_e_Gamma')):
+    try:
+        import tracemalloc
+    except ImportError:
+        sys.exit('tracemalloc is not available in this version of Python')
+    print('memory per alloy instance (bytes)')
+    print('{:<30} {:>10} {:>10}'.format('alloy', 'bare',
+                                        '{} params'.format(len(names))))
+    for label, factory in get_alloys():
+        bare = measure_memory(factory, ())
+        bound = measure_memory(factory, names)
+        print('{:<30} {:>10.0f} {:>10.0f}'.format(label, bare, bound))
+
+
+if __name__ == '__main__':
+    main()
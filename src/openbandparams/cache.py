@@ -0,0 +1,80 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    '''
+    A dictionary-like cache that holds at most `maxsize` items, evicting the
+    least recently used item first.
+
+    The cache also holds a `stamp`, which identifies the state the cached
+    values were computed from. Setting a different stamp with `validate`
+    clears the cache.
+    '''
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError('`maxsize` must be at least 1')
+        self.maxsize = maxsize
+        self.stamp = None
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def validate(self, stamp):
+        '''
+        Clears the cache if `stamp` differs from the stored stamp, and then
+        stores `stamp`.
+        '''
+        if stamp != self.stamp:
+            self._items.clear()
+            self.stamp = stamp
+
+    def get(self, key, default=None):
+        '''
+        Returns the value cached for `key`, marking it as the most recently
+        used, or `default` if `key` is not cached.
+        '''
+        items = self._items
+        if key not in items:
+            return default
+        value = items.pop(key)
+        items[key] = value
+        return value
+
+    def set(self, key, value):
+        '''
+        Caches `value` for `key`, evicting the least recently used item if
+        the cache is full.
+        '''
+        items = self._items
+        if key in items:
+            del items[key]
+        elif len(items) >= self.maxsize:
+            items.popitem(last=False)
+        items[key] = value
+
+    def clear(self):
+        self._items.clear()
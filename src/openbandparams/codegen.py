@@ -0,0 +1,687 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Generating flat numpy functions ("kernels") that evaluate alloy parameters.
+
+`generate` evaluates parameters with `Symbol` composition variables and
+temperature, which record the arithmetic and numpy ufuncs applied to them
+instead of computing values, and writes the recorded operations out as the
+source of a plain Python function. The binary parameters, bowing parameters
+and the interpolation and Varshni formulas are inlined as constants and
+expressions, so calling a kernel doesn't touch any alloys or parameters.
+Kernels are cached in memory, keyed by a hash of the parameter database
+(see `get_database_hash`), so each one is only traced once. They can also
+be cached on disk, in a directory given by `get_cache_dir` or passed to
+`generate`, which is opt-in since the cached kernels are executed when they
+are loaded.
+
+Examples
+--------
+>>> from openbandparams.codegen import generate
+>>> Eg = generate(GaInAsSb, 'Eg')
+>>> Eg(x=0.2, y=0.3, T=77.)
+0.2996349574190773
+>>> Eg(x=numpy.array([0.1, 0.2]), y=0.3, T=77.)
+array([0.23310291, 0.29963496])
+>>> print(Eg.source)
+'''
+
+# hashlib and tempfile are imported where they are used, since importing
+# them takes longer than importing the rest of openbandparams
+import marshal
+import os
+import re
+import stat
+import sys
+
+import numpy
+
+from . import dual
+from .version import __version__
+
+__all__ = ['Symbol', 'Trace', 'generate', 'get_database_hash',
+           'get_cache_dir']
+
+
+def _format(value):
+    '''
+    Returns the Python source for a `Symbol` or a scalar constant.
+    '''
+    if isinstance(value, Symbol):
+        return value.expression
+    if isinstance(value, (list, tuple)):
+        return '[{}]'.format(', '.join(_format(item) for item in value))
+    if isinstance(value, (bool, numpy.bool_)):
+        return repr(bool(value))
+    if numpy.ndim(value) != 0:
+        raise TypeError('Only scalar constants can be inlined in a kernel, '
+                        'not {!r}.'.format(value))
+    if isinstance(value, (int, numpy.integer)):
+        source = str(int(value))
+    else:
+        value = float(value)
+        if numpy.isfinite(value):
+            source = repr(value)
+        else:
+            source = "float('{}')".format(value)
+    # parenthesize negative constants, e.g. for (-1.) ** x
+    if source.startswith('-'):
+        return '({})'.format(source)
+    return source
+
+
+class Trace(object):
+    '''
+    Records the operations applied to `Symbol`s, to be written out as the
+    source of a function. Repeated expressions (e.g. a binary parameter that
+    is needed by several ternaries) are only recorded once.
+    '''
+    # the deepest that expressions are nested in the generated source
+    max_depth = 4
+
+    def __init__(self):
+        # (target, template, operands) for each operation, in order
+        self.lines = []
+        self._symbols = {}
+
+    def variable(self, name):
+        '''
+        Returns a `Symbol` for the named argument of the kernel.
+        '''
+        return Symbol(self, name)
+
+    def apply(self, template, *operands):
+        '''
+        Returns a `Symbol` for the result of the expression given by
+        formatting `template` with the operands, which may be symbols,
+        constants or lists of them.
+        '''
+        expression = template.format(*[_format(operand)
+                                        for operand in operands])
+        if expression in self._symbols:
+            return self._symbols[expression]
+        symbol = Symbol(self, '_{}'.format(len(self.lines)))
+        self.lines.append((symbol.expression, template, operands))
+        self._symbols[expression] = symbol
+        return symbol
+
+    def call(self, function, *arguments):
+        '''
+        Returns a `Symbol` for the result of calling the named function
+        (e.g. 'numpy.where'). Lists of arguments are passed as lists.
+        '''
+        return self.apply('{}({})'.format(function,
+                                          ', '.join(['{}'] * len(arguments))),
+                          *arguments)
+
+    def get_source(self, function_name, arguments, results, header=''):
+        '''
+        Returns the source of a module defining a function with the given
+        name and arguments that returns the given results (a single value,
+        or a tuple of values).
+
+        Operations that the results don't depend on are left out, and those
+        whose results are only used once are written inline, so that
+        temporary arrays are freed as soon as possible.
+        '''
+        if isinstance(results, tuple):
+            returned = results
+        else:
+            returned = (results,)
+        # find the operations that are needed, and how often they're used
+        uses = dict((_format(result), 2) for result in returned
+                    if isinstance(result, Symbol))
+        needed = []
+        for line in reversed(self.lines):
+            if line[0] in uses:
+                needed.append(line)
+                for operand in _flatten(line[2]):
+                    if isinstance(operand, Symbol):
+                        uses[operand.expression] = (
+                            uses.get(operand.expression, 0) + 1)
+        needed.reverse()
+
+        # (source, depth) of the operations written inline, by target
+        inline = {}
+
+        def render(value):
+            if isinstance(value, (list, tuple)):
+                rendered = [render(item) for item in value]
+                return ('[{}]'.format(', '.join(r[0] for r in rendered)),
+                        max([0] + [r[1] for r in rendered]))
+            if isinstance(value, Symbol) and value.expression in inline:
+                return inline.pop(value.expression)
+            return _format(value), 0
+
+        body = []
+        for target, template, operands in needed:
+            rendered = [render(operand) for operand in operands]
+            source = template.format(*[r[0] for r in rendered])
+            depth = 1 + max([0] + [r[1] for r in rendered])
+            if uses[target] == 1 and depth < self.max_depth:
+                if not _is_call(template):
+                    source = '({})'.format(source)
+                inline[target] = (source, depth)
+            else:
+                body.append('    {} = {}'.format(target, source))
+        if isinstance(results, tuple):
+            body.append('    return ({},)'.format(
+                ', '.join(render(result)[0] for result in results)))
+        else:
+            body.append('    return {}'.format(render(results)[0]))
+        return ''.join([header,
+                        'from __future__ import division\n\n',
+                        'import numpy\n\n\n',
+                        'def {}({}):\n'.format(function_name,
+                                               ', '.join(arguments)),
+                        '\n'.join(body), '\n'])
+
+
+def _flatten(operands):
+    for operand in operands:
+        if isinstance(operand, (list, tuple)):
+            for item in operand:
+                yield item
+        else:
+            yield operand
+
+
+def _is_call(template):
+    '''
+    Returns True if the template is a single function call, which doesn't
+    need parentheses when it's written inline.
+    '''
+    return (re.match(r'^[\w.]+\(', template) is not None and
+            template.endswith(')') and template.count('(') == 1)
+
+
+class Symbol(object):
+    '''
+    A variable of a `Trace`, or the result of operations on one. Arithmetic
+    on symbols, and numpy ufuncs applied to them, are recorded by the trace
+    and return new symbols.
+
+    Because the value of a symbol isn't known until the kernel is called,
+    using it as a truth value (e.g. in an `if` statement) raises a
+    TypeError. Use `openbandparams.dual.where` instead.
+    '''
+    __slots__ = ('trace', 'expression')
+
+    # symbols compare by value, when the kernel is called, so they are
+    # hashed by identity
+    __hash__ = object.__hash__
+
+    def __init__(self, trace, expression):
+        self.trace = trace
+        self.expression = expression
+
+    def __repr__(self):
+        return 'Symbol({!r})'.format(self.expression)
+
+    def __bool__(self):
+        raise TypeError('The value of a Symbol is unknown until the kernel is '
+                        'called, so it cannot be used as a truth value.')
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, key):
+        if key != ():
+            raise TypeError('Symbols can only be indexed with ().')
+        return self.trace.apply('{}[()]', self)
+
+    def __obp_fraction__(self):
+        '''
+        Returns None, since the values of Symbols used as alloy fractions
+        are only known when a kernel is called.
+        '''
+        return None
+
+    def __obp_function__(self, function, args):
+        '''
+        Overrides `dual.where` and `dual.select` (see `dual._override`).
+        '''
+        if function is dual.where:
+            return where(*args)
+        if function is dual.select:
+            return select(*args)
+        return NotImplemented
+
+    def round(self, decimals=0, out=None):
+        '''
+        Used by `numpy.round`.
+        '''
+        if out is not None:
+            raise TypeError('Symbols cannot be rounded in place.')
+        return self.trace.call('numpy.round', self, decimals)
+
+    def __round__(self, ndigits=0):
+        return self.round(ndigits)
+
+    # arithmetic
+
+    def __neg__(self):
+        return self.trace.apply('-{}', self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self.trace.apply('abs({})', self)
+
+    def __add__(self, other):
+        return self.trace.apply('{} + {}', self, other)
+
+    def __radd__(self, other):
+        return self.trace.apply('{} + {}', other, self)
+
+    def __sub__(self, other):
+        return self.trace.apply('{} - {}', self, other)
+
+    def __rsub__(self, other):
+        return self.trace.apply('{} - {}', other, self)
+
+    def __mul__(self, other):
+        return self.trace.apply('{} * {}', self, other)
+
+    def __rmul__(self, other):
+        return self.trace.apply('{} * {}', other, self)
+
+    def __truediv__(self, other):
+        return self.trace.apply('{} / {}', self, other)
+
+    def __rtruediv__(self, other):
+        return self.trace.apply('{} / {}', other, self)
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        return self.trace.apply('{} ** {}', self, other)
+
+    def __rpow__(self, other):
+        return self.trace.apply('{} ** {}', other, self)
+
+    # comparisons and logic, e.g. for masks given to `where`
+
+    def __eq__(self, other):
+        return self.trace.apply('{} == {}', self, other)
+
+    def __ne__(self, other):
+        return self.trace.apply('{} != {}', self, other)
+
+    def __lt__(self, other):
+        return self.trace.apply('{} < {}', self, other)
+
+    def __le__(self, other):
+        return self.trace.apply('{} <= {}', self, other)
+
+    def __gt__(self, other):
+        return self.trace.apply('{} > {}', self, other)
+
+    def __ge__(self, other):
+        return self.trace.apply('{} >= {}', self, other)
+
+    def __and__(self, other):
+        return self.trace.apply('{} & {}', self, other)
+
+    def __rand__(self, other):
+        return self.trace.apply('{} & {}', other, self)
+
+    def __or__(self, other):
+        return self.trace.apply('{} | {}', self, other)
+
+    def __ror__(self, other):
+        return self.trace.apply('{} | {}', other, self)
+
+    def __invert__(self):
+        return self.trace.apply('~{}', self)
+
+    # numpy ufuncs
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        if ufunc in _ufunc_operators:
+            return self.trace.apply(_ufunc_operators[ufunc], *inputs)
+        return self.trace.call('numpy.{}'.format(ufunc.__name__), *inputs)
+
+
+# ufuncs that are written as operators
+_ufunc_operators = {
+    numpy.add: '{} + {}',
+    numpy.subtract: '{} - {}',
+    numpy.multiply: '{} * {}',
+    numpy.divide: '{} / {}',
+    numpy.true_divide: '{} / {}',
+    numpy.power: '{} ** {}',
+    numpy.negative: '-{}',
+    numpy.absolute: 'abs({})',
+    numpy.equal: '{} == {}',
+    numpy.not_equal: '{} != {}',
+    numpy.less: '{} < {}',
+    numpy.less_equal: '{} <= {}',
+    numpy.greater: '{} > {}',
+    numpy.greater_equal: '{} >= {}',
+    numpy.bitwise_and: '{} & {}',
+    numpy.bitwise_or: '{} | {}',
+    numpy.invert: '~{}',
+}
+
+
+def where(condition, x, y):
+    '''
+    Returns a `Symbol` for `numpy.where(condition, x, y)`, where at least
+    one of the arguments is a `Symbol`.
+    '''
+    symbol = _find_symbol([condition, x, y])
+    return symbol.trace.call('numpy.where', condition, x, y)
+
+
+def select(condlist, choicelist, default=0):
+    '''
+    Returns a `Symbol` for `numpy.select(condlist, choicelist, default)`,
+    where at least one of the conditions or choices is a `Symbol`.
+    '''
+    symbol = _find_symbol(list(condlist) + list(choicelist) + [default])
+    return symbol.trace.call('numpy.select', list(condlist),
+                             list(choicelist), default)
+
+
+def _find_symbol(values):
+    for value in values:
+        if isinstance(value, Symbol):
+            return value
+    return None
+
+
+# the hash of the openbandparams source, which includes the built-in
+# parameters and the equations that use them
+_source_hash = None
+
+
+def _get_source_hash():
+    global _source_hash
+    if _source_hash is None:
+        import hashlib
+        package = os.path.dirname(os.path.abspath(__file__))
+        sha = hashlib.sha1()
+        for filename in sorted(os.listdir(package)):
+            if filename.endswith('.py'):
+                with open(os.path.join(package, filename), 'rb') as f:
+                    sha.update(f.read())
+        _source_hash = sha.hexdigest()
+    return _source_hash
+
+
+def _hash_code(function):
+    import hashlib
+    return hashlib.sha1(marshal.dumps(function.__code__)).hexdigest()
+
+
+def _describe(value):
+    '''
+    Returns a string that describes a parameter, function or value.
+    '''
+    # avoid importing alloys and parameters at module level
+    from .parameter import ValueParameter, FunctionParameter, MethodParameter
+    if isinstance(value, ValueParameter):
+        return 'value({})'.format(_describe(value.value))
+    elif isinstance(value, FunctionParameter):
+        return 'function({})'.format(_describe(value.function))
+    elif isinstance(value, MethodParameter):
+        return 'method({})'.format(_describe(value.method))
+    elif isinstance(value, Symbol):
+        return value.expression
+    elif hasattr(value, '__code__'):
+        # functions in the defaults and closure are only described by their
+        # code, in case they refer back to this function
+        values = list(value.__defaults__ or ())
+        values.extend(cell.cell_contents for cell in value.__closure__ or ())
+        return 'code({}, {})'.format(_hash_code(value), ', '.join(
+            _hash_code(item) if hasattr(item, '__code__') else _describe(item)
+            for item in values))
+    elif isinstance(value, (list, tuple)):
+        return '[{}]'.format(', '.join(_describe(item) for item in value))
+    elif isinstance(value, numpy.ndarray):
+        return repr(value.tolist())
+    else:
+        return repr(value)
+
+
+def get_database_hash(alloy):
+    '''
+    Returns a hash of the parameter database that the parameters of `alloy`
+    are evaluated from, i.e. the source of openbandparams (including the
+    built-in parameters), and the composition and added parameters of the
+    alloy and every alloy that its parameters are derived from. Parameters
+    given as functions are hashed by their code.
+    '''
+    import hashlib
+    sha = hashlib.sha1()
+    sha.update('{} {} {}'.format(__version__, sys.version_info[0],
+                                 _get_source_hash()).encode('utf-8'))
+    for member in alloy._get_lineage():
+        parameters = sorted(member._parameters.items())
+        sha.update('{} {} {} {} {}\n'.format(
+            type(member).__name__, member.name,
+            _describe(getattr(member, '_x', None)),
+            _describe(getattr(member, '_xyz', None)),
+            _describe(getattr(member, '_strain_out_of_plane', None)),
+        ).encode('utf-8'))
+        for name, parameter in parameters:
+            sha.update('{} = {}\n'.format(
+                name, _describe(parameter)).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def get_cache_dir():
+    '''
+    Returns the directory in which kernels are cached on disk, which is
+    given by the OPENBANDPARAMS_CACHE_DIR environment variable, or None if
+    it isn't set, in which case kernels are only cached in memory.
+
+    Cached kernels are executed when they are loaded, so anyone who can
+    write to the directory can run code in processes that load them. They
+    are only loaded if the directory and the files are owned by the current
+    user and can't be written by anyone else, but the directory should
+    still be private, e.g. `~/.cache/openbandparams`.
+    '''
+    return os.environ.get('OPENBANDPARAMS_CACHE_DIR') or None
+
+# kernels that have been loaded or generated, by their cache keys
+_kernels = {}
+
+
+def _compile(source, filename, function_name):
+    namespace = {}
+    exec(compile(source, filename, 'exec'), namespace)
+    kernel = namespace[function_name]
+    kernel.source = source
+    return kernel
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except (IOError, OSError):
+        pass
+
+
+def _is_private(path):
+    '''
+    Returns True if `path` is owned by the current user, and can't be
+    written by anyone else. File ownership isn't checked where it isn't
+    available (e.g. on Windows).
+    '''
+    try:
+        status = os.stat(path)
+    except (IOError, OSError):
+        return False
+    if not hasattr(os, 'getuid'):
+        return True
+    return (status.st_uid == os.getuid() and
+            not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _hash_source(source):
+    import hashlib
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path, text):
+    import tempfile
+    fd, temporary = tempfile.mkstemp(suffix='.tmp',
+                                     dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.rename(temporary, path)
+    except (IOError, OSError):
+        os.remove(temporary)
+        raise
+
+
+def _write(path, source):
+    '''
+    Writes the source to `path`, and its hash to `path + '.sha1'`, atomically,
+    so concurrent processes never read a partial kernel. The directory is
+    created private to the current user, and kernels aren't written to
+    directories that aren't (see `_is_private`). Failing to write the cache
+    is not an error.
+    '''
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        if not _is_private(directory):
+            return
+        _write_atomic(path, source)
+        _write_atomic(path + '.sha1', _hash_source(source))
+    except (IOError, OSError):
+        pass
+
+
+def _load(path, function_name):
+    '''
+    Returns the kernel cached at `path`, or None if it isn't cached. Kernels
+    in directories or files that others can write to aren't loaded (see
+    `_is_private`). Cached kernels that don't match their hash, or that fail
+    to load for any other reason, are removed, so they're regenerated.
+    '''
+    if not all(_is_private(p) for p in [os.path.dirname(path), path,
+                                         path + '.sha1']):
+        return None
+    source = _read(path)
+    if source is None:
+        return None
+    try:
+        if _read(path + '.sha1') != _hash_source(source):
+            raise ValueError('the cached kernel does not match its hash')
+        return _compile(source, path, function_name)
+    except Exception:
+        _remove(path)
+        _remove(path + '.sha1')
+        return None
+
+
+def generate(alloy, names, function_name='kernel', cache_dir=None):
+    '''
+    Returns a flat numpy function (a kernel) of the composition variables
+    of `alloy` (e.g. `x` for ternaries, or `x` and `y` for quaternaries)
+    and the temperature, `T`, that evaluates the named parameters. The
+    composition of `alloy`, if it has been specified, is ignored. The
+    kernel accepts numbers or arrays, like the alloys, and gives the same
+    values, but doesn't check that the compositions are valid.
+
+    The source of the kernel is available as its `source` attribute, e.g.
+    for embedding it in other programs.
+
+    Parameters
+    ----------
+    alloy : Alloy
+        a binary, ternary, quaternary or strained alloy
+    names : string or list of strings
+        the name of the parameter, or a list of names, in which case the
+        kernel returns a tuple of their values
+    function_name : string (default='kernel')
+        the name of the generated function
+    cache_dir : string or False (default=None)
+        the directory in which kernels are cached on disk, or False to not
+        cache them on disk. By default, the directory given by
+        `get_cache_dir`, if any. Cached kernels are executed when they are
+        loaded, so they're only loaded from a directory that is private to
+        the current user (see `get_cache_dir`). They are stored with a hash
+        of their source, and are regenerated if they don't match it or fail
+        to load.
+
+    Raises
+    ------
+    TypeError
+        if a parameter can't be generated, e.g. because it uses the
+        composition or temperature in an `if` statement
+    '''
+    import hashlib
+    single = not isinstance(names, (list, tuple))
+    names = [names] if single else list(names)
+    trace = Trace()
+    traced, variables = alloy._with_composition_variables(
+        lambda name, value: trace.variable(name))
+    database_hash = get_database_hash(traced)
+    key = hashlib.sha1('{} {} {} {}'.format(
+        database_hash, function_name, single, names).encode('utf-8')
+    ).hexdigest()
+    if key in _kernels:
+        return _kernels[key]
+
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    path = None
+    if cache_dir:
+        path = os.path.join(cache_dir, '{}.py'.format(key))
+        kernel = _load(path, function_name)
+        if kernel is not None:
+            _kernels[key] = kernel
+            return kernel
+
+    values = traced.evaluate(names, T=trace.variable('T'))
+    results = values[names[0]] if single else tuple(values[name]
+                                                    for name in names)
+    header = ('# Generated by openbandparams {}. Do not edit.\n'
+              '# alloy: {}\n'
+              '# parameters: {}\n'
+              '# database hash: {}\n'
+              ''.format(__version__, alloy.name, ', '.join(names),
+                        database_hash))
+    source = trace.get_source(function_name, variables + ['T=300.'], results,
+                              header)
+    kernel = _compile(source, path or '<{}>'.format(function_name),
+                      function_name)
+    if path is not None:
+        _write(path, source)
+    _kernels[key] = kernel
+    return kernel
@@ -0,0 +1,244 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Contours of functions of two variables, sampled on a grid.
+'''
+
+import numpy
+
+from .roots import brentq
+
+__all__ = ['find_contours']
+
+
+def _crossings(v0, v1, level):
+    '''
+    Returns a mask of the edges between the values `v0` and `v1` that cross
+    `level`.
+    '''
+    with numpy.errstate(invalid='ignore'):
+        return (numpy.isfinite(v0) & numpy.isfinite(v1) &
+                ((v0 > level) != (v1 > level)))
+
+
+def _get_edges(xs, ys):
+    '''
+    Returns the start and end node indices of all of the edges of the grid,
+    as flat indices into arrays of shape (len(ys), len(xs)), and the edge
+    indices of the sides and diagonals of each cell.
+
+    The sides of each cell are ordered bottom, right, top and left, and the
+    diagonals are from the bottom right to the top left corner, and from the
+    bottom left to the top right corner.
+    '''
+    nx, ny = len(xs), len(ys)
+    nodes = numpy.arange(nx * ny).reshape(ny, nx)
+    starts = [nodes[:, :-1], nodes[:-1, :], nodes[:-1, 1:], nodes[:-1, :-1]]
+    ends = [nodes[:, 1:], nodes[1:, :], nodes[1:, :-1], nodes[1:, 1:]]
+    offsets = numpy.cumsum([0] + [s.size for s in starts])
+    ids = [offset + numpy.arange(s.size).reshape(s.shape)
+           for offset, s in zip(offsets, starts)]
+    horizontal, vertical, anti_diagonal, diagonal = ids
+    sides = numpy.stack([horizontal[:-1, :].ravel(),
+                         vertical[:, 1:].ravel(),
+                         horizontal[1:, :].ravel(),
+                         vertical[:, :-1].ravel()], axis=-1)
+    diagonals = numpy.stack([anti_diagonal.ravel(), diagonal.ravel()],
+                            axis=-1)
+    starts = numpy.concatenate([s.ravel() for s in starts])
+    ends = numpy.concatenate([e.ravel() for e in ends])
+    return starts, ends, sides, diagonals
+
+
+def _get_segments(values, level, sides, diagonals, crosses):
+    '''
+    Returns the segments of the contour at `level` through the cells of the
+    grid, as pairs of the indices of the edges they join.
+
+    Cells with four finite corners are handled by marching squares, with
+    saddles resolved by the mean of the corners. Cells with one non-finite
+    corner are handled as a triangle of the other three corners (e.g. along
+    the diagonal boundary of a triangular domain). Other cells are skipped.
+    '''
+    ny, nx = values.shape
+    corners = numpy.stack([values[:-1, :-1].ravel(), values[:-1, 1:].ravel(),
+                           values[1:, 1:].ravel(), values[1:, :-1].ravel()],
+                          axis=-1)
+    finite = numpy.isfinite(corners)
+    n_finite = finite.sum(axis=1)
+    side_crosses = crosses[sides]
+    segments = []
+
+    # squares with a single segment
+    square = (n_finite == 4)
+    n_crossing = side_crosses.sum(axis=1)
+    single = square & (n_crossing == 2)
+    segments.append(sides[single][side_crosses[single]].reshape(-1, 2))
+
+    # saddles, which are split along the diagonal the mean doesn't lie on
+    saddle = square & (n_crossing == 4)
+    if numpy.any(saddle):
+        mean = corners[saddle].mean(axis=1)
+        split = (mean > level) == (corners[saddle, 0] > level)
+        bottom, right, top, left = sides[saddle].T
+        segments.append(numpy.where(split[:, numpy.newaxis],
+                                    numpy.stack([bottom, right], axis=-1),
+                                    numpy.stack([left, bottom], axis=-1)))
+        segments.append(numpy.where(split[:, numpy.newaxis],
+                                    numpy.stack([top, left], axis=-1),
+                                    numpy.stack([right, top], axis=-1)))
+
+    # triangles, with the two sides that don't touch the missing corner
+    # and the diagonal between its neighbours
+    triangle = (n_finite == 3)
+    if numpy.any(triangle):
+        missing = numpy.argmin(finite[triangle], axis=1)
+        cell_sides = sides[triangle]
+        rows = numpy.arange(len(missing))[:, numpy.newaxis]
+        # side k runs from corner k to corner k + 1
+        kept = numpy.stack([(missing + 1) % 4, (missing + 2) % 4], axis=-1)
+        edges = numpy.concatenate(
+            [cell_sides[rows, kept],
+             diagonals[triangle][rows[:, 0], missing % 2][:, numpy.newaxis]],
+            axis=1)
+        edge_crosses = crosses[edges]
+        pair = edge_crosses.sum(axis=1) == 2
+        segments.append(edges[pair][edge_crosses[pair]].reshape(-1, 2))
+    return numpy.concatenate(segments)
+
+
+def _join_segments(segments):
+    '''
+    Joins segments (pairs of edge indices) into polylines, and returns them
+    as lists of edge indices. Closed polylines start and end with the same
+    edge.
+    '''
+    neighbours = {}
+    for a, b in segments.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    polylines = []
+    visited = set()
+
+    def walk(start):
+        line = [start]
+        visited.add(start)
+        previous, current = None, start
+        while True:
+            following = [e for e in neighbours[current] if e != previous]
+            if not following:
+                break
+            previous, current = current, following[0]
+            line.append(current)
+            if current in visited:
+                break
+            visited.add(current)
+        return line
+
+    # open polylines start and end at the boundary of the domain
+    for edge in sorted(neighbours):
+        if len(neighbours[edge]) == 1 and edge not in visited:
+            polylines.append(walk(edge))
+    for edge in sorted(neighbours):
+        if edge not in visited:
+            polylines.append(walk(edge))
+    return polylines
+
+
+def find_contours(values, levels, xs, ys, func=None, xtol=1e-9):
+    '''
+    Returns the contours of `values` at each of the given `levels`.
+
+    The crossings of each level are first found by linear interpolation
+    along the edges of the grid. If `func` is given, each crossing is then
+    refined with Brent's method along its edge, for all crossings of all
+    levels at once.
+
+    Parameters
+    ----------
+    values : 2D array
+        the function values on the grid, with shape `(len(ys), len(xs))`,
+        as returned by `func(*numpy.meshgrid(xs, ys))`. Non-finite values
+        mark points outside of the domain.
+    levels : list of numbers
+        the levels of the contours
+    xs, ys : 1D arrays
+        the grid coordinates
+    func : function, optional
+        a function of `x` and `y` arrays, which returns an array of values,
+        used to refine the crossings
+    xtol : number, optional
+        the tolerance of the refined crossings along each edge
+
+    Returns
+    -------
+    contours : list of lists of arrays
+        for each level, a list of polylines, each an array of shape
+        `(m, 2)` of `(x, y)` points. Closed polylines end with their first
+        point.
+    '''
+    values = numpy.asarray(values, dtype=float)
+    xs = numpy.asarray(xs, dtype=float)
+    ys = numpy.asarray(ys, dtype=float)
+    if values.shape != (len(ys), len(xs)):
+        raise ValueError('values must have shape (len(ys), len(xs))')
+    starts, ends, sides, diagonals = _get_edges(xs, ys)
+    flat = values.ravel()
+    X, Y = [c.ravel() for c in numpy.meshgrid(xs, ys)]
+
+    polylines = []
+    all_edges, all_levels = [], []
+    for level in levels:
+        crosses = _crossings(flat[starts], flat[ends], level)
+        segments = _get_segments(values, level, sides, diagonals, crosses)
+        lines = _join_segments(segments)
+        polylines.append(lines)
+        edges = numpy.unique(segments)
+        all_edges.append(edges)
+        all_levels.append(numpy.repeat(float(level), len(edges)))
+    edges = numpy.concatenate(all_edges).astype(int)
+    edge_levels = numpy.concatenate(all_levels)
+
+    # the fraction along each crossed edge where the level is crossed
+    v0 = flat[starts[edges]] - edge_levels
+    v1 = flat[ends[edges]] - edge_levels
+    t = v0 / (v0 - v1)
+    x0, y0 = X[starts[edges]], Y[starts[edges]]
+    dx, dy = X[ends[edges]] - x0, Y[ends[edges]] - y0
+    if func is not None and len(edges):
+        length = numpy.hypot(dx, dy)
+        t = brentq(lambda t, x0, y0, dx, dy, level:
+                   func(x0 + t * dx, y0 + t * dy) - level,
+                   a=0., b=1., fa=v0, fb=v1, xtol=xtol / length.max(),
+                   args=(x0, y0, dx, dy, edge_levels))
+    points = numpy.stack([x0 + t * dx, y0 + t * dy], axis=-1)
+
+    contours = []
+    for lines, level_edges, offset in zip(
+            polylines, all_edges,
+            numpy.cumsum([0] + [len(e) for e in all_edges])):
+        contours.append([])
+        for line in lines:
+            line = points[offset + numpy.searchsorted(level_edges, line)]
+            # levels through grid points are crossed on several edges, so
+            # drop the repeated points
+            moved = numpy.any(numpy.diff(line, axis=0) != 0., axis=1)
+            contours[-1].append(line[numpy.concatenate([[True], moved])])
+    return contours
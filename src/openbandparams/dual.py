@@ -0,0 +1,364 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Dual numbers for forward-mode automatic differentiation.
+
+A `Dual` carries a value together with its derivatives with respect to
+any number of named variables. Arithmetic on `Dual` numbers, and the numpy
+ufuncs used by the parameter equations, propagate the derivatives exactly
+by the chain rule. `where` and `select` are versions of the corresponding
+numpy functions that also accept `Dual` numbers, and other types that
+override them with an `__obp_function__` method (see `_override`), as does
+`weighted_average`.
+'''
+
+import numpy
+
+__all__ = ['Dual']
+
+
+def _combine(*terms):
+    '''
+    Returns the derivatives `sum(factor * derivatives)` over the given
+    (factor, derivatives) pairs.
+    '''
+    result = {}
+    for factor, derivatives in terms:
+        for name, derivative in derivatives.items():
+            if name in result:
+                result[name] = result[name] + factor * derivative
+            else:
+                result[name] = factor * derivative
+    return result
+
+
+def _lift(value):
+    '''
+    Returns `value` as a Dual, with no derivatives if it is not a Dual.
+    '''
+    if isinstance(value, Dual):
+        return value
+    return Dual(value)
+
+
+class Dual(object):
+    '''
+    A value and its derivatives with respect to named variables.
+
+    Parameters
+    ----------
+    value : number or array
+        the value
+    derivatives : dict (default=None)
+        maps the names of variables to the derivatives of the value with
+        respect to them. Missing derivatives are zero.
+    '''
+    __slots__ = ('value', 'derivatives')
+
+    # Dual numbers compare by value, so they must not be hashed
+    __hash__ = None
+
+    def __init__(self, value, derivatives=None):
+        self.value = value
+        self.derivatives = dict(derivatives) if derivatives else {}
+
+    def __repr__(self):
+        return 'Dual({!r}, {!r})'.format(self.value, self.derivatives)
+
+    def __str__(self):
+        return str(self.value)
+
+    def __getitem__(self, key):
+        shape = numpy.shape(self.value)
+        return Dual(numpy.asarray(self.value)[key],
+                    dict((name, numpy.broadcast_to(derivative, shape)[key])
+                         for name, derivative in self.derivatives.items()))
+
+    def derivative(self, name):
+        '''
+        Returns the derivative with respect to the named variable, which is
+        zero if the value does not depend on it.
+        '''
+        return self.derivatives.get(name, 0. * self.value)
+
+    def round(self, decimals=0, out=None):
+        '''
+        Returns a copy with the value rounded to the given number of
+        decimals, and the same derivatives. Used by `numpy.round`, and to
+        round alloy fractions.
+        '''
+        if out is not None:
+            raise TypeError('Duals cannot be rounded in place.')
+        if numpy.ndim(self.value) == 0 and not hasattr(self.value, 'round'):
+            return Dual(round(self.value, decimals), self.derivatives)
+        return Dual(numpy.round(self.value, decimals), self.derivatives)
+
+    def __obp_fraction__(self):
+        '''
+        Returns the smallest and largest values of this Dual as an alloy
+        fraction, i.e. its value, or the bounds of its value if that is also
+        an alloy fraction (e.g. an `Interval`).
+        '''
+        bounds = getattr(self.value, '__obp_fraction__', None)
+        if bounds is not None:
+            return bounds()
+        return self.value, self.value
+
+    def expand(self, names):
+        '''
+        Returns a copy with the derivatives with respect to all of the named
+        variables, broadcast to the shape of the value.
+        '''
+        shape = numpy.shape(self.value)
+        return Dual(self.value,
+                    dict((name, numpy.broadcast_to(self.derivative(name),
+                                                   shape).copy()[()])
+                         for name in names))
+
+    # arithmetic
+
+    def __neg__(self):
+        return Dual(-self.value, _combine((-1., self.derivatives)))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.value),
+                    _combine((numpy.sign(self.value), self.derivatives)))
+
+    def __add__(self, other):
+        other = _lift(other)
+        return Dual(self.value + other.value,
+                    _combine((1., self.derivatives), (1., other.derivatives)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = _lift(other)
+        return Dual(self.value - other.value,
+                    _combine((1., self.derivatives), (-1., other.derivatives)))
+
+    def __rsub__(self, other):
+        return _lift(other) - self
+
+    def __mul__(self, other):
+        other = _lift(other)
+        return Dual(self.value * other.value,
+                    _combine((other.value, self.derivatives),
+                             (self.value, other.derivatives)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = _lift(other)
+        value = self.value / other.value
+        return Dual(value, _combine((1. / other.value, self.derivatives),
+                                    (-value / other.value, other.derivatives)))
+
+    def __rtruediv__(self, other):
+        return _lift(other) / self
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        if not isinstance(other, Dual):
+            return Dual(self.value ** other,
+                        _combine((other * self.value ** (other - 1),
+                                  self.derivatives)))
+        value = self.value ** other.value
+        return Dual(value, _combine(
+            (other.value * self.value ** (other.value - 1), self.derivatives),
+            (value * numpy.log(self.value), other.derivatives)))
+
+    def __rpow__(self, other):
+        return _lift(other) ** self
+
+    # comparisons are made on the values
+
+    def __eq__(self, other):
+        return self.value == _lift(other).value
+
+    def __ne__(self, other):
+        return self.value != _lift(other).value
+
+    def __lt__(self, other):
+        return self.value < _lift(other).value
+
+    def __le__(self, other):
+        return self.value <= _lift(other).value
+
+    def __gt__(self, other):
+        return self.value > _lift(other).value
+
+    def __ge__(self, other):
+        return self.value >= _lift(other).value
+
+    # numpy ufuncs
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs or ufunc not in _ufuncs:
+            return NotImplemented
+        return _ufuncs[ufunc](*[_lift(i) for i in inputs])
+
+
+def _tanh(a):
+    value = numpy.tanh(a.value)
+    return Dual(value, _combine((1. - value ** 2, a.derivatives)))
+
+
+def _sqrt(a):
+    value = numpy.sqrt(a.value)
+    return Dual(value, _combine((0.5 / value, a.derivatives)))
+
+
+def _exp(a):
+    value = numpy.exp(a.value)
+    return Dual(value, _combine((value, a.derivatives)))
+
+
+def _log(a):
+    return Dual(numpy.log(a.value), _combine((1. / a.value, a.derivatives)))
+
+
+def _minimum(a, b):
+    return where(a.value <= b.value, a, b)
+
+
+def _maximum(a, b):
+    return where(a.value >= b.value, a, b)
+
+
+def _compare(ufunc):
+    return lambda a, b: ufunc(a.value, b.value)
+
+
+_ufuncs = {
+    numpy.add: lambda a, b: a + b,
+    numpy.subtract: lambda a, b: a - b,
+    numpy.multiply: lambda a, b: a * b,
+    numpy.divide: lambda a, b: a / b,
+    numpy.true_divide: lambda a, b: a / b,
+    numpy.power: lambda a, b: a ** b,
+    numpy.negative: lambda a: -a,
+    numpy.absolute: abs,
+    numpy.tanh: _tanh,
+    numpy.sqrt: _sqrt,
+    numpy.exp: _exp,
+    numpy.log: _log,
+    numpy.minimum: _minimum,
+    numpy.maximum: _maximum,
+    numpy.equal: _compare(numpy.equal),
+    numpy.not_equal: _compare(numpy.not_equal),
+    numpy.less: _compare(numpy.less),
+    numpy.less_equal: _compare(numpy.less_equal),
+    numpy.greater: _compare(numpy.greater),
+    numpy.greater_equal: _compare(numpy.greater_equal),
+}
+
+
+def _override(function, values, args):
+    '''
+    Returns the result of `function(*args)` from the first of `values` that
+    overrides it, or NotImplemented if none of them do.
+
+    Like numpy's `__array_function__`, types override `where`, `select` and
+    `weighted_average` with an `__obp_function__(function, args)` method,
+    which returns the result, or NotImplemented to defer to the other
+    values.
+    '''
+    for value in values:
+        override = getattr(value, '__obp_function__', None)
+        if override is not None:
+            result = override(function, args)
+            if result is not NotImplemented:
+                return result
+    return NotImplemented
+
+
+def where(condition, x, y):
+    '''
+    Like `numpy.where(condition, x, y)`, but `x` and `y` may also be `Dual`
+    numbers, in which case a scalar condition gives a scalar `Dual`.
+    '''
+    result = _override(where, (condition, x, y), (condition, x, y))
+    if result is not NotImplemented:
+        return result
+    if not isinstance(x, Dual) and not isinstance(y, Dual):
+        return numpy.where(condition, x, y)
+    x = _lift(x)
+    y = _lift(y)
+    names = set(x.derivatives) | set(y.derivatives)
+    # the values may also override where
+    return Dual(where(condition, x.value, y.value)[()],
+                dict((name, where(condition, x.derivative(name),
+                                  y.derivative(name))[()])
+                     for name in names))
+
+
+def select(condlist, choicelist, default=0):
+    '''
+    Like `numpy.select(condlist, choicelist, default)`, but the choices
+    and default may also be `Dual` numbers.
+    '''
+    choices = list(choicelist) + [default]
+    result = _override(select, list(condlist) + choices,
+                       (condlist, choicelist, default))
+    if result is not NotImplemented:
+        return result
+    if not any(isinstance(choice, Dual) for choice in choices):
+        return numpy.select(condlist, choicelist, default)
+    choices = [_lift(choice) for choice in choices]
+    names = set()
+    for choice in choices:
+        names.update(choice.derivatives)
+    # the values may also override select
+    value = select(condlist, [c.value for c in choices[:-1]],
+                   choices[-1].value)
+    derivatives = {}
+    for name in names:
+        derivatives[name] = select(
+            condlist, [c.derivative(name) for c in choices[:-1]],
+            choices[-1].derivative(name))
+    return Dual(value, derivatives)
+
+
+def weighted_average(num, denom, values):
+    '''
+    Returns `num / denom`, which is a weighted average of `values` with
+    non-negative weights, i.e. `num` is the sum of the weighted values, and
+    `denom` is the sum of the weights. Where the weights are all zero, the
+    result is meaningless, and must be replaced by the caller. Types that
+    bound their values (see `Interval`) override this, to bound the average
+    by the range of `values`.
+    '''
+    values = list(values)
+    result = _override(weighted_average, [num, denom] + values,
+                       (num, denom, values))
+    if result is not NotImplemented:
+        return result
+    value = num / denom
+    if not isinstance(value, Dual):
+        return value
+    # the values may also override weighted_average
+    return Dual(weighted_average(_lift(num).value, _lift(denom).value,
+                                 [_lift(v).value for v in values]),
+                value.derivatives)
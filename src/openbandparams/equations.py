@@ -18,6 +18,16 @@
 #
 #############################################################################
 
+from .dual import where
+
 
 def varshni(Eg_0, alpha, beta, T):
-    return Eg_0 - alpha * T ** 2 / (T + beta)
+    '''
+    Returns the bandgap given by the Varshni equation. `T` may be an array,
+    in which case an array is returned.
+    '''
+    # alpha * T ** 2 / (T + beta) goes to 0 as T goes to 0, even if beta is 0,
+    # so mask out the zero denominator to avoid dividing by zero
+    denom = T + beta
+    denom = where(denom == 0., 1., denom)
+    return Eg_0 - alpha * T ** 2 / denom
@@ -33,33 +33,34 @@ alloy = GaInAsSb
 # calculate the data
 T = 300  # K
 N = 100
-xs = numpy.linspace(0, 1, N)
-ys = numpy.linspace(0, 1, N)
-X, Y = numpy.meshgrid(xs, ys)
-Z = numpy.empty(shape=(N, N), dtype=numpy.double)
-W = numpy.empty(shape=(N, N), dtype=numpy.double)
-S = numpy.empty(shape=(N, N), dtype=numpy.double)
-for i in xrange(N):
-    for j in xrange(N):
-        strained = alloy(x=X[i, j], y=Y[i, j]).strained_001(GaSb)
-        strain = strained.strain_out_of_plane(T=T)
-        if False:#not (0. <= strain <= 0.03):
-            Z[i, j] = numpy.nan
-            W[i, j] = numpy.nan
-            S[i, j] = numpy.nan
-        else:
-            Z[i, j] = strained.VBO_hh(T=T) - GaSb.VBO()
-            W[i, j] = strained.Eg(T=T)
-            S[i, j] = strain
+kwargs = {'T': T}
+
+
+def get_levels(name, offset=0.):
+    # 20 levels spanning the range of the parameter, like plt.contour
+    xs = numpy.linspace(0, 1, 21)
+    X, Y = numpy.meshgrid(xs, xs)
+    values = getattr(alloy(x=X, y=Y).strained_001(GaSb), name)(**kwargs)
+    return numpy.linspace(values.min(), values.max(), 22)[1:-1] - offset
+
+
+def plot_contours(name, color, offset=0.):
+    levels = get_levels(name, offset)
+    contours = alloy.iso_parameter_contours(name, levels + offset, n=N,
+                                            substrate=GaSb,
+                                            parameter_kwargs=kwargs)
+    for level, lines in zip(levels, contours):
+        for line in lines:
+            plt.plot(1 - line[:, 0], 1 - line[:, 1], color + '-')
+            middle = line[len(line) // 2]
+            plt.text(1 - middle[0], 1 - middle[1], '%.3g' % level,
+                     color=color, fontsize=10, ha='center', va='center')
 
 # plot it
 fig = plt.figure()
-CS = plt.contour(1-X, 1-Y, Z, 20, colors='r')
-plt.clabel(CS, inline=True, fontsize=10)
-CS2 = plt.contour(1-X, 1-Y, W, 20, colors='g')
-plt.clabel(CS2, inline=True, fontsize=10)
-CS3 = plt.contour(1-X, 1-Y, S, 20, colors='b')
-plt.clabel(CS3, inline=True, fontsize=10)
+plot_contours('VBO_hh', 'r', offset=GaSb.VBO())
+plot_contours('Eg', 'g')
+plot_contours('strain_out_of_plane', 'b')
 plt.title('$%s/GaSb$ (T = %.0f K)' % (alloy.latex(), T))
 plt.xlabel('%s fraction' % alloy.elements[1])
 plt.ylabel('%s fraction' % alloy.elements[3])
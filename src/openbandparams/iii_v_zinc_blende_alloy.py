@@ -17,6 +17,8 @@
 #   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+import numpy
+
 from .alloy import Alloy
 from .iii_v_alloy import IIIVAlloy
 from .iii_v_zinc_blende_strained import IIIVZincBlendeStrained001
@@ -95,9 +97,9 @@ class IIIVZincBlendeAlloy(IIIVAlloy):
         Returns the bandgap, Eg, in eV at a given
         temperature, T, in K (default=300.).
         '''
-        return min(self.Eg_Gamma(**kwargs),
-                   self.Eg_L(**kwargs),
-                   self.Eg_X(**kwargs))
+        return numpy.minimum(numpy.minimum(self.Eg_Gamma(**kwargs),
+                                           self.Eg_L(**kwargs)),
+                             self.Eg_X(**kwargs))
         
     @method_parameter(dependencies=['Eg_Gamma_0', 'alpha_Gamma', 'beta_Gamma'],
                       units='eV')
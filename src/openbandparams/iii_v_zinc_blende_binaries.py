@@ -18,7 +18,7 @@
 #
 #############################################################################
 
-from math import tanh
+import numpy
 from .references import vurgaftman_2001, adachi_1987, adachi_1982
 from .parameter import ValueParameter, MethodParameter
 from .iii_v_zinc_blende_binary import IIIVZincBlendeBinary
@@ -194,10 +194,10 @@ def GaP_Eg_Gamma(self, **kwargs):
 
     GaP has a unique Gamma-gap temperature dependence.
     '''
-    T = kwargs.get('T', 300.)
-    if T < 1e-4:
-        return self.Eg_Gamma_0()
-    return self.Eg_Gamma_0() + 0.1081 * (1 - 1. / tanh(164. / T))  # eV
+    # 1 / tanh(164 / T) goes to 1 as T goes to 0, so clip T to avoid
+    # dividing by zero
+    T = numpy.maximum(kwargs.get('T', 300.), 1e-4)
+    return self.Eg_Gamma_0() + 0.1081 * (1 - 1. / numpy.tanh(164. / T))  # eV
 GaP.add_parameter(MethodParameter('Eg_Gamma', GaP_Eg_Gamma,
                                   dependencies=['Eg_Gamma_0'],
                                   units='eV',
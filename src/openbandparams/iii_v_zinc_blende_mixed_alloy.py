@@ -18,6 +18,8 @@
 #
 #############################################################################
 
+import numpy
+
 from .iii_v_zinc_blende_alloy import IIIVZincBlendeAlloy
 from .parameter import method_parameter
 from .references import vurgaftman_2001
@@ -33,6 +35,71 @@ class IIIVZincBlendeMixedAlloy(IIIVZincBlendeAlloy):
         Used to specify the alloy composition.
         '''
         raise NotImplementedError()
+
+    def _with_composition(self, **kwargs):
+        return self(**kwargs)
+
+    @staticmethod
+    def _parse_fraction(value):
+        '''
+        Returns an alloy fraction as a float, or as an array of floats if
+        `value` is array-like.
+
+        Fractions may also be variables that stand in for numbers, such as
+        `Dual`s, which are returned unchanged. Variables define
+        `__obp_fraction__()`, which returns the smallest and largest values
+        they take, or None if their values are unknown, and `round(decimals)`.
+        '''
+        if hasattr(value, '__obp_fraction__'):
+            return value
+        if numpy.ndim(value) == 0:
+            return float(value)
+        else:
+            return numpy.array(value, dtype=float)
+
+    @classmethod
+    def _round_fraction(cls, value):
+        '''
+        Returns an alloy fraction rounded to 6 decimal places, as a float or
+        as an array of floats if `value` is array-like.
+        '''
+        if hasattr(value, '__obp_fraction__'):
+            return value.round(6)
+        value = cls._parse_fraction(value)
+        if numpy.ndim(value) == 0:
+            return round(value, 6)
+        else:
+            return numpy.round(value, 6)
+
+    @staticmethod
+    def _is_valid_fraction(value):
+        '''
+        Returns True if `value` (or every element of `value`) is between
+        0 and 1, or False, otherwise. Variables whose values are unknown are
+        assumed to be valid, and variables that take a range of values are
+        valid if any of them are.
+        '''
+        if hasattr(value, '__obp_fraction__'):
+            bounds = value.__obp_fraction__()
+            if bounds is None:
+                return True
+            minimum, maximum = bounds
+            return bool(numpy.all((maximum >= 0.) & (minimum <= 1.)))
+        return bool(numpy.all((0. <= value) & (value <= 1.)))
+
+    @staticmethod
+    def _check_lattice_range(a, a0, a1):
+        '''
+        Raises a ValueError if the lattice parameter, `a`, (or any element of
+        `a`) is outside of the range between `a0` and `a1`.
+        '''
+        a, amin, amax = numpy.broadcast_arrays(a, numpy.minimum(a0, a1),
+                                               numpy.maximum(a0, a1))
+        out_of_range = ~((amin <= a) & (a <= amax))
+        if numpy.any(out_of_range):
+            raise ValueError('a of {:g} out of range [{:g}, {:g}]'.format(
+                a[out_of_range].flat[0], amin[out_of_range].flat[0],
+                amax[out_of_range].flat[0]))
     
     def _interpolate(self, name, kwargs):
         raise NotImplementedError()
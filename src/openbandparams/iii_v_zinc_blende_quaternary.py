@@ -19,8 +19,13 @@
 #############################################################################
 __all__ = ['IIIVZincBlendeQuaternary']
 
+import numpy
+
+from .alloy import MissingParameterError
 from .iii_v_zinc_blende_mixed_alloy import IIIVZincBlendeMixedAlloy
-from .algorithms import bisect
+from .roots import brentq
+from .contours import find_contours
+from .dual import where, select, weighted_average
 
 class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
     '''
@@ -123,17 +128,17 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
             # binaries = (AD, BD, CD)
             # ternaries = (ABD, ACD, BCD)
             if x is not None and y is not None and z is None:
-                x = round(float(x), 6)
-                y = round(float(y), 6)
-                z = round(1. - x - y, 6)
+                x = self._round_fraction(x)
+                y = self._round_fraction(y)
+                z = self._round_fraction(1. - x - y)
             elif x is not None and y is None and z is not None:
-                x = round(float(x), 6)
-                z = round(float(z), 6)
-                y = round(1. - x - z, 6)
+                x = self._round_fraction(x)
+                z = self._round_fraction(z)
+                y = self._round_fraction(1. - x - z)
             elif x is None and y is not None and z is not None:
-                y = round(float(y), 6)
-                z = round(float(z), 6)
-                x = round(1. - y - z, 6)
+                y = self._round_fraction(y)
+                z = self._round_fraction(z)
+                x = self._round_fraction(1. - y - z)
             else:
                 raise ValueError()
         elif self._type == 3:
@@ -141,25 +146,35 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
             # binaries = (AC, AD, BC, BD)
             # ternaries = (ABC, ABD, ACD, BCD)
             if x is not None and y is not None and z is None:
-                x = round(float(x), 6)
-                y = round(float(y), 6)
+                x = self._round_fraction(x)
+                y = self._round_fraction(y)
                 z = None
             else:
                 raise ValueError()
         else:
             raise RuntimeError()
-        if (not (0. <= x <= 1.) or not (0. <= y <= 1.) or
-            z is not None and not (0. <= z <= 1.)        ):
+        if (not self._is_valid_fraction(x) or
+            not self._is_valid_fraction(y) or
+            z is not None and not self._is_valid_fraction(z)):
             raise ValueError('The alloy fractions must be between 0 and 1')
         return x, y, z
     
+    def _get_parents(self):
+        return list(self.ternaries)
+
     def _instance(self, x=None, y=None, z=None):
-        instance = IIIVZincBlendeQuaternary(self.name, self.elements,
-                                            self.ternaries, x=x, y=y, z=z)
-        for parameter in self._parameters.values():
-            instance.set_parameter(parameter)
+        instance = self._copy()
+        if x is not None or y is not None or z is not None:
+            instance._xyz = self._parse_xyz(x, y, z)
+        else:
+            instance._xyz = None
         return instance
 
+    def _with_composition_variables(self, variable):
+        x, y = (None, None) if self._xyz is None else self._xyz[:2]
+        return (self._instance(x=variable('x', x), y=variable('y', y)),
+                ['x', 'y'])
+
     def _has_x(self, kwargs):
         '''Returns True if x is explicitly defined in kwargs'''
         return (('x' in kwargs) or (self._element_x in kwargs) or
@@ -171,11 +186,12 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         Otherwise, raises TypeError.
         '''
         if 'x' in kwargs:
-            return round(float(kwargs['x']), 6)
+            return self._round_fraction(kwargs['x'])
         elif self._element_x in kwargs:
-            return round(float(kwargs[self._element_x]), 6)
+            return self._round_fraction(kwargs[self._element_x])
         elif self._type == 3 and self._element_1mx in kwargs:
-            return round(1. - float(kwargs[self._element_1mx]), 6)
+            return self._round_fraction(
+                1. - self._parse_fraction(kwargs[self._element_1mx]))
         else:
             raise TypeError()
 
@@ -190,11 +206,12 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         Otherwise, raises TypeError.
         '''
         if 'y' in kwargs:
-            return round(float(kwargs['y']), 6)
+            return self._round_fraction(kwargs['y'])
         elif self._element_y in kwargs:
-            return round(float(kwargs[self._element_y]), 6)
+            return self._round_fraction(kwargs[self._element_y])
         elif self._type == 3 and self._element_1my in kwargs:
-            return round(1. - float(kwargs[self._element_1my]), 6)
+            return self._round_fraction(
+                1. - self._parse_fraction(kwargs[self._element_1my]))
         else:
             raise TypeError()
 
@@ -212,14 +229,23 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         '''
         if self._type == 1 or self._type == 2:
             if 'z' in kwargs:
-                return round(float(kwargs['z']), 6)
+                return self._round_fraction(kwargs['z'])
             elif self._element_z in kwargs:
-                return round(float(kwargs[self._element_z]), 6)
+                return self._round_fraction(kwargs[self._element_z])
         raise TypeError()
 
     def __call__(self, **kwargs):
         '''
         Used to specify the alloy composition.
+
+        The composition may be given as numbers or as arrays of numbers
+        (e.g. from `numpy.meshgrid`), in which case every parameter of the
+        returned instance is evaluated over the whole composition array at
+        once, and returns an array of the same shape.
+
+        Likewise, when lattice matching, `a`, `T` and the given composition
+        may be arrays, which are broadcast against each other, and the
+        remaining composition is solved for every element at once.
         '''
         if self._has_x(kwargs) and self._has_y(kwargs):
             x = self._get_x(kwargs)
@@ -243,55 +269,44 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
             if self._has_x(kwargs):
                 x = self._get_x(kwargs)
                 if self._type in [1, 2]:
-                    ymax = round(1. - x, 6)
+                    ymax = self._round_fraction(1. - x)
                 elif self._type == 3:
                     ymax = 1.
                 else:
                     raise RuntimeError()
                 z = None
-                a0 = self(x=x, y=0.).a(T=T)
-                a1 = self(x=x, y=ymax).a(T=T)
-                amin = min(a0, a1)
-                amax = max(a0, a1)
-                if not (amin <= a <= amax):
-                    raise ValueError('a of {:g} out of range [{:g}, {:g}]'
-                                     ''.format(a, amin, amax))
-                # find the correct composition, x
-                y = bisect(func=lambda y: self(x=x, y=y).a(T=T) - a,
-                           a=0, b=ymax)
+                self._check_lattice_range(a, self(x=x, y=0.).a(T=T),
+                                          self(x=x, y=ymax).a(T=T))
+                # find the correct composition, y (compositions are
+                # rounded to 1e-6, so there's no use in a smaller xtol)
+                y = brentq(func=lambda y, x, a, T:
+                           self(x=x, y=y).a(T=T) - a,
+                           a=0, b=ymax, xtol=1e-7, args=(x, a, T))
             elif self._has_y(kwargs):
                 y = self._get_y(kwargs)
                 if self._type in [1, 2]:
-                    xmax = round(1. - y, 6)
+                    xmax = self._round_fraction(1. - y)
                 elif self._type == 3:
                     xmax = 1.
                 else:
                     raise RuntimeError()
                 z = None
-                a0 = self(x=0., y=y).a(T=T)
-                a1 = self(x=xmax, y=y).a(T=T)
-                amin = min(a0, a1)
-                amax = max(a0, a1)
-                if not (amin <= a <= amax):
-                    raise ValueError('a of {:g} out of range [{:g}, {:g}]'
-                                     ''.format(a, amin, amax))
+                self._check_lattice_range(a, self(x=0., y=y).a(T=T),
+                                          self(x=xmax, y=y).a(T=T))
                 # find the correct composition, x
-                x = bisect(func=lambda x: self(x=x, y=y).a(T=T) - a,
-                           a=0, b=xmax)
+                x = brentq(func=lambda x, y, a, T:
+                           self(x=x, y=y).a(T=T) - a,
+                           a=0, b=xmax, xtol=1e-7, args=(y, a, T))
             elif self._has_z(kwargs):
                 y = None
                 z = self._get_z(kwargs)
-                xmax = round(1. - z, 6)
-                a0 = self(x=0., z=z).a(T=T)
-                a1 = self(x=xmax, z=z).a(T=T)
-                amin = min(a0, a1)
-                amax = max(a0, a1)
-                if not (amin <= a <= amax):
-                    raise ValueError('a of {:g} out of range [{:g}, {:g}]'
-                                     ''.format(a, amin, amax))
+                xmax = self._round_fraction(1. - z)
+                self._check_lattice_range(a, self(x=0., z=z).a(T=T),
+                                          self(x=xmax, z=z).a(T=T))
                 # find the correct composition, x
-                x = bisect(func=lambda x: self(x=x, z=z).a(T=T) - a,
-                           a=0, b=xmax)
+                x = brentq(func=lambda x, z, a, T:
+                           self(x=x, z=z).a(T=T) - a,
+                           a=0, b=xmax, xtol=1e-7, args=(z, a, T))
         else:
             raise TypeError(
                 "Missing required key word argument.\n" + self._get_usage())
@@ -319,6 +334,292 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         else:
             raise RuntimeError()
 
+    def iso_lattice_curve(self, a, T=300., n=101, axis='x', parameters=(),
+                          parameter_kwargs=None):
+        '''
+        Returns the compositions that are lattice matched to `a` at the
+        temperature `T`, sampled at `n` points along the given composition
+        `axis` ('x' or 'y'), and the values of the named `parameters` at
+        those compositions.
+
+        The lattice matched range of `axis` is found first, and the other
+        composition is then solved for at all `n` points at once.
+
+        Parameters
+        ----------
+        a : number
+            lattice parameter to match, in Angstroms
+        T : number (default=300.)
+            lattice matching temperature, in Kelvin
+        n : int (default=101)
+            number of points along the curve
+        axis : string (default='x')
+            the composition that is sampled, 'x' or 'y'. The other
+            composition is solved for.
+        parameters : list of strings (default=())
+            names of the parameters to evaluate along the curve
+        parameter_kwargs : dict (default=None)
+            keyword arguments used to evaluate the parameters, e.g.
+            `{'T': 77.}`. By default, the parameters are evaluated at `T`.
+
+        Returns
+        -------
+        curve : dict of arrays
+            the compositions, 'x' and 'y' (and 'z' for type 1 and 2
+            quaternaries), and the named parameters along the curve
+        '''
+        if axis == 'x':
+            def instance(pinned, free):
+                return self(x=pinned, y=free)
+        elif axis == 'y':
+            def instance(pinned, free):
+                return self(x=free, y=pinned)
+        else:
+            raise ValueError("axis must be 'x' or 'y'")
+        if parameter_kwargs is None:
+            parameter_kwargs = {'T': T}
+
+        def free_max(pinned):
+            if self._type in [1, 2]:
+                return self._round_fraction(1. - pinned)
+            else:
+                return numpy.ones_like(pinned)
+
+        def boundary_mismatch(pinned, at_max):
+            free = free_max(pinned) if at_max else 0. * pinned
+            return instance(pinned, free).a(T=T) - a
+
+        # find the lattice matched range along `axis`, where the lattice
+        # parameters at the two bounds of the other composition straddle `a`
+        coarse = numpy.linspace(0., 1., max(n, 101))
+        mismatch = [boundary_mismatch(coarse, False),
+                    boundary_mismatch(coarse, True)]
+        matched = numpy.flatnonzero(mismatch[0] * mismatch[1] <= 0.)
+        if len(matched) == 0:
+            raise ValueError('no {} compositions are lattice matched to a of '
+                             '{:g}'.format(self.name, a))
+        ends = []
+        for i, j in [(matched[0], matched[0] - 1),
+                     (matched[-1], matched[-1] + 1)]:
+            if j < 0 or j >= len(coarse):
+                ends.append((coarse[i], None))
+                continue
+            # the range ends where the curve meets one of the bounds
+            at_max = mismatch[0][i] * mismatch[0][j] > 0.
+            pinned = brentq(func=lambda p: boundary_mismatch(p, at_max),
+                            a=coarse[j], b=coarse[i], xtol=1e-7)
+            free = free_max(pinned) if at_max else 0.
+            ends.append((pinned, free))
+
+        pinned = numpy.linspace(ends[0][0], ends[1][0], n)
+        free = numpy.empty(n)
+        solve = numpy.ones(n, dtype=bool)
+        for index, (_, end_free) in zip([0, -1], ends):
+            if end_free is not None:
+                free[index] = end_free
+                solve[index] = False
+        free[solve] = brentq(
+            func=lambda f, p: instance(p, f).a(T=T) - a,
+            a=numpy.zeros(solve.sum()), b=free_max(pinned[solve]),
+            xtol=1e-7, args=(pinned[solve],))
+        alloy = instance(pinned, free)
+
+        x, y, z = alloy._xyz
+        curve = {'x': x, 'y': y}
+        if z is not None:
+            curve['z'] = z
+        for name in parameters:
+            curve[name] = getattr(alloy, name)(**parameter_kwargs)
+        return curve
+
+    def solve_lattice_matched(self, name, value, a, T=300., axis='x',
+                              parameter_kwargs=None, ptol=1e-5, atol=1e-5,
+                              maxiter=20):
+        '''
+        Returns an instance with the composition that is lattice matched to
+        `a` at the temperature `T`, and for which the named parameter (e.g.
+        'Eg', 'CBO' or 'VBO') equals `value`.
+
+        `value` may be an array, in which case the compositions for all of
+        the values are found at once, and the returned instance has arrays
+        of compositions with the same shape as `value`.
+
+        An initial guess is interpolated from the iso-lattice curve (see
+        `iso_lattice_curve`), and refined with Newton's method, using
+        exact Jacobians from `differentiate`. Any values for which Newton's
+        method fails to converge are then solved by Brent's method along the
+        iso-lattice curve. If the parameter takes the same value at more
+        than one point on the curve, the solution nearest the start of the
+        curve is used as the initial guess.
+
+        Parameters
+        ----------
+        name : string
+            name of the parameter to match
+        value : number or array
+            target value(s) of the parameter
+        a : number
+            lattice parameter to match, in Angstroms
+        T : number (default=300.)
+            lattice matching temperature, in Kelvin
+        axis : string (default='x')
+            the composition along which the iso-lattice curve is sampled
+            for the initial guess, 'x' or 'y'
+        parameter_kwargs : dict (default=None)
+            keyword arguments used to evaluate the parameter, e.g.
+            `{'T': 77.}`. By default, the parameter is evaluated at `T`.
+        ptol : number (default=1e-5)
+            the tolerance on the parameter value
+        atol : number (default=1e-5)
+            the tolerance on the lattice parameter, in Angstroms
+        maxiter : int (default=20)
+            the maximum number of Newton iterations
+        '''
+        if parameter_kwargs is None:
+            parameter_kwargs = {'T': T}
+        value = numpy.asarray(value, dtype=float)
+        targets = value.ravel()
+
+        def residuals(x, y, targets):
+            alloy = self(x=x, y=y)
+            return (getattr(alloy, name)(**parameter_kwargs) - targets,
+                    alloy.a(T=T) - a)
+
+        def max_x(y):
+            # the upper bound on one composition, given the other
+            return 1. - y if self._type in [1, 2] else numpy.ones_like(y)
+
+        # interpolate the initial guesses from the iso-lattice curve
+        curve = self.iso_lattice_curve(a, T=T, n=21, axis=axis,
+                                       parameters=[name],
+                                       parameter_kwargs=parameter_kwargs)
+        deviation = curve[name] - targets[:, numpy.newaxis]
+        crosses = deviation[:, :-1] * deviation[:, 1:] <= 0.
+        if not crosses.any(axis=1).all():
+            missing = targets[~crosses.any(axis=1)][0]
+            raise ValueError('no lattice matched {} has {} of {:g}'
+                             ''.format(self.name, name, missing))
+        i = crosses.argmax(axis=1)
+        rows = numpy.arange(len(targets))
+        d0 = deviation[rows, i]
+        d1 = deviation[rows, i + 1]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            t = numpy.where(d0 == d1, 0., d0 / (d0 - d1))
+        x = curve['x'][i] + t * (curve['x'][i + 1] - curve['x'][i])
+        y = curve['y'][i] + t * (curve['y'][i + 1] - curve['y'][i])
+
+        # refine with Newton's method (the derivatives are exact, and
+        # unaffected by the rounding of the compositions)
+        for _ in range(maxiter):
+            alloy = self(x=x, y=y)
+            p = alloy.differentiate(name, **parameter_kwargs)
+            g = alloy.differentiate('a', T=T)
+            p0, g0 = p.value - targets, g.value - a
+            converged = (abs(p0) <= ptol) & (abs(g0) <= atol)
+            if converged.all():
+                break
+            dpdx, dpdy = p.derivative('x'), p.derivative('y')
+            dgdx, dgdy = g.derivative('x'), g.derivative('y')
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                det = dpdx * dgdy - dpdy * dgdx
+                dx = (p0 * dgdy - g0 * dpdy) / det
+                dy = (g0 * dpdx - p0 * dgdx) / det
+            step = ~converged & numpy.isfinite(dx) & numpy.isfinite(dy)
+            x = numpy.where(step, numpy.clip(x - dx, 0., 1.), x)
+            y = numpy.where(step, numpy.clip(y - dy, 0., max_x(x)), y)
+        else:
+            p0, g0 = residuals(x, y, targets)
+            converged = (abs(p0) <= ptol) & (abs(g0) <= atol)
+
+        # fall back to root finding along the iso-lattice curve
+        failed = numpy.flatnonzero(~converged)
+        if len(failed):
+            pinned = curve[axis]
+
+            def instance(pinned, free):
+                if axis == 'x':
+                    return self(x=pinned, y=free)
+                else:
+                    return self(x=free, y=pinned)
+
+            def lattice_match(p):
+                return brentq(func=lambda f, p: instance(p, f).a(T=T) - a,
+                              a=numpy.zeros_like(p), b=max_x(p),
+                              xtol=1e-7, args=(p,))
+
+            def deviation_at(p, target):
+                alloy = instance(p, lattice_match(p))
+                return getattr(alloy, name)(**parameter_kwargs) - target
+
+            j = i[failed]
+            p = brentq(func=deviation_at, a=pinned[j], b=pinned[j + 1],
+                       xtol=1e-7, fa=deviation[failed, j],
+                       fb=deviation[failed, j + 1], args=(targets[failed],))
+            f = lattice_match(p)
+            if axis == 'x':
+                x[failed], y[failed] = p, f
+            else:
+                x[failed], y[failed] = f, p
+        return self(x=x.reshape(value.shape), y=y.reshape(value.shape))
+
+    def iso_parameter_contours(self, name, levels, n=101, substrate=None,
+                               parameter_kwargs=None, xtol=1e-6):
+        '''
+        Returns the contours in composition space, (x, y), along which the
+        named parameter takes each of the given `levels`.
+
+        The parameter is evaluated over an `n` by `n` grid of compositions
+        at once, the contours are traced through the grid by marching
+        squares, and each point of the contours is then refined along its
+        grid edge with Brent's method.
+
+        Parameters
+        ----------
+        name : string
+            name of the parameter, e.g. 'Eg'
+        levels : list of numbers
+            the parameter values of the contours
+        n : int (default=101)
+            number of grid points along each composition
+        substrate : alloy or number (default=None)
+            if given, the parameter is evaluated for the alloy strained to
+            this substrate (see `strained_001`), e.g. for 'Eg' or
+            'strain_out_of_plane'
+        parameter_kwargs : dict (default=None)
+            keyword arguments used to evaluate the parameter, e.g.
+            `{'T': 77.}`
+        xtol : number (default=1e-6)
+            the tolerance of the refined compositions
+
+        Returns
+        -------
+        contours : list of lists of arrays
+            for each level, a list of polylines, each an array of shape
+            `(m, 2)` of `(x, y)` points. Closed polylines end with their
+            first point.
+        '''
+        if parameter_kwargs is None:
+            parameter_kwargs = {}
+
+        def evaluate(x, y):
+            alloy = self(x=x, y=y)
+            if substrate is not None:
+                alloy = alloy.strained_001(substrate)
+            return getattr(alloy, name)(**parameter_kwargs)
+
+        fractions = numpy.linspace(0., 1., n)
+        values = numpy.empty((n, n))
+        if self._type in [1, 2]:
+            # only the lower left triangle, x + y <= 1, is valid
+            j, i = numpy.indices((n, n))
+            valid = (i + j <= n - 1)
+            values.fill(numpy.nan)
+            values[valid] = evaluate(fractions[i[valid]], fractions[j[valid]])
+        else:
+            values[...] = evaluate(*numpy.meshgrid(fractions, fractions))
+        return find_contours(values, levels, fractions, fractions,
+                             func=evaluate, xtol=xtol)
+
     def __repr__(self):
         if self._xyz is None:
             return '{}'.format(self.name)
@@ -367,27 +668,28 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
     def element_fraction(self, element):
         if self._xyz is None:
             raise TypeError('Alloy composition has not been specified.')
+        x, y, z = self._xyz
         if self._type == 1 or self._type == 2:
             # AB_{x}C_{y}D_{1-x-y}
             if element == self._element_w:
                 return 1
             elif element == self._element_x:
-                return self._x
+                return x
             elif element == self._element_y:
-                return self._y
+                return y
             elif element == self._element_z:
-                return self._z
+                return z
             else:
                 return 0
         elif self._type == 3:
             if element == self._element_x:
-                return self._x
+                return x
             elif element == self._element_1mx:
-                return (1 - self._x)
+                return (1 - x)
             elif element == self._element_y:
-                return self._y
+                return y
             elif element == self._element_1my:
-                return (1 - self._y)
+                return (1 - y)
             else:
                 return 0
         else:
@@ -423,16 +725,19 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         
         p12 = t12.get_parameter(name)
         if p12 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t12.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t12.name, name))
         p13 = t13.get_parameter(name)
         if p13 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t13.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t13.name, name))
         p23 = t23.get_parameter(name)
         if p23 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t23.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t23.name, name))
         
         v12 = p12(**kwargs)
         v13 = p13(**kwargs)
@@ -444,12 +749,10 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         weight23 = y * z
         num = weight12 * v12 + weight13 * v13 + weight23 * v23
         denom = weight12 + weight13 + weight23
-        # handle these cases explicitly, so there's no divide by zero
-        if denom == 0.:
-            if x == 0.:
-                return v23
-            else:
-                return v13
+        # the binary compositions are handled explicitly below, so mask them
+        # out here to avoid dividing by zero
+        is_binary = (denom == 0.)
+        denom = where(is_binary, 1., denom)
 
         # Check if there are bowing parameters provided
         C = self._get_bowing(name, kwargs)
@@ -457,11 +760,14 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
             # a bowing parameter exists - use it
             # Note: this is an experimental mixing formula for
             # adding additional quaternary-induced bowing
-            return num / denom - C * x * (1-x) * y * (1-y) * z * (1-z)
+            value = (weighted_average(num, denom, [v12, v13, v23]) -
+                     C * x * (1-x) * y * (1-y) * z * (1-z))
         else:
             # otherwise, use a weighted average of the ternary bowing
             # parameters
-            return num / denom
+            value = weighted_average(num, denom, [v12, v13, v23])
+        return select([is_binary & (x == 0.), is_binary],
+                      [v23, v13], value)[()]
 
     def _interpolate3(self, name, kwargs):
         x, y, _ = self._xyz
@@ -481,35 +787,30 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         
         p12 = t12.get_parameter(name)
         if p12 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t12.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t12.name, name))
         p23 = t23.get_parameter(name)
         if p23 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t23.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t23.name, name))
         p43 = t43.get_parameter(name)
         if p43 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t43.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t43.name, name))
         p14 = t14.get_parameter(name)
         if p14 is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(t14.name, name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(t14.name, name))
         
         v12 = p12(**kwargs)
         v23 = p23(**kwargs)
         v43 = p43(**kwargs)
         v14 = p14(**kwargs)
 
-        # handle these cases explicitly, so there's no divide by zero
-        if x == 0.:
-            return v14
-        elif x == 1.:
-            return v23
-        elif y == 0.:
-            return v12
-        elif y == 1.:
-            return v43
         xinv = 1. - x
         yinv = 1. - y
         xweight = x * xinv
@@ -517,6 +818,9 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
         num = (xweight * (yinv * v12 + y * v43) + 
                yweight * (xinv * v14 + x * v23))
         denom = xweight + yweight
+        # the edges are handled explicitly below, so mask out the corners
+        # here to avoid dividing by zero
+        denom = where(denom == 0., 1., denom)
 
         # Check if there are bowing parameters provided
         C = self._get_bowing(name, kwargs)
@@ -524,6 +828,10 @@ class IIIVZincBlendeQuaternary(IIIVZincBlendeMixedAlloy):
             # a bowing parameter exists - use it
             # Note: this is a new, experimental mixing formula for
             # adding additional quaternary-induced bowing
-            return num / denom - C * xweight * yweight
+            value = (weighted_average(num, denom, [v12, v43, v14, v23]) -
+                     C * xweight * yweight)
         else:
-            return num / denom
+            value = weighted_average(num, denom, [v12, v43, v14, v23])
+        # handle the edges explicitly, in order of precedence
+        return select([x == 0., x == 1., y == 0., y == 1.],
+                      [v14, v23, v12, v43], value)[()]
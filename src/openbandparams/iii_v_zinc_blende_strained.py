@@ -18,6 +18,8 @@
 #
 #############################################################################
 
+import numpy
+
 from .iii_v_alloy import IIIVAlloy
 from .parameter import method_parameter
 from .references import arent_1989, vurgaftman_2001
@@ -64,6 +66,24 @@ class IIIVZincBlendeStrained001(IIIVAlloy):
                                                         parameters=None)
         #TODO: have get_references also search `unstrained` and `substrate`
     
+    def _get_parents(self):
+        if self.substrate is not None:
+            return [self.unstrained, self.substrate]
+        else:
+            return [self.unstrained]
+
+    def _with_composition(self, **kwargs):
+        alloy = self._copy()
+        alloy.unstrained = self.unstrained._with_composition(**kwargs)
+        return alloy
+
+    def _with_composition_variables(self, variable):
+        unstrained, variables = self.unstrained._with_composition_variables(
+            variable)
+        alloy = self._copy()
+        alloy.unstrained = unstrained
+        return alloy, variables
+
     def latex(self):
         if self._strain_out_of_plane is not None:
             return '{} strained {:g}% along [001]'.format(
@@ -249,14 +269,14 @@ class IIIVZincBlendeStrained001(IIIVAlloy):
     @method_parameter(dependencies=['VBO_hh', 'VBO_lh'],
                       units='eV')
     def VBO(self, **kwargs):
-        return max(self.VBO_hh(**kwargs), self.VBO_lh(**kwargs))
+        return numpy.maximum(self.VBO_hh(**kwargs), self.VBO_lh(**kwargs))
     
     @method_parameter(dependencies=['VBO_hh_strain_shift',
                                     'VBO_lh_strain_shift'],
                       units='eV')
     def VBO_strain_shift(self, **kwargs):
-        return max(self.VBO_hh_strain_shift(**kwargs),
-                   self.VBO_lh_strain_shift(**kwargs))
+        return numpy.maximum(self.VBO_hh_strain_shift(**kwargs),
+                             self.VBO_lh_strain_shift(**kwargs))
     
     @method_parameter(dependencies=['Eg_Gamma', 'Delta_SO', 'Ep', 'F'],
                       units='m_e', references=[vurgaftman_2001])
@@ -19,8 +19,12 @@
 #############################################################################
 __all__ = ['IIIVZincBlendeTernary']
 
+from .alloy import MissingParameterError
 from .iii_v_zinc_blende_mixed_alloy import IIIVZincBlendeMixedAlloy
-from .algorithms import bisect
+from .algorithms import quadratic_root
+from .roots import brentq
+from .lattice_table import LatticeTable
+from .parameter import ValueParameter
 
 class IIIVZincBlendeTernary(IIIVZincBlendeMixedAlloy):
     '''
@@ -46,8 +50,10 @@ class IIIVZincBlendeTernary(IIIVZincBlendeMixedAlloy):
         super(IIIVZincBlendeTernary, self).__init__(name, elements,
                                                     parameters=parameters)
         self.binaries = binaries
+        # LatticeTables, and the versions of the alloys they were built from
+        self._lattice_tables = {}
         if x is not None:
-            self._x = float(x)
+            self._x = self._parse_fraction(x)
         else:
             self._x = None
 
@@ -59,43 +65,121 @@ class IIIVZincBlendeTernary(IIIVZincBlendeMixedAlloy):
                 self._parameters == other._parameters,
                 self._x == other._x)
     
+    def _get_parents(self):
+        return list(self.binaries)
+
     def _instance(self, x=None):
-        instance = IIIVZincBlendeTernary(self.name, self.elements,
-                                         self.binaries, x=x)
-        for parameter in self._parameters.values():
-            instance.set_parameter(parameter)
+        instance = self._copy()
+        instance._lattice_tables = {}
+        if x is not None:
+            instance._x = self._parse_fraction(x)
+        else:
+            instance._x = None
         return instance
 
+    def _with_composition_variables(self, variable):
+        return self._instance(x=variable('x', self._x)), ['x']
+
     def __call__(self, **kwargs):
         '''
         Used to specify the alloy composition.
+
+        The composition may be given as a number or as an array of numbers,
+        in which case every parameter of the returned instance is evaluated
+        over the whole array at once, and returns an array of the same shape.
+
+        Likewise, when lattice matching, `a` and `T` may be arrays, which
+        are broadcast against each other, and the composition of the returned
+        instance is an array of the lattice matched compositions.
         '''
         if 'x' in kwargs:
-            x = float(kwargs['x'])
+            x = self._parse_fraction(kwargs['x'])
         elif self._element_x in kwargs:
-            x = float(kwargs[self._element_x])
+            x = self._parse_fraction(kwargs[self._element_x])
         elif self._element_1mx in kwargs:
-            x = 1. - float(kwargs[self._element_1mx])
+            x = 1. - self._parse_fraction(kwargs[self._element_1mx])
         elif 'a' in kwargs:
             # lattice match to the given lattice constant
             a = kwargs['a']
             T = kwargs.get('T', 300.)
             # make sure the lattice constant is available
-            b1a = self.binaries[0].a(T=T)
-            b2a = self.binaries[1].a(T=T)
-            amin = min(b1a, b2a)
-            amax = max(b1a, b2a)
-            if a < amin or a > amax:
-                raise ValueError('a out of range [%.3f, %.3f]' % (amin, amax))
+            self._check_lattice_range(a, self.binaries[0].a(T=T),
+                                      self.binaries[1].a(T=T))
             # find the correct composition, x
-            x = bisect(func=lambda x: self(x=x).a(T=T) - a, a=0, b=1)
+            x = self._lattice_match(a, T)
         else:
             raise TypeError(
                 "Missing required key word argument.\n" + self._get_usage())
-        if not (0. <= x <= 1.):
+        if not self._is_valid_fraction(x):
             raise ValueError('The alloy fraction must be between 0 and 1')
         return self._instance(x=x)
 
+    def _lattice_match(self, a, T):
+        '''
+        Returns the composition, x, that is lattice matched to `a` at the
+        temperature `T`.
+
+        If the lattice parameter is interpolated with constant bowing
+        parameters (or none), it is quadratic in x, and is solved in
+        closed form. Otherwise (e.g. if a bowing parameter is a
+        FunctionParameter), it is solved by Brent's method.
+        '''
+        coefficients = self._get_lattice_coefficients(T)
+        if coefficients is None:
+            return brentq(func=lambda x, a, T: self(x=x).a(T=T) - a,
+                          a=0, b=1, args=(a, T))
+        c2, c1, c0 = coefficients
+        return quadratic_root(c2, c1, c0 - a)
+
+    def get_lattice_table(self, T_min=0., T_max=1000., nx=1001, nT=101,
+                          xtol=1e-6):
+        '''
+        Returns a `LatticeTable` of the lattice parameter over the whole
+        composition range and the temperature range `[T_min, T_max]`, which
+        finds the compositions lattice matched to many lattice constants much
+        faster than lattice matching with `__call__`.
+
+        Tables are cached, and rebuilt only if a parameter has been set on
+        the ternary or its binaries since the table was built.
+        '''
+        key = (T_min, T_max, nx, nT, xtol)
+        versions = tuple(alloy._version for alloy in self._get_lineage())
+        if key in self._lattice_tables:
+            table, table_versions = self._lattice_tables[key]
+            if table_versions == versions:
+                return table
+        table = LatticeTable(self, T_min=T_min, T_max=T_max, nx=nx, nT=nT,
+                             xtol=xtol)
+        self._lattice_tables[key] = (table, versions)
+        return table
+
+    def _get_lattice_coefficients(self, T):
+        '''
+        Returns the coefficients (c2, c1, c0) of the lattice parameter at the
+        temperature `T`, `a = c2 * x**2 + c1 * x + c0`, or None if the
+        lattice parameter is not quadratic in x.
+        '''
+        for name in ['a', 'a_300K', 'thermal_expansion']:
+            if (name in self._parameters or name in self._aliases or
+                    getattr(type(self), name) is not
+                    getattr(IIIVZincBlendeMixedAlloy, name)):
+                return None
+        bowings = []
+        for name in ['a_300K_bowing', 'thermal_expansion_bowing']:
+            p = self.get_parameter(name, default=None)
+            if p is None:
+                bowings.append(0.)
+            elif isinstance(p, ValueParameter):
+                bowings.append(p.value)
+            else:
+                return None
+        dT = T - 300.
+        A, B = [binary.a_300K(T=T) + binary.thermal_expansion(T=T) * dT
+                for binary in self.binaries]
+        C = bowings[0] + bowings[1] * dT
+        # a = A * x + B * (1 - x) - C * x * (1 - x)
+        return C, A - B - C, B
+
     def _get_usage(self):
         return ("The supported kwarg combinations are as follows:"
                 "\n    - 'x' or '{A}' or '{B}'"
@@ -172,14 +256,14 @@ class IIIVZincBlendeTernary(IIIVZincBlendeMixedAlloy):
         x = self._x
         pA = self.binaries[0].get_parameter(name)
         if pA is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(self.binaries[0].name,
-                                           name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(self.binaries[0].name, name))
         pB = self.binaries[1].get_parameter(name)
         if pB is None:
-            raise AttributeError('"{}" is missing a required parameter: "{}".'
-                                 ''.format(self.binaries[1].name,
-                                           name))
+            raise MissingParameterError(
+                '"{}" is missing a required parameter: "{}".'
+                ''.format(self.binaries[1].name, name))
         A = pA(**kwargs)
         B = pB(**kwargs)
         C = self._get_bowing(name, kwargs)
@@ -0,0 +1,411 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Interval arithmetic, for bounding the values of parameters over ranges of
+compositions.
+
+An `Interval` is a range of values, `lower <= value <= upper`. Arithmetic
+on intervals, and the numpy ufuncs used by the parameter equations, give
+intervals that contain every value the same operations can give for values
+in their operands, so evaluating a parameter for an alloy whose composition
+variables are intervals bounds the parameter over those compositions. The
+bounds are conservative, and can be much wider than the actual range, but
+they are never too narrow (apart from floating point rounding errors).
+Bounds that are unknown, e.g. because a value may be `nan`, are `nan`.
+
+Comparisons give boolean intervals, whose lower bound is True where the
+comparison is certainly true, and whose upper bound is True where it is
+possibly true. `where` and `select` (see `openbandparams.dual`) accept
+boolean intervals, and give the union of the choices that are possible.
+
+A `Dual` whose value and derivatives are intervals bounds the derivatives
+over the intervals too, which `openbandparams.search` uses to narrow the
+bounds by the mean value theorem.
+'''
+
+import numpy
+
+from . import dual
+
+__all__ = ['Interval']
+
+
+def _lift(value):
+    '''
+    Returns `value` as an Interval, with equal bounds if it is not an
+    Interval.
+    '''
+    if isinstance(value, Interval):
+        return value
+    return Interval(value, value)
+
+
+def _defers(*values):
+    '''
+    Returns True if any of `values` is a `Dual`, which may have intervals as
+    its values, so that it handles the operation instead.
+    '''
+    return any(isinstance(value, dual.Dual) for value in values)
+
+
+def _minimum(*values):
+    result = values[0]
+    for value in values[1:]:
+        result = numpy.minimum(result, value)
+    return result
+
+
+def _maximum(*values):
+    result = values[0]
+    for value in values[1:]:
+        result = numpy.maximum(result, value)
+    return result
+
+
+class Interval(object):
+    '''
+    A range of values, `lower <= value <= upper`.
+
+    Parameters
+    ----------
+    lower : number or array
+        the lower bound, or `nan` if it is unknown
+    upper : number or array
+        the upper bound, or `nan` if it is unknown
+    '''
+    __slots__ = ('lower', 'upper')
+
+    # intervals compare by value, so they must not be hashed
+    __hash__ = None
+
+    def __init__(self, lower, upper):
+        self.lower = lower
+        self.upper = upper
+
+    def __repr__(self):
+        return 'Interval({!r}, {!r})'.format(self.lower, self.upper)
+
+    def __getitem__(self, key):
+        lower, upper = numpy.broadcast_arrays(self.lower, self.upper)
+        return Interval(lower[key], upper[key])
+
+    def __bool__(self):
+        if numpy.all(self.lower):
+            return True
+        if not numpy.any(self.upper):
+            return False
+        raise TypeError('The truth value of an uncertain Interval is '
+                        'ambiguous.')
+
+    __nonzero__ = __bool__
+
+    def round(self, decimals=0, out=None):
+        '''
+        Returns a copy with the bounds rounded to the given number of
+        decimals, which contains the rounded values. Used by `numpy.round`,
+        and to round alloy fractions.
+        '''
+        if out is not None:
+            raise TypeError('Intervals cannot be rounded in place.')
+        if numpy.ndim(self.lower) == 0 and numpy.ndim(self.upper) == 0:
+            return Interval(round(self.lower, decimals),
+                            round(self.upper, decimals))
+        return Interval(numpy.round(self.lower, decimals),
+                        numpy.round(self.upper, decimals))
+
+    def __obp_fraction__(self):
+        '''
+        Returns the smallest and largest values of this Interval as an alloy
+        fraction, i.e. its bounds.
+        '''
+        return self.lower, self.upper
+
+    def __obp_function__(self, function, args):
+        '''
+        Evaluates `where` and `select` for intervals (see `dual.where`).
+        '''
+        if function is dual.where:
+            condition, x, y = args
+            if not _defers(x, y):
+                return _where(condition, x, y)
+        elif function is dual.select:
+            condlist, choicelist, default = args
+            if not _defers(default, *choicelist):
+                return _select(condlist, choicelist, default)
+        elif function is dual.weighted_average:
+            num, denom, values = args
+            if not _defers(num, denom, *values):
+                return _weighted_average(num, denom, values)
+        return NotImplemented
+
+    # arithmetic
+
+    def __neg__(self):
+        return Interval(-self.upper, -self.lower)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Interval(numpy.maximum(numpy.maximum(self.lower, -self.upper),
+                                      0.),
+                        numpy.maximum(-self.lower, self.upper))
+
+    def __add__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(self.lower + other.lower, self.upper + other.upper)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(self.lower - other.upper, self.upper - other.lower)
+
+    def __rsub__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return _lift(other) - self
+
+    def __mul__(self, other):
+        if not isinstance(other, Interval):
+            if _defers(other):
+                return NotImplemented
+            # only the bounds need to be multiplied by a number
+            with numpy.errstate(invalid='ignore'):
+                products = self.lower * other, self.upper * other
+            return Interval(numpy.minimum(*products),
+                            numpy.maximum(*products))
+        with numpy.errstate(invalid='ignore'):
+            products = (self.lower * other.lower, self.lower * other.upper,
+                        self.upper * other.lower, self.upper * other.upper)
+        return Interval(_minimum(*products), _maximum(*products))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        # dividing by an interval that contains zero is unbounded
+        unbounded = (other.lower <= 0.) & (other.upper >= 0.)
+        with numpy.errstate(divide='ignore'):
+            reciprocal = Interval(
+                numpy.where(unbounded, -numpy.inf,
+                            numpy.true_divide(1., other.upper))[()],
+                numpy.where(unbounded, numpy.inf,
+                            numpy.true_divide(1., other.lower))[()])
+        return self * reciprocal
+
+    def __rtruediv__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return _lift(other) / self
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        if _defers(other):
+            return NotImplemented
+        if isinstance(other, Interval):
+            if not numpy.all(other.lower == other.upper):
+                return numpy.exp(other * numpy.log(self))
+            other = other.lower
+        if numpy.ndim(other) == 0 and other == int(other):
+            n = int(other)
+            if n == 0:
+                shape = numpy.broadcast(self.lower, self.upper).shape
+                return _lift(numpy.ones(shape)[()])
+            elif n < 0:
+                return 1. / self ** -n
+            elif n % 2 == 0:
+                # even powers are increasing in the magnitude
+                magnitude = abs(self)
+                return Interval(magnitude.lower ** n, magnitude.upper ** n)
+            else:
+                return Interval(self.lower ** n, self.upper ** n)
+        # other powers are only defined for non-negative values
+        return _monotonic(lambda value: numpy.power(value, other), self,
+                          increasing=numpy.greater_equal(other, 0.),
+                          minimum=0.)
+
+    def __rpow__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return _lift(other) ** self
+
+    # comparisons give boolean intervals, which are (certainly true,
+    # possibly true), such that unknown bounds are possibly true
+
+    def __eq__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        certain = numpy.logical_and(
+            numpy.logical_and(self.lower == self.upper,
+                              other.lower == other.upper),
+            self.lower == other.lower)
+        possible = numpy.logical_not(numpy.logical_or(
+            self.lower > other.upper, other.lower > self.upper))
+        return Interval(certain, possible)
+
+    def __ne__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return ~(self == other)
+
+    def __lt__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(numpy.less(self.upper, other.lower),
+                        numpy.logical_not(self.lower >= other.upper))
+
+    def __le__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(numpy.less_equal(self.upper, other.lower),
+                        numpy.logical_not(self.lower > other.upper))
+
+    def __gt__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return _lift(other) < self
+
+    def __ge__(self, other):
+        if _defers(other):
+            return NotImplemented
+        return _lift(other) <= self
+
+    # logic on boolean intervals
+
+    def __and__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(numpy.logical_and(self.lower, other.lower),
+                        numpy.logical_and(self.upper, other.upper))
+
+    __rand__ = __and__
+
+    def __or__(self, other):
+        if _defers(other):
+            return NotImplemented
+        other = _lift(other)
+        return Interval(numpy.logical_or(self.lower, other.lower),
+                        numpy.logical_or(self.upper, other.upper))
+
+    __ror__ = __or__
+
+    def __invert__(self):
+        return Interval(numpy.logical_not(self.upper),
+                        numpy.logical_not(self.lower))
+
+    # numpy ufuncs
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if (method != '__call__' or kwargs or ufunc not in _ufuncs or
+                _defers(*inputs)):
+            return NotImplemented
+        return _ufuncs[ufunc](*[_lift(i) for i in inputs])
+
+
+def _monotonic(function, a, increasing=True, minimum=None):
+    '''
+    Returns the Interval of a monotonic function of the Interval `a`, which
+    is increasing where `increasing` is True, and decreasing elsewhere. If
+    `minimum` is given, the function is only defined above it, so the bounds
+    are unknown (nan) where `a` extends below it.
+    '''
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        at_lower, at_upper = function(a.lower), function(a.upper)
+    lower = numpy.where(increasing, at_lower, at_upper)[()]
+    upper = numpy.where(increasing, at_upper, at_lower)[()]
+    if minimum is not None:
+        undefined = numpy.logical_not(a.lower >= minimum)
+        lower = numpy.where(undefined, numpy.nan, lower)[()]
+        upper = numpy.where(undefined, numpy.nan, upper)[()]
+    return Interval(lower, upper)
+
+
+def _where(condition, x, y):
+    condition, x, y = _lift(condition), _lift(x), _lift(y)
+    certain, possible = condition.lower, condition.upper
+    return Interval(
+        numpy.where(certain, x.lower, numpy.where(
+            possible, numpy.minimum(x.lower, y.lower), y.lower))[()],
+        numpy.where(certain, x.upper, numpy.where(
+            possible, numpy.maximum(x.upper, y.upper), y.upper))[()])
+
+
+def _select(condlist, choicelist, default=0):
+    # the first true condition selects its choice
+    result = default
+    for condition, choice in reversed(list(zip(condlist, choicelist))):
+        result = _where(condition, choice, result)
+    return _lift(result)
+
+
+def _weighted_average(num, denom, values):
+    # the average is between the smallest and largest values
+    value = _lift(num) / denom
+    values = [_lift(v) for v in values]
+    return Interval(numpy.fmax(value.lower,
+                               _minimum(*[v.lower for v in values])),
+                    numpy.fmin(value.upper,
+                               _maximum(*[v.upper for v in values])))
+
+
+_ufuncs = {
+    numpy.add: lambda a, b: a + b,
+    numpy.subtract: lambda a, b: a - b,
+    numpy.multiply: lambda a, b: a * b,
+    numpy.divide: lambda a, b: a / b,
+    numpy.true_divide: lambda a, b: a / b,
+    numpy.power: lambda a, b: a ** b,
+    numpy.negative: lambda a: -a,
+    numpy.absolute: abs,
+    numpy.sign: lambda a: _monotonic(numpy.sign, a),
+    numpy.tanh: lambda a: _monotonic(numpy.tanh, a),
+    numpy.sqrt: lambda a: _monotonic(numpy.sqrt, a, minimum=0.),
+    numpy.exp: lambda a: _monotonic(numpy.exp, a),
+    numpy.log: lambda a: _monotonic(numpy.log, a, minimum=0.),
+    numpy.minimum: lambda a, b: Interval(numpy.minimum(a.lower, b.lower),
+                                         numpy.minimum(a.upper, b.upper)),
+    numpy.maximum: lambda a, b: Interval(numpy.maximum(a.lower, b.lower),
+                                         numpy.maximum(a.upper, b.upper)),
+    numpy.equal: lambda a, b: a == b,
+    numpy.not_equal: lambda a, b: a != b,
+    numpy.less: lambda a, b: a < b,
+    numpy.less_equal: lambda a, b: a <= b,
+    numpy.greater: lambda a, b: a > b,
+    numpy.greater_equal: lambda a, b: a >= b,
+    numpy.bitwise_and: lambda a, b: a & b,
+    numpy.logical_and: lambda a, b: a & b,
+    numpy.bitwise_or: lambda a, b: a | b,
+    numpy.logical_or: lambda a, b: a | b,
+    numpy.invert: lambda a: ~a,
+    numpy.logical_not: lambda a: ~a,
+}
@@ -0,0 +1,210 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Lookup tables for lattice matching ternaries to many lattice constants.
+'''
+
+import numpy
+
+__all__ = ['LatticeTable']
+
+
+class LatticeTable(object):
+    '''
+    A dense table of the lattice parameter, `a(x, T)`, of a ternary over a
+    grid of compositions and temperatures, which finds lattice matched
+    compositions by interpolation, rather than by solving for them.
+
+    Lookups interpolate `a` bilinearly between the grid points, and invert
+    the interpolant in x. The error in x is estimated for each cell of the
+    grid from the largest second differences of `a` at the corners of the
+    cell. This is an estimate rather than a guarantee: it assumes that the
+    curvature of `a` is no larger within a cell than at its corners. Where
+    the estimate is larger than `xtol`, the composition is solved for
+    exactly (see `IIIVZincBlendeTernary.__call__`). The lattice parameters
+    of the built-in ternaries are at most quadratic in x and linear in T,
+    so their curvature is constant and the estimate holds.
+
+    Tables are usually created (and cached) with
+    `IIIVZincBlendeTernary.get_lattice_table`.
+
+    Parameters
+    ----------
+    alloy : IIIVZincBlendeTernary
+        the ternary
+    T_min, T_max : number, optional
+        the range of temperatures (K)
+    nx : int, optional
+        the number of compositions in the table
+    nT : int, optional
+        the number of temperatures in the table
+    xtol : number, optional
+        the estimated error above which compositions are solved for
+        exactly, rather than interpolated
+
+    Examples
+    --------
+    >>> table = GaInAs.get_lattice_table()
+    >>> x = table(a=numpy.random.normal(InP.a(), 1e-3, 1000000))
+    '''
+    def __init__(self, alloy, T_min=0., T_max=1000., nx=1001, nT=101,
+                 xtol=1e-6):
+        if nx < 3 or nT < 2:
+            raise ValueError('`nx` must be at least 3, and `nT` at least 2')
+        if not T_min < T_max:
+            raise ValueError('`T_min` must be less than `T_max`')
+        self.alloy = alloy
+        self.xtol = xtol
+        self.x = numpy.linspace(0., 1., nx)
+        self.T = numpy.linspace(T_min, T_max, nT)
+        self._dx = self.x[1] - self.x[0]
+        self._dT = self.T[1] - self.T[0]
+        a = numpy.empty((nT, nx))
+        a[...] = alloy(x=self.x).a(T=self.T[:, numpy.newaxis])
+        self.a = a
+        self.a.setflags(write=False)
+
+        steps = numpy.diff(a, axis=1)
+        if not (numpy.all(steps > 0.) or numpy.all(steps < 0.)):
+            raise ValueError('the lattice parameter of {} is not monotonic '
+                             'in x'.format(alloy.name))
+        # +1 if a increases with x, or -1 if it decreases
+        self._direction = numpy.sign(steps[0, 0])
+        # the first cell along x of each row that reaches each of nx evenly
+        # spaced fractions of the row's range of a, for locating cells
+        fractions = (a - a[:, :1]) / (a[:, -1:] - a[:, :1])
+        targets = numpy.linspace(0., 1., nx)
+        self._cell_index = numpy.array([
+            numpy.searchsorted(row, targets, side='right') - 1
+            for row in fractions]).clip(0, nx - 2).ravel()
+        self._error_estimates = self._get_error_estimates(a, steps)
+
+    def _get_error_estimates(self, a, steps):
+        '''
+        Returns the estimated error in x for each cell of the table.
+        '''
+        dx, dT = self._dx, self._dT
+        # largest second derivatives at the corners of each cell
+        a_xx = numpy.zeros_like(a)
+        a_xx[:, 1:-1] = abs(numpy.diff(a, 2, axis=1)) / dx ** 2
+        a_xx[:, 0], a_xx[:, -1] = a_xx[:, 1], a_xx[:, -2]
+        a_TT = numpy.zeros_like(a)
+        if a.shape[0] > 2:
+            a_TT[1:-1] = abs(numpy.diff(a, 2, axis=0)) / dT ** 2
+            a_TT[0], a_TT[-1] = a_TT[1], a_TT[-2]
+        a_xx = self._cell_maximum(a_xx)
+        a_TT = self._cell_maximum(a_TT)
+        # the error of bilinear interpolation, and the smallest slope in x
+        a_error = (dx ** 2 * a_xx + dT ** 2 * a_TT) / 8.
+        slope = numpy.minimum(abs(steps[:-1]), abs(steps[1:])) / dx
+        slope -= dx * a_xx
+        with numpy.errstate(divide='ignore'):
+            return numpy.where(slope > 0., a_error / slope, numpy.inf)
+
+    @staticmethod
+    def _cell_maximum(values):
+        '''
+        Returns the largest of `values` at the four corners of each cell.
+        '''
+        return numpy.maximum(numpy.maximum(values[:-1, :-1], values[:-1, 1:]),
+                             numpy.maximum(values[1:, :-1], values[1:, 1:]))
+
+    def _locate(self, a, T):
+        '''
+        Returns the temperature and composition indices of the cells
+        containing `a` at `T`, the broadcast `a` and `T`, and the
+        interpolated compositions.
+        '''
+        a, T = numpy.broadcast_arrays(numpy.asarray(a, dtype=float),
+                                      numpy.asarray(T, dtype=float))
+        T_min, T_max = self.T[0], self.T[-1]
+        out_of_range = ~((T_min <= T) & (T <= T_max))
+        if numpy.any(out_of_range):
+            raise ValueError('T of {:g} out of range [{:g}, {:g}]'.format(
+                T[out_of_range].flat[0], T_min, T_max))
+        shape = a.shape
+        a, T = a.ravel(), T.ravel()
+        table = self.a.ravel()
+        nx = len(self.x)
+        j = numpy.minimum(((T - T_min) / self._dT).astype(int),
+                          len(self.T) - 2)
+        w = (T - self.T[j]) / self._dT
+        start = j * nx
+
+        def row(i, k=Ellipsis):
+            # interpolate between the table rows at the indices i along x
+            lower = table.take(start[k] + i)
+            upper = table.take(start[k] + i + nx)
+            return lower + w[k] * (upper - lower)
+        first, last = self.a[:, 0], self.a[:, -1]
+        a_first = first[j] + w * (first[j + 1] - first[j])
+        a_last = last[j] + w * (last[j + 1] - last[j])
+        self.alloy._check_lattice_range(a, a_first, a_last)
+
+        # guess the cell along x from the fraction of the range of a, and
+        # then step towards the cell containing `a` (usually not at all)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            fraction = (a - a_first) / (a_last - a_first) * (nx - 1)
+        fraction = numpy.clip(numpy.nan_to_num(fraction), 0, nx - 1)
+        i = self._cell_index.take(start + fraction.astype(int))
+        direction = self._direction
+        a_lo, a_hi = row(i), row(i + 1)
+        k = numpy.flatnonzero((direction * a < direction * a_lo) |
+                              (direction * a > direction * a_hi))
+        while len(k):
+            i_k = i[k]
+            a_k = direction * a[k]
+            up = (a_k > direction * a_hi[k]) & (i_k < nx - 2)
+            down = (a_k < direction * a_lo[k]) & (i_k > 0)
+            i_k += up
+            i_k -= down
+            i[k] = i_k
+            a_lo[k], a_hi[k] = row(i_k, k), row(i_k + 1, k)
+            k = k[up | down]
+        x = self.x[i] + (a - a_lo) / (a_hi - a_lo) * self._dx
+        return (j.reshape(shape), i.reshape(shape), a.reshape(shape),
+                T.reshape(shape), x.reshape(shape))
+
+    def get_error_estimate(self, a, T=300.):
+        '''
+        Returns the estimated error of the interpolated compositions that
+        are lattice matched to `a` at the temperature `T`, before any are
+        solved for exactly.
+        '''
+        j, i, _, _, _ = self._locate(a, T)
+        return self._error_estimates[j, i][()]
+
+    def __call__(self, a, T=300.):
+        '''
+        Returns the composition, x, that is lattice matched to `a` at the
+        temperature `T`. `a` and `T` may be arrays, which are broadcast
+        against each other.
+
+        The composition is interpolated from the table, unless the estimated
+        error of the interpolation (see `get_error_estimate`) is larger than
+        `xtol`, in which case it is solved for exactly. `xtol` is a threshold
+        on the estimate, not a guaranteed bound on the error.
+        '''
+        j, i, a, T, x = self._locate(a, T)
+        x = numpy.clip(x, 0., 1.)
+        refine = self._error_estimates[j, i] > self.xtol
+        if numpy.any(refine):
+            x[refine] = self.alloy._lattice_match(a[refine], T[refine])
+        return x[()]
@@ -22,8 +22,44 @@ __all__ = ['Parameter', 'ValueParameter',
            'FunctionParameter', 'method_parameter']
 
 
+class ParameterMetadata(object):
+    '''
+    Immutable metadata shared by all parameters with the same name, units,
+    aliases and references. Use `get_metadata` rather than instantiating
+    directly, so that equal records are interned.
+    '''
+    __slots__ = ('name', 'units', 'description', 'aliases', 'references')
+
+    def __init__(self, name, units, aliases, references):
+        self.name = name
+        self.units = units
+        self.description = descriptions.get(name, '')
+        self.aliases = aliases
+        self.references = references
+
+# interned ParameterMetadata records, keyed by their contents
+_metadata_records = {}
+
+
+def get_metadata(name, units, aliases=None, references=None):
+    '''
+    Returns the interned ParameterMetadata record with the given contents,
+    creating it if necessary.
+    '''
+    aliases = tuple(aliases) if aliases is not None else ()
+    references = tuple(references) if references is not None else ()
+    key = (name, units, aliases, references)
+    try:
+        return _metadata_records[key]
+    except KeyError:
+        metadata = ParameterMetadata(name, units, aliases, references)
+        return _metadata_records.setdefault(key, metadata)
+
+
 class Parameter(object):
-    def __init__(self, name, units, aliases=[], references=[]):
+    __slots__ = ('_metadata',)
+
+    def __init__(self, name, units, aliases=None, references=None):
         '''
         Parameters
         ----------
@@ -31,27 +67,45 @@ class Parameter(object):
             name of the parameter
         units : string
             units
-        aliases : list of strings (default=[])
+        aliases : list of strings (default=None)
             list of alternate names
-        references : list of Reference objects (default=[])
+        references : list of Reference objects (default=None)
             literature references
         '''
-        self.name = name
-        self.description = descriptions.get(name, '')
-        self.units = units
-        self.aliases = aliases
-        self._references = references
+        self._metadata = get_metadata(name, units, aliases, references)
+
+    @property
+    def name(self):
+        return self._metadata.name
+
+    @property
+    def units(self):
+        return self._metadata.units
+
+    @property
+    def description(self):
+        return self._metadata.description
+
+    @property
+    def aliases(self):
+        return self._metadata.aliases
+
+    @property
+    def _references(self):
+        return self._metadata.references
     
     def __call__(self, *args, **kwargs):
         raise NotImplementedError()
 
     def get_references(self):
-        return self._references
+        return list(self._references)
 
 
 class ValueParameter(Parameter):
+    __slots__ = ('value',)
+
     def __init__(self, name, value, units,
-                 aliases=[], references=[]):
+                 aliases=None, references=None):
         '''
         Parameters
         ----------
@@ -61,9 +115,9 @@ class ValueParameter(Parameter):
             value of the parameter
         units : string
             units
-        aliases : list of strings (default=[])
+        aliases : list of strings (default=None)
             list of alternate names
-        references : list of Reference objects (default=[])
+        references : list of Reference objects (default=None)
             literature references
         '''
         super(ValueParameter, self).__init__(name=name,
@@ -77,8 +131,10 @@ class ValueParameter(Parameter):
 
 
 class FunctionParameter(Parameter):
+    __slots__ = ('function',)
+
     def __init__(self, name, function, units,
-                 aliases=[], references=[]):
+                 aliases=None, references=None):
         '''
         Parameters
         ----------
@@ -88,9 +144,9 @@ class FunctionParameter(Parameter):
             function that returns the value of the parameter
         units : string
             units
-        aliases : list of strings (default=[])
+        aliases : list of strings (default=None)
             list of alternate names
-        references : list of Reference objects (default=[])
+        references : list of Reference objects (default=None)
             literature references
         '''
         super(FunctionParameter, self).__init__(name=name,
@@ -104,8 +160,10 @@ class FunctionParameter(Parameter):
 
 
 class MethodParameter(Parameter):
+    __slots__ = ('alloy', 'method', 'dependencies')
+
     def __init__(self, name, method, dependencies, units,
-                 aliases=[], references=[]):
+                 aliases=None, references=None):
         '''
         Parameters
         ----------
@@ -118,9 +176,9 @@ class MethodParameter(Parameter):
             list of parameter names that this parameter depends on
         units : string
             units
-        aliases : list of strings (default=[])
+        aliases : list of strings (default=None)
             list of alternate names
-        references : list of Reference objects (default=[])
+        references : list of Reference objects (default=None)
             literature references
         '''
         super(MethodParameter, self).__init__(name=name,
@@ -129,15 +187,34 @@ class MethodParameter(Parameter):
                                               references=references)
         self.alloy = None
         self.method = method
-        self.dependencies = dependencies
+        self.dependencies = tuple(dependencies)
+    
+    def __get__(self, alloy, cls=None):
+        '''
+        Returns this MethodParameter bound to `alloy`, when it is accessed as
+        an attribute of an Alloy instance. A parameter with the same name or
+        alias that was added to the alloy takes precedence.
+        '''
+        if alloy is None:
+            return self
+        name = self.name
+        attributes = alloy.__dict__
+        if name in attributes['_parameters'] or name in attributes['_aliases']:
+            return alloy._get_added_parameter(name)
+        bound_parameters = attributes['_bound_parameters']
+        if name not in bound_parameters:
+            bound_parameters[name] = self.bind(alloy=alloy)
+        return bound_parameters[name]
     
     def bind(self, alloy):
         '''
         Shallow copies this MethodParameter, and binds it to an alloy.
         This is required before calling.
         '''
-        param = MethodParameter(self.name, self.method, self.dependencies,
-                                self.units, self.aliases, self._references)
+        param = MethodParameter.__new__(MethodParameter)
+        param._metadata = self._metadata
+        param.method = self.method
+        param.dependencies = self.dependencies
         param.alloy = alloy
         return param
     
@@ -145,54 +222,34 @@ class MethodParameter(Parameter):
         if self.alloy is None:
             raise TypeError('MethodParameter must be bound to an Alloy'
                             ' with `bind` before calling.')
-        return self.method(self.alloy, *args, **kwargs)
+        alloy = self.alloy
+        if alloy._memo is not None and not args:
+            return alloy._call_memoized(self, kwargs)
+        if alloy._cache is not None and not args:
+            return alloy._call_cached(self, kwargs)
+        return self.method(alloy, *args, **kwargs)
     
     def get_references(self):
+        '''
+        Returns a list of the references of this parameter and, if it is
+        bound to an alloy, of the parameters it depends on.
+        '''
         if self.alloy is None:
-            return self._references
-        else:
-            params = [self]
-            refs = []
-            refs.extend(self._references)
-            for d in self.dependencies:
-                p = self.alloy.get_parameter(d, default=None)
-                if p is not None and p not in params:
-                    params.append(p)
-                    for ref in p.get_references():
-                        if ref not in refs:
-                            refs.append(ref)
-            if hasattr(self.alloy, 'binaries'):
-                for alloy in getattr(self.alloy, 'binaries'):
-                    for d in self.dependencies:
-                        p = alloy.get_parameter(d, default=None)
-                        if p is not None and p not in params:
-                            params.append(p)
-                            for ref in p.get_references():
-                                if ref not in refs:
-                                    refs.append(ref)
-            if hasattr(self.alloy, 'ternaries'):
-                for alloy in getattr(self.alloy, 'ternaries'):
-                    for d in self.dependencies:
-                        p = alloy.get_parameter(d, default=None)
-                        params.append(p)
-                        if p is not None and p not in params:
-                            for ref in p.get_references():
-                                if ref not in refs:
-                                    refs.append(ref)
-            return refs
+            return list(self._references)
+        return list(self.alloy._get_references(self))
 
 
 def method_parameter(dependencies, units,
-                     aliases=[], references=[]):
+                     aliases=None, references=None):
     def decorator(method):
         '''
         Instead of returning a function like most decorators, this returns
-        a MethodParameter, which AlloyType moves to the `class_parameters`
-        dictionary. At instantiation, the `class_parameters` are added
-        to the `parameters` dictionary, unless a `Parameter` with the same
-        name has already been added.
+        a MethodParameter, which `AlloyType` registers in the
+        `_class_parameters` of the class. It is bound to each alloy when it
+        is first accessed, unless a `Parameter` with the same name has been
+        added to the alloy.
         '''
-        name = method.func_name
+        name = method.__name__
         return MethodParameter(name, method, dependencies, units,
                                aliases, references)
     return decorator
@@ -0,0 +1,378 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Bracketed root finding for scalar and vectorized functions.
+
+`brentq`, `itp` and `bisect` find a root of `func` between the brackets
+`a` and `b`, which may be arrays. In that case, `func` must accept and
+return arrays, and it is called once per iteration with the elements that
+haven't converged yet. Any other arrays that `func` depends on must be
+passed in `args`, which are broadcast against the brackets and indexed
+along with them. Each element follows the same sequence of steps it would
+on its own, and elements that have converged are left unchanged.
+
+The values of `func` at the brackets are only computed if they are not
+given (as `fa` and `fb`), and no point is evaluated more than once. With
+`full_output=True`, a `RootResults` object with the iteration and function
+evaluation counts is also returned.
+'''
+
+import numpy
+
+__all__ = ['RootResults', 'bisect', 'brentq', 'itp']
+
+
+class RootResults(object):
+    '''
+    Convergence information returned by the root finders when
+    `full_output=True`.
+
+    Attributes
+    ----------
+    root : number or array
+        the roots that were found
+    iterations : int or array of ints
+        the number of iterations taken by each element
+    evaluations : int
+        the number of calls to `func` (each call evaluates every element
+        that hasn't converged)
+    converged : bool or array of bools
+        whether each element converged
+    method : string
+        the name of the method
+    '''
+    __slots__ = ('root', 'iterations', 'evaluations', 'converged', 'method')
+
+    def __init__(self, root, iterations, evaluations, converged, method):
+        self.root = root
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.converged = converged
+        self.method = method
+
+    def __repr__(self):
+        return ('RootResults(method={!r}, evaluations={}, iterations={}, '
+                'converged={})'.format(self.method, self.evaluations,
+                                       self.iterations, self.converged))
+
+
+class _CountedFunction(object):
+    '''
+    Wraps `func`, and counts the calls to it.
+    '''
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, x, *args):
+        self.calls += 1
+        return self.func(x, *args)
+
+
+def _initialize(func, a, b, fa, fb, args):
+    '''
+    Evaluates the brackets if needed, broadcasts everything to a common
+    shape, and checks that the brackets straddle a root.
+    '''
+    if fa is None:
+        fa = func(a, *args)
+    if fb is None:
+        fb = func(b, *args)
+    arrays = numpy.broadcast_arrays(a, b, fa, fb, *args)
+    a, b, fa, fb = [numpy.array(v, dtype=float) for v in arrays[:4]]
+    if numpy.any((numpy.sign(fa) == numpy.sign(fb)) & (fa != 0.)):
+        raise ValueError('func(a) and func(b) must have opposite sign')
+    return a, b, fa, fb, tuple(arrays[4:])
+
+
+def _evaluate(func, x, args, active):
+    '''
+    Returns the values of `func` at the `active` elements of `x`, and nan
+    elsewhere, without evaluating the other elements.
+    '''
+    if active.all():
+        return numpy.array(numpy.broadcast_to(func(x, *args), x.shape),
+                           dtype=float)
+    fx = numpy.full(x.shape, numpy.nan)
+    if active.any():
+        fx[active] = func(x[active], *[arg[active] for arg in args])
+    return fx
+
+
+def _finish(root, iterations, done, func, method, maxiter, full_output):
+    '''
+    Returns the root (and the RootResults, if `full_output`), or raises a
+    RuntimeError if any element failed to converge.
+    '''
+    if not full_output and not done.all():
+        raise RuntimeError('Failed to converge after %d iterations.'
+                           % maxiter)
+    root = root[()]
+    if not full_output:
+        return root
+    return root, RootResults(root, iterations[()], func.calls, done[()],
+                             method)
+
+
+def bisect(func, a, b, xtol=1e-12, maxiter=100, fa=None, fb=None, args=(),
+           full_output=False):
+    """
+    Finds the root of `func` using the bisection method.
+
+    Requirements
+    ------------
+    - func must be continuous function that accepts a single number input
+      and returns a single number (or arrays, if `a` or `b` are arrays)
+    - `func(a)` and `func(b)` must have opposite sign
+
+    Parameters
+    ----------
+    func : function
+        the function that we want to find the root of
+    a : number or array
+        one of the bounds on the input
+    b : number or array
+        the other bound on the input
+    xtol : number, optional
+        the solution tolerance of the input value. The algorithm is
+        considered converged if `abs(b-a)/2. < xtol`
+    maxiter : number, optional
+        the maximum number of iterations allowed for convergence
+    fa : number or array, optional
+        the value of `func(a)`, if it is already known
+    fb : number or array, optional
+        the value of `func(b)`, if it is already known
+    args : tuple, optional
+        extra arguments to `func`, which are broadcast against `a` and `b`
+        so that they can be indexed along with them
+    full_output : bool, optional
+        if True, return a `RootResults` object as well as the root
+    """
+    func = _CountedFunction(func)
+    a, b, fa, fb, args = _initialize(func, a, b, fa, fb, args)
+    root = numpy.where(fa == 0., a, b)
+    done = (fa == 0.) | (fb == 0.)
+    iterations = numpy.zeros(a.shape, dtype=int)
+    for i in range(maxiter):
+        if done.all():
+            break
+        c = (a + b) / 2.
+        fc = _evaluate(func, c, args, ~done)
+        iterations += ~done
+        converged = ~done & ((fc == 0.) | (abs(b - a) / 2. < xtol))
+        root = numpy.where(converged, c, root)
+        done |= converged
+        same_sign = (numpy.sign(fc) == numpy.sign(fa))
+        a = numpy.where(same_sign, c, a)
+        fa = numpy.where(same_sign, fc, fa)
+        b = numpy.where(same_sign, b, c)
+    return _finish(root, iterations, done, func, 'bisect', maxiter,
+                   full_output)
+
+
+def brentq(func, a, b, xtol=1e-12, rtol=4*numpy.finfo(float).eps,
+           maxiter=100, fa=None, fb=None, args=(), full_output=False):
+    """
+    Finds the root of `func` using Brent's method, which combines inverse
+    quadratic interpolation and the secant method with bisection. It
+    converges superlinearly for smooth functions, and never takes more
+    steps than bisection would to reach the same tolerance (to within a
+    small factor).
+
+    Parameters
+    ----------
+    func : function
+        the function that we want to find the root of
+    a : number or array
+        one of the bounds on the input
+    b : number or array
+        the other bound on the input
+    xtol : number, optional
+        the absolute solution tolerance of the input value
+    rtol : number, optional
+        the relative solution tolerance of the input value
+    maxiter : number, optional
+        the maximum number of iterations allowed for convergence
+    fa : number or array, optional
+        the value of `func(a)`, if it is already known
+    fb : number or array, optional
+        the value of `func(b)`, if it is already known
+    args : tuple, optional
+        extra arguments to `func`, which are broadcast against `a` and `b`
+        so that they can be indexed along with them
+    full_output : bool, optional
+        if True, return a `RootResults` object as well as the root
+    """
+    func = _CountedFunction(func)
+    xpre, xcur, fpre, fcur, args = _initialize(func, a, b, fa, fb, args)
+    root = numpy.where(fpre == 0., xpre, xcur)
+    done = (fpre == 0.) | (fcur == 0.)
+    iterations = numpy.zeros(xpre.shape, dtype=int)
+    xblk = numpy.zeros_like(xpre)
+    fblk = numpy.zeros_like(xpre)
+    spre = numpy.zeros_like(xpre)
+    scur = numpy.zeros_like(xpre)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for i in range(maxiter):
+            # keep the root bracketed between xcur and xblk
+            new_bracket = (fpre != 0.) & (fcur != 0.) & \
+                (numpy.signbit(fpre) != numpy.signbit(fcur))
+            xblk = numpy.where(new_bracket, xpre, xblk)
+            fblk = numpy.where(new_bracket, fpre, fblk)
+            spre = numpy.where(new_bracket, xcur - xpre, spre)
+            scur = numpy.where(new_bracket, xcur - xpre, scur)
+            # make xcur the best estimate so far
+            swap = abs(fblk) < abs(fcur)
+            xpre = numpy.where(swap, xcur, xpre)
+            fpre = numpy.where(swap, fcur, fpre)
+            xcur, xblk = (numpy.where(swap, xblk, xcur),
+                          numpy.where(swap, xpre, xblk))
+            fcur, fblk = (numpy.where(swap, fblk, fcur),
+                          numpy.where(swap, fpre, fblk))
+
+            delta = (xtol + rtol * abs(xcur)) / 2.
+            sbis = (xblk - xcur) / 2.
+            converged = ~done & ((fcur == 0.) | (abs(sbis) < delta))
+            root = numpy.where(converged, xcur, root)
+            done |= converged
+            if done.all():
+                break
+
+            # try interpolation, if the last step was large enough and
+            # the estimate improved
+            interpolate = (abs(spre) > delta) & (abs(fcur) < abs(fpre))
+            secant = -fcur * (xcur - xpre) / (fcur - fpre)
+            dpre = (fpre - fcur) / (xpre - xcur)
+            dblk = (fblk - fcur) / (xblk - xcur)
+            quadratic = -fcur * (fblk * dblk - fpre * dpre) / \
+                (dblk * dpre * (fblk - fpre))
+            stry = numpy.where(xpre == xblk, secant, quadratic)
+            accept = interpolate & \
+                (2. * abs(stry) < numpy.minimum(abs(spre),
+                                                3. * abs(sbis) - delta))
+            spre = numpy.where(accept, scur, sbis)
+            scur = numpy.where(accept, stry, sbis)
+
+            step = numpy.where(abs(scur) > delta, scur,
+                               numpy.where(sbis > 0., delta, -delta))
+            active = ~done
+            xpre = numpy.where(active, xcur, xpre)
+            fpre = numpy.where(active, fcur, fpre)
+            xcur = numpy.where(active, xcur + step, xcur)
+            fcur = numpy.where(active, _evaluate(func, xcur, args, active),
+                               fcur)
+            iterations += active
+    return _finish(root, iterations, done, func, 'brentq', maxiter,
+                   full_output)
+
+
+def itp(func, a, b, xtol=1e-12, k1=None, k2=2., n0=1, maxiter=100,
+        fa=None, fb=None, args=(), full_output=False):
+    """
+    Finds the root of `func` using the ITP (Interpolate, Truncate and
+    Project) method of Oliveira and Takahashi (2020), which converges
+    superlinearly for smooth functions, and takes at most `n0` more
+    iterations than bisection would.
+
+    Parameters
+    ----------
+    func : function
+        the function that we want to find the root of
+    a : number or array
+        one of the bounds on the input
+    b : number or array
+        the other bound on the input
+    xtol : number, optional
+        the solution tolerance of the input value. The algorithm is
+        considered converged if `abs(b-a)/2. <= xtol`
+    k1 : number, optional
+        the truncation scale, which defaults to `0.2 / abs(b - a)`
+    k2 : number, optional
+        the truncation exponent, between 1 and 1 + (1 + sqrt(5)) / 2
+    n0 : int, optional
+        the number of extra iterations allowed over bisection
+    maxiter : number, optional
+        the maximum number of iterations allowed for convergence
+    fa : number or array, optional
+        the value of `func(a)`, if it is already known
+    fb : number or array, optional
+        the value of `func(b)`, if it is already known
+    args : tuple, optional
+        extra arguments to `func`, which are broadcast against `a` and `b`
+        so that they can be indexed along with them
+    full_output : bool, optional
+        if True, return a `RootResults` object as well as the root
+    """
+    func = _CountedFunction(func)
+    a, b, fa, fb, args = _initialize(func, a, b, fa, fb, args)
+    # order the brackets, and flip the sign of func if needed, so that
+    # a < b and fa <= 0 <= fb
+    a, b, fa, fb = (numpy.minimum(a, b), numpy.maximum(a, b),
+                    numpy.where(a <= b, fa, fb), numpy.where(a <= b, fb, fa))
+    flip = numpy.where((fa > 0.) | (fb < 0.), -1., 1.)
+    fa = fa * flip
+    fb = fb * flip
+    root = numpy.where(fa == 0., a, b)
+    done = (fa == 0.) | (fb == 0.)
+    iterations = numpy.zeros(a.shape, dtype=int)
+    width = b - a
+    if k1 is None:
+        with numpy.errstate(divide='ignore'):
+            k1 = numpy.where(width > 0., 0.2 / width, 0.)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        n_half = numpy.ceil(numpy.log2(numpy.maximum(width / (2. * xtol),
+                                                     1.)))
+    n_max = n_half + n0
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for j in range(maxiter):
+            converged = ~done & (b - a <= 2. * xtol)
+            root = numpy.where(converged, (a + b) / 2., root)
+            done |= converged
+            if done.all():
+                break
+            # interpolate (regula falsi)
+            x_half = (a + b) / 2.
+            x_f = (fb * a - fa * b) / (fb - fa)
+            x_f = numpy.where(numpy.isfinite(x_f), x_f, x_half)
+            # truncate
+            sigma = numpy.sign(x_half - x_f)
+            # step at least xtol past the interpolated point, so that
+            # the far bracket also moves once that point is accurate
+            delta = numpy.maximum(k1 * (b - a) ** k2, xtol)
+            x_t = numpy.where(delta <= abs(x_half - x_f),
+                              x_f + sigma * delta, x_half)
+            # project onto the minmax interval
+            r = xtol * 2. ** (n_max - j) - (b - a) / 2.
+            x_itp = numpy.where(abs(x_t - x_half) <= r, x_t,
+                                x_half - sigma * r)
+            active = ~done
+            f_itp = _evaluate(func, x_itp, args, active) * flip
+            iterations += active
+            upper = active & (f_itp > 0.)
+            lower = active & (f_itp < 0.)
+            exact = active & (f_itp == 0.)
+            b = numpy.where(upper, x_itp, b)
+            fb = numpy.where(upper, f_itp, fb)
+            a = numpy.where(lower, x_itp, a)
+            fa = numpy.where(lower, f_itp, fa)
+            root = numpy.where(exact, x_itp, root)
+            done |= exact
+    return _finish(root, iterations, done, func, 'itp', maxiter,
+                   full_output)
@@ -0,0 +1,330 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+'''
+Searching the composition space of many alloys for regions that satisfy a
+set of constraints on their parameters.
+
+Examples
+--------
+>>> from openbandparams.search import Constraint, lattice_matched, search
+>>> results = search([Constraint('Eg', 0.45, 0.55, T=77.),
+...                   lattice_matched(GaSb, tolerance=1e-3),
+...                   Constraint('CBO', minimum=-0.2)])
+>>> [result['alloy'].name for result in results]
+['InPSb', 'InPAsSb', 'AlInPSb', 'GaInPSb', 'AlInAsSb', 'GaInAsSb']
+'''
+
+import numpy
+
+from .iii_v_zinc_blende_ternary import IIIVZincBlendeTernary
+
+__all__ = ['Constraint', 'lattice_matched', 'search']
+
+
+class Constraint(object):
+    '''
+    A constraint on the value of a parameter, `minimum <= value <= maximum`.
+
+    Parameters
+    ----------
+    name : string
+        the name of the parameter, e.g. 'Eg'
+    minimum : number (default=None)
+        the smallest allowed value, or None for no lower limit
+    maximum : number (default=None)
+        the largest allowed value, or None for no upper limit
+    substrate : alloy or number (default=None)
+        if given, the parameter is evaluated for the alloy strained to this
+        substrate (see `strained_001`)
+    **kwargs :
+        keyword arguments used to evaluate the parameter, e.g. `T=77.`
+    '''
+    def __init__(self, name, minimum=None, maximum=None, substrate=None,
+                 **kwargs):
+        self.name = name
+        self.minimum = -numpy.inf if minimum is None else minimum
+        self.maximum = numpy.inf if maximum is None else maximum
+        self.substrate = substrate
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return 'Constraint({!r}, {!r}, {!r})'.format(self.name, self.minimum,
+                                                     self.maximum)
+
+    def _get_alloy(self, alloy):
+        if self.substrate is not None:
+            return alloy.strained_001(self.substrate)
+        return alloy
+
+    def is_defined(self, alloy):
+        '''
+        Returns True if the parameter is defined for `alloy`, or False,
+        otherwise.
+        '''
+        return self._get_alloy(alloy).has_parameter(self.name)
+
+    def evaluate(self, alloy):
+        '''
+        Returns the value of the parameter for `alloy`.
+        '''
+        alloy = self._get_alloy(alloy)
+        return getattr(alloy, self.name)(**self.kwargs)
+
+
+def lattice_matched(substrate, tolerance=1e-3, T=300.):
+    '''
+    Returns a `Constraint` that the lattice parameter is within the relative
+    `tolerance` of the lattice parameter of `substrate` at the temperature
+    `T`.
+    '''
+    a = substrate.a(T=T)
+    return Constraint('a', a * (1. - tolerance), a * (1. + tolerance), T=T)
+
+
+class _Domain(object):
+    '''
+    The composition space of an alloy: [0, 1] for ternaries, the square
+    [0, 1]^2 for type 3 quaternaries, and the triangle x + y <= 1 for type 1
+    and 2 quaternaries.
+    '''
+    def __init__(self, alloy):
+        self.alloy = alloy
+        if isinstance(alloy, IIIVZincBlendeTernary):
+            self.variables = ['x']
+            self.triangle = False
+        else:
+            self.variables = ['x', 'y']
+            self.triangle = alloy._type in [1, 2]
+
+    def instance(self, points):
+        '''
+        Returns an alloy instance with the compositions `points`, an array
+        of shape (n, number of variables).
+        '''
+        kwargs = dict(zip(self.variables, points.T))
+        return self.alloy(**kwargs)
+
+    def box(self, lower, upper):
+        '''
+        Returns an alloy instance whose composition variables are `Dual`
+        numbers, with `Interval` values between `lower` and `upper`, arrays
+        of shape (n, number of variables), so that its parameters give
+        bounds on their values and derivatives over each box.
+        '''
+        from .dual import Dual
+        from .interval import Interval
+        columns = dict(zip(self.variables, zip(lower.T, upper.T)))
+        alloy, _ = self.alloy._with_composition_variables(
+            lambda name, value: Dual(Interval(*columns[name]), {name: 1.}))
+        return alloy
+
+    def contains(self, lower):
+        '''
+        Returns a mask of the boxes that overlap the domain.
+        '''
+        if self.triangle:
+            return lower.sum(axis=1) < 1.
+        return numpy.ones(len(lower), dtype=bool)
+
+    def anchor(self, lower, upper):
+        '''
+        Returns a point in each box that is in the domain: the center of the
+        box, or, if it's outside of the triangle, the nearest point on the
+        triangle's diagonal.
+        '''
+        center = (lower + upper) / 2.
+        if self.triangle:
+            excess = numpy.maximum(center.sum(axis=1) - 1., 0.) / 2.
+            center = center - excess[:, numpy.newaxis]
+        return center
+
+
+def _bound(constraint, domain, lower, upper):
+    '''
+    Returns the lower and upper bounds of the constrained parameter over
+    each box of compositions between `lower` and `upper`, which are `nan`
+    where they are unknown.
+
+    The bounds are the intersection of the interval given by evaluating the
+    parameter over the box, and the interval given by the mean value
+    theorem from its value at the anchor of the box and the bounds on its
+    derivatives over the box, which is usually much narrower for small
+    boxes.
+    '''
+    from .interval import Interval
+    value = constraint.evaluate(domain.box(lower, upper))
+    if not hasattr(value, 'derivative'):
+        # the parameter doesn't depend on the composition
+        value = numpy.broadcast_to(value, lower.shape[:1])
+        return value, value
+    # the compositions are rounded when they're used, so bound the
+    # parameter over the rounded compositions
+    anchor = domain.anchor(lower, upper)
+    estimate = constraint.evaluate(domain.instance(anchor))
+    rounded_anchor = numpy.round(anchor, 6)
+    for i, variable in enumerate(domain.variables):
+        offset = Interval(numpy.round(lower[:, i], 6) - rounded_anchor[:, i],
+                          numpy.round(upper[:, i], 6) - rounded_anchor[:, i])
+        estimate = estimate + value.derivative(variable) * offset
+    value = value.value
+    # unknown (nan) bounds are ignored, unless both are unknown
+    return (numpy.fmax(getattr(value, 'lower', value), estimate.lower),
+            numpy.fmin(getattr(value, 'upper', value), estimate.upper))
+
+
+def _search_alloy(alloy, constraints, resolution, divisions):
+    '''
+    Returns the boxes of compositions that may satisfy the `constraints`,
+    and whether each box is certain to satisfy them everywhere.
+    '''
+    domain = _Domain(alloy)
+    d = len(domain.variables)
+
+    # the initial boxes
+    edges = numpy.linspace(0., 1., divisions + 1)
+    corners = numpy.stack([g.ravel() for g in numpy.meshgrid(
+        *([edges[:-1]] * d))], axis=-1)
+    width = 1. / divisions
+    lower = corners
+    upper = corners + width
+    keep = domain.contains(lower)
+    lower, upper = lower[keep], upper[keep]
+
+    found_lower, found_upper, found_certain = [], [], []
+    while len(lower):
+        leaf = width / 2. <= resolution
+        satisfied = numpy.ones(len(lower), dtype=bool)
+        possible = numpy.ones(len(lower), dtype=bool)
+        for constraint in constraints:
+            value_lower, value_upper = _bound(constraint, domain, lower,
+                                              upper)
+            with numpy.errstate(invalid='ignore'):
+                satisfied &= ((value_lower >= constraint.minimum) &
+                              (value_upper <= constraint.maximum))
+                # unknown (nan) bounds may satisfy the constraint
+                possible &= ~((value_upper < constraint.minimum) |
+                              (value_lower > constraint.maximum))
+        done = satisfied | (leaf & possible)
+        found_lower.append(lower[done])
+        found_upper.append(upper[done])
+        found_certain.append(satisfied[done])
+        if leaf:
+            break
+        # split the undetermined boxes in half along every variable
+        split = possible & ~satisfied
+        lower, upper = lower[split], upper[split]
+        width /= 2.
+        offsets = numpy.stack([g.ravel() for g in numpy.meshgrid(
+            *([[0., width]] * d))], axis=-1)
+        lower = (lower[:, numpy.newaxis, :] + offsets).reshape(-1, d)
+        upper = lower + width
+        keep = domain.contains(lower)
+        lower, upper = lower[keep], upper[keep]
+
+    lower = numpy.concatenate(found_lower)
+    upper = numpy.concatenate(found_upper)
+    certain = numpy.concatenate(found_certain)
+    order = numpy.lexsort(lower.T[::-1])
+    return domain, lower[order], upper[order], certain[order]
+
+
+def search(constraints, alloys=None, resolution=1e-3, divisions=16):
+    '''
+    Returns the regions of composition space of each alloy in which all of
+    the `constraints` are satisfied.
+
+    The composition space of each alloy is divided into boxes, and the
+    range of each constrained parameter over each box is bounded by
+    evaluating it with interval arithmetic (see `openbandparams.interval`),
+    which gives bounds on its value and its derivatives over the box. Boxes
+    that are proven to violate a constraint are discarded, boxes that are
+    proven to satisfy every constraint everywhere are kept, and the
+    remaining boxes are split in half along each composition, until they
+    are no larger than `resolution`. Those boxes are then kept, as they
+    may satisfy the constraints.
+
+    The bounds are rigorous (apart from rounding errors), so every
+    composition that satisfies the constraints is in one of the boxes, but
+    they can be loose, e.g. at the corners of quaternaries, so some of the
+    boxes that aren't proven to satisfy the constraints may not contain any
+    compositions that do.
+
+    Parameters
+    ----------
+    constraints : list of Constraints
+        the constraints to satisfy (see `Constraint` and `lattice_matched`)
+    alloys : list of alloys (default=None)
+        the ternaries and quaternaries to search. By default, all of the
+        III-V zinc blende ternaries and quaternaries are searched. Alloys
+        that are missing a constrained parameter, or a parameter that it
+        depends on, are skipped.
+    resolution : number (default=1e-3)
+        the largest half-width of the boxes along each composition
+    divisions : int (default=16)
+        the number of boxes along each composition to start with
+
+    Raises
+    ------
+    ValueError
+        if a constrained parameter isn't defined for any of the alloys, e.g.
+        because its name is misspelled
+
+    Returns
+    -------
+    results : list of dicts
+        for each alloy with any compositions that may satisfy the
+        constraints, a dict with the 'alloy', the lower and upper bounds of
+        each box of compositions, 'x' and 'y' (for quaternaries), as arrays
+        of shape (n, 2), and 'certain', a boolean array that is True for the
+        boxes that are proven to satisfy the constraints everywhere (within
+        the composition space of the alloy), and False for the boxes that
+        may only satisfy them somewhere, or nowhere.
+    '''
+    if alloys is None:
+        # the lists of alloys, which the package imports when first used
+        from . import (iii_v_zinc_blende_ternaries,
+                       iii_v_zinc_blende_quaternaries)
+        alloys = iii_v_zinc_blende_ternaries + iii_v_zinc_blende_quaternaries
+    from .alloy import MissingParameterError
+    defined = [[constraint.is_defined(alloy) for constraint in constraints]
+               for alloy in alloys]
+    for constraint, is_defined in zip(constraints, zip(*defined)):
+        if not any(is_defined):
+            raise ValueError('"{}" is not a parameter of any of the alloys.'
+                             ''.format(constraint.name))
+    results = []
+    for alloy, is_defined in zip(alloys, defined):
+        if not all(is_defined):
+            continue
+        try:
+            domain, lower, upper, certain = _search_alloy(
+                alloy, constraints, resolution, divisions)
+        except MissingParameterError:
+            # a parameter that the constrained parameters depend on is
+            # missing
+            continue
+        if len(lower) == 0:
+            continue
+        result = {'alloy': alloy, 'certain': certain}
+        for i, variable in enumerate(domain.variables):
+            result[variable] = numpy.stack([lower[:, i], upper[:, i]],
+                                           axis=-1)
+        results.append(result)
+    return results
@@ -0,0 +1,136 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaAs, AlN, GaInAs, AlGaAs, AlGaInAs, GaInAsSb,
+                            ValueParameter)
+from openbandparams.atlas import export_atlas, get_atlas_hash, main
+from openbandparams.version import __version__
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestExportAtlas(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file = os.path.join(self.directory, 'atlas.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load(self):
+        with numpy.load(self.file) as atlas:
+            return dict((key, atlas[key]) for key in atlas.files)
+
+    def test_values(self):
+        alloys = [GaAs, GaInAs, AlGaInAs, GaInAsSb]
+        export_atlas(self.file, alloys=alloys, nx=6, T_min=77., T_max=377.,
+                     nT=4)
+        atlas = self.load()
+        x = numpy.linspace(0., 1., 6)
+        T = numpy.linspace(77., 377., 4)
+        self.assertTrue(numpy.allclose(atlas['x'], x))
+        self.assertTrue(numpy.allclose(atlas['y'], x))
+        self.assertTrue(numpy.array_equal(atlas['T'], T))
+        self.assertEqual(list(atlas['alloys']),
+                         ['GaAs', 'GaInAs', 'AlGaInAs', 'GaInAsSb'])
+        self.assertEqual(atlas['version'][()], __version__)
+        self.assertEqual(atlas['database_hash'][()], get_atlas_hash(alloys))
+        names = list(atlas['parameters'])
+        self.assertEqual(atlas['units'][names.index('Eg')], 'eV')
+        self.assertEqual(atlas['units'][names.index('a')], 'angstrom')
+
+        for name in ['Eg', 'CBO', 'a', 'meff_e_Gamma', 'c11']:
+            self.assertEqual(atlas['GaAs/' + name].shape, (4,))
+            self.assertEqual(atlas['GaInAs/' + name].shape, (6, 4))
+            self.assertEqual(atlas['GaInAsSb/' + name].shape, (6, 6, 4))
+            self.assertTrue(numpy.allclose(atlas['GaAs/' + name],
+                                           getattr(GaAs, name)(T=T),
+                                           rtol=1e-12))
+            self.assertTrue(numpy.allclose(
+                atlas['GaInAs/' + name][2],
+                getattr(GaInAs(x=0.4), name)(T=T), rtol=1e-12))
+            self.assertTrue(numpy.allclose(
+                atlas['GaInAsSb/' + name][1, 4],
+                getattr(GaInAsSb(x=0.2, y=0.8), name)(T=T), rtol=1e-12))
+            self.assertTrue(numpy.allclose(
+                atlas['AlGaInAs/' + name][3, 2],
+                getattr(AlGaInAs(x=0.6, y=0.4), name)(T=T), rtol=1e-12))
+            # outside of the composition space
+            self.assertTrue(numpy.all(numpy.isnan(
+                atlas['AlGaInAs/' + name][3, 3])))
+        self.assertFalse(numpy.any(numpy.isnan(atlas['GaInAsSb/Eg'])))
+
+    def test_missing_parameters(self):
+        export_atlas(self.file, alloys=[AlN, AlGaAs], nx=3, nT=2)
+        atlas = self.load()
+        self.assertIn('AlN/Eg', atlas)
+        # AlN is missing the thermal expansion needed for `a`
+        self.assertNotIn('AlN/a', atlas)
+        self.assertIn('AlGaAs/Eg_X_bowing', atlas)
+        numpy.testing.assert_array_equal(atlas['AlGaAs/Eg_X_bowing'], 0.055)
+
+    def test_bowing_functions(self):
+        # bowing parameters that are functions of the composition
+        export_atlas(self.file, alloys=[AlGaAs], nx=3, nT=2)
+        atlas = self.load()
+        self.assertEqual(atlas['AlGaAs/Eg_Gamma_bowing'].shape, (3, 2))
+        for i, x in enumerate(atlas['x']):
+            numpy.testing.assert_array_equal(
+                atlas['AlGaAs/Eg_Gamma_bowing'][i],
+                AlGaAs(x=x).Eg_Gamma_bowing(x=x))
+
+    def test_chunk_size(self):
+        export_atlas(self.file, alloys=[GaInAsSb], nx=11, nT=3)
+        expected = self.load()
+        export_atlas(self.file, alloys=[GaInAsSb], nx=11, nT=3, chunk_size=1)
+        atlas = self.load()
+        self.assertEqual(sorted(atlas), sorted(expected))
+        for key in expected:
+            self.assertTrue(numpy.array_equal(atlas[key], expected[key]))
+
+    def test_database_hash(self):
+        alloy = GaInAs(x=0.3)
+        before = get_atlas_hash([alloy])
+        self.assertEqual(get_atlas_hash([GaInAs(x=0.3)]), before)
+        alloy.set_parameter(ValueParameter('Eg_Gamma_bowing', 0.5, 'eV'))
+        self.assertNotEqual(get_atlas_hash([alloy]), before)
+        self.assertNotEqual(get_atlas_hash([GaAs, alloy]),
+                            get_atlas_hash([alloy]))
+
+    def test_main(self):
+        main([self.file, '--alloys', 'GaAs', 'GaInAs', '--nx', '3',
+              '--T-min', '300', '--T-max', '300', '--nT', '1'])
+        atlas = self.load()
+        self.assertEqual(list(atlas['alloys']), ['GaAs', 'GaInAs'])
+        self.assertEqual(atlas['GaInAs/Eg'].shape, (3, 1))
+        self.assertEqual(atlas['GaInAs/Eg'][1, 0], GaInAs(x=0.5).Eg())
+
+if __name__ == '__main__':
+    unittest.main()
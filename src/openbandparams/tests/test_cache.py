@@ -0,0 +1,121 @@
+#
+#   Copyright (c) 2013-2014, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaInAs, AlInAs, GaInAsSb, InP,
+                            IIIVZincBlendeTernary, ValueParameter)
+from openbandparams.cache import LRUCache
+import numpy
+import unittest
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'b' is now least recently used
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+
+    def test_validate(self):
+        cache = LRUCache()
+        cache.validate((0,))
+        cache.set('a', 1)
+        cache.validate((0,))
+        self.assertIn('a', cache)
+        cache.validate((1,))
+        self.assertNotIn('a', cache)
+
+
+class TestAlloyCache(unittest.TestCase):
+
+    def test_cached_values(self):
+        for alloy in [GaInAs(x=0.3), GaInAsSb(x=0.2, y=0.3),
+                      GaInAs(x=0.3).strained_001(InP)]:
+            expected = [alloy.CBO(T=T) for T in (77, 300)]
+            alloy.enable_cache()
+            self.assertEqual([alloy.CBO(T=T) for T in (77, 300)], expected)
+            self.assertEqual([alloy.CBO(T=T) for T in (77, 300)], expected)
+            self.assertIn(('CBO', (('T', 77),)), alloy._cache)
+            alloy.disable_cache()
+
+    def test_maxsize(self):
+        alloy = GaInAs(x=0.3)
+        alloy.enable_cache(maxsize=4)
+        alloy.CBO()
+        self.assertEqual(len(alloy._cache), 4)
+
+    def test_set_parameter_invalidates(self):
+        alloy = GaInAs(x=0.3)
+        alloy.enable_cache()
+        Eg = alloy.Eg()
+        alloy.set_parameter(ValueParameter('Eg_Gamma_bowing', 0., 'eV'))
+        self.assertNotEqual(alloy.Eg(), Eg)
+        self.assertEqual(alloy.Eg(), GaInAs(x=0.3).Eg() + 0.477 * 0.3 * 0.7)
+
+    def test_parent_set_parameter_invalidates(self):
+        GaInAs_InP = GaInAs(a=InP.a())
+        AlInAs_InP = AlInAs(a=InP.a())
+        AlGaInAs_InP = IIIVZincBlendeTernary(
+            name='AlGaInAs/InP',
+            elements=('Al', 'Ga', 'InAs'),
+            binaries=(AlInAs_InP, GaInAs_InP),
+            parameters=[])
+        alloy = AlGaInAs_InP(Al=0.5)
+        alloy.enable_cache()
+        Eg = alloy.Eg()
+        GaInAs_InP.set_parameter(ValueParameter('Eg_Gamma', 1., 'eV'))
+        self.assertNotEqual(alloy.Eg(), Eg)
+        self.assertEqual(alloy.Eg(), AlGaInAs_InP(Al=0.5).Eg())
+
+    def test_arrays(self):
+        alloy = GaInAs(x=numpy.linspace(0, 1, 5))
+        alloy.enable_cache()
+        Eg = alloy.Eg()
+        self.assertIs(alloy.Eg(), Eg)
+        self.assertFalse(Eg.flags.writeable)
+        # array kwargs aren't cached
+        Ts = numpy.linspace(77., 300., 5)
+        self.assertIsNot(alloy.Eg_Gamma(T=Ts), alloy.Eg_Gamma(T=Ts))
+        self.assertIs(alloy.Eg_Gamma(T=numpy.array(77.)),
+                      alloy.Eg_Gamma(T=77.))
+
+    def test_default_kwargs(self):
+        alloy = GaInAs(x=0.3)
+        alloy.enable_cache()
+        Eg = alloy.Eg()
+        size = len(alloy._cache)
+        self.assertEqual(alloy.Eg(T=300.), Eg)
+        self.assertEqual(alloy.Eg(T=300), Eg)
+        self.assertEqual(len(alloy._cache), size)
+        self.assertIn(('Eg', (('T', 300.),)), alloy._cache)
+
+if __name__ == '__main__':
+    unittest.main()
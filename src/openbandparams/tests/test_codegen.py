@@ -0,0 +1,247 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaAs, InP, GaSb, GaInAs, AlGaInAs, GaInAsSb,
+                            iii_v_zinc_blende_binaries,
+                            iii_v_zinc_blende_ternaries,
+                            iii_v_zinc_blende_quaternaries)
+from openbandparams import codegen
+from openbandparams.codegen import generate, get_database_hash
+from openbandparams.parameter import ValueParameter, FunctionParameter
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+NAMES = ['Eg', 'CBO', 'VBO', 'Eg_Gamma', 'Eg_X', 'a', 'meff_e_Gamma',
+         'luttinger1', 'Delta_SO', 'nonparabolicity', 'c11']
+
+
+class TestGenerate(unittest.TestCase):
+
+    def assert_generated(self, alloy, instance, *args):
+        T = numpy.array([0., 77., 300., 800.])
+        names = []
+        expected = []
+        for name in NAMES:
+            try:
+                expected.append(getattr(instance, name)(T=T))
+            except AttributeError:
+                # missing parameters are missing from the kernels, too
+                with self.assertRaises(AttributeError):
+                    generate(alloy, name, cache_dir=False)
+            else:
+                names.append(name)
+        kernel = generate(alloy, names, cache_dir=False)
+        for value, expected_value in zip(kernel(*(args + (T,))), expected):
+            numpy.testing.assert_allclose(value, expected_value,
+                                          rtol=1e-14, atol=0.)
+
+    def test_binaries(self):
+        for binary in iii_v_zinc_blende_binaries:
+            self.assert_generated(binary, binary)
+
+    def test_ternaries(self):
+        x = numpy.array([[0.], [0.3], [1.]])
+        for ternary in iii_v_zinc_blende_ternaries:
+            self.assert_generated(ternary, ternary(x=x), x)
+
+    def test_quaternaries(self):
+        x = numpy.array([[0.], [0.2], [0.5], [1.], [0.]])
+        y = numpy.array([[0.], [0.3], [0.5], [0.], [1.]])
+        for quaternary in iii_v_zinc_blende_quaternaries:
+            self.assert_generated(quaternary, quaternary(x=x, y=y), x, y)
+            # compositions are rounded, like the alloys
+            self.assert_generated(quaternary,
+                                  quaternary(x=0.1 + 1e-9, y=0.2), 0.1 + 1e-9,
+                                  0.2)
+
+    def test_strained(self):
+        strained = GaInAs(x=0.4).strained_001(InP)
+        self.assert_generated(strained, strained, 0.4)
+        strained = GaInAsSb(x=0.1, y=0.2).strained_001(GaSb)
+        self.assert_generated(strained, strained, 0.1, 0.2)
+        strained = GaAs.strained_001(0.01)
+        self.assert_generated(strained, strained)
+        kernel = generate(GaInAs.strained_001(InP), 'Eg_hh', cache_dir=False)
+        self.assertEqual(kernel(0.4, T=77.),
+                         GaInAs(x=0.4).strained_001(InP).Eg_hh(T=77.))
+
+    def test_multiple(self):
+        kernel = generate(AlGaInAs, ['Eg', 'CBO'], cache_dir=False)
+        Eg, CBO = kernel(0.2, 0.3, T=77.)
+        self.assertEqual(Eg, AlGaInAs(x=0.2, y=0.3).Eg(T=77.))
+        self.assertEqual(CBO, AlGaInAs(x=0.2, y=0.3).CBO(T=77.))
+
+    def test_source(self):
+        kernel = generate(GaInAs, 'Eg', function_name='GaInAs_Eg',
+                          cache_dir=False)
+        namespace = {}
+        exec(kernel.source, namespace)
+        self.assertEqual(namespace['GaInAs_Eg'](0.47, T=77.),
+                         GaInAs(x=0.47).Eg(T=77.))
+        # the default temperature is 300 K
+        self.assertEqual(kernel(0.47), GaInAs(x=0.47).Eg())
+
+    def test_branch(self):
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(FunctionParameter(
+            'Eg_Gamma', lambda **kwargs: 1. if kwargs['T'] > 300. else 2.,
+            units='eV'))
+        with self.assertRaises(TypeError):
+            generate(alloy, 'Eg_Gamma', cache_dir=False)
+
+    def test_database_hash(self):
+        self.assertEqual(get_database_hash(GaInAs),
+                         get_database_hash(GaInAs))
+        self.assertNotEqual(get_database_hash(GaInAs),
+                            get_database_hash(AlGaInAs))
+        alloy = GaInAs(x=0.3)
+        value = get_database_hash(alloy)
+        alloy.set_parameter(ValueParameter('Eg_Gamma_bowing', 0.5, 'eV'))
+        self.assertNotEqual(get_database_hash(alloy), value)
+        strained = GaInAs.strained_001(GaInAs(x=0.4))
+        self.assertNotEqual(get_database_hash(strained),
+                            get_database_hash(GaInAs.strained_001(
+                                GaInAs(x=0.5))))
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        codegen._kernels.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        codegen._kernels.clear()
+
+    def test_cache(self):
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        self.assertIs(generate(GaInAs(x=0.2), 'Eg', cache_dir=self.cache_dir),
+                      kernel)
+        filenames = os.listdir(self.cache_dir)
+        self.assertEqual(len(filenames), 2)
+
+        # load the kernel from disk
+        codegen._kernels.clear()
+        loaded = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        self.assertIsNot(loaded, kernel)
+        self.assertEqual(loaded.source, kernel.source)
+        self.assertEqual(loaded(0.3, T=77.), GaInAs(x=0.3).Eg(T=77.))
+
+        # changing the parameters generates a new kernel
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(ValueParameter('Eg_Gamma_bowing', 0.5, 'eV'))
+        changed = generate(alloy, 'Eg', cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+        self.assertEqual(changed(0.3, T=77.), alloy.Eg(T=77.))
+        self.assertNotEqual(changed(0.3, T=77.), kernel(0.3, T=77.))
+
+    def _get_path(self):
+        filename, = [filename for filename in os.listdir(self.cache_dir)
+                     if filename.endswith('.py')]
+        return os.path.join(self.cache_dir, filename)
+
+    def _check_regenerated(self, path, source):
+        codegen._kernels.clear()
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        self.assertEqual(kernel.source, source)
+        self.assertEqual(kernel(0.3, T=77.), GaInAs(x=0.3).Eg(T=77.))
+        with open(path) as f:
+            self.assertEqual(f.read(), source)
+
+    def test_corrupted(self):
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        path = self._get_path()
+        with open(path, 'w') as f:
+            f.write(kernel.source[:len(kernel.source) // 2])
+        self._check_regenerated(path, kernel.source)
+
+    def test_modified(self):
+        # valid code that doesn't match the hash isn't executed
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        path = self._get_path()
+        with open(path, 'w') as f:
+            f.write('raise RuntimeError\n')
+        self._check_regenerated(path, kernel.source)
+
+    def test_failed(self):
+        # code that matches the hash but fails to load is regenerated
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        path = self._get_path()
+        source = 'raise RuntimeError\n'
+        with open(path, 'w') as f:
+            f.write(source)
+        with open(path + '.sha1', 'w') as f:
+            f.write(codegen._hash_source(source))
+        self._check_regenerated(path, kernel.source)
+
+    def test_missing_hash(self):
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        path = self._get_path()
+        os.remove(path + '.sha1')
+        self._check_regenerated(path, kernel.source)
+        self.assertTrue(os.path.exists(path + '.sha1'))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'requires file ownership')
+    def test_not_private(self):
+        # kernels that others could have changed aren't executed
+        kernel = generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+        path = self._get_path()
+        source = 'raise RuntimeError\n'
+        with open(path, 'w') as f:
+            f.write(source)
+        with open(path + '.sha1', 'w') as f:
+            f.write(codegen._hash_source(source))
+        os.chmod(self.cache_dir, 0o777)
+        codegen._kernels.clear()
+        self.assertEqual(generate(GaInAs, 'Eg', cache_dir=self.cache_dir)
+                         .source, kernel.source)
+        # and aren't written there either
+        with open(path) as f:
+            self.assertEqual(f.read(), source)
+        os.chmod(self.cache_dir, 0o700)
+        os.chmod(path, 0o666)
+        self._check_regenerated(path, kernel.source)
+
+    def test_get_cache_dir(self):
+        # kernels are only cached on disk if a directory is given
+        environ = dict(os.environ)
+        try:
+            os.environ.pop('OPENBANDPARAMS_CACHE_DIR', None)
+            self.assertIsNone(codegen.get_cache_dir())
+            os.environ['OPENBANDPARAMS_CACHE_DIR'] = self.cache_dir
+            self.assertEqual(codegen.get_cache_dir(), self.cache_dir)
+            generate(GaInAs, 'Eg')
+            self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams.contours import find_contours
+import numpy
+import unittest
+
+
+def paraboloid(x, y):
+    return x ** 2 + y ** 2
+
+
+class TestContours(unittest.TestCase):
+
+    def test_closed(self):
+        xs = numpy.linspace(-1., 1., 21)
+        ys = numpy.linspace(-1., 1., 17)
+        values = paraboloid(*numpy.meshgrid(xs, ys))
+        contours = find_contours(values, [0.25, 0.81], xs, ys)
+        self.assertEqual(len(contours), 2)
+        for level, lines in zip([0.25, 0.81], contours):
+            self.assertEqual(len(lines), 1)
+            line = lines[0]
+            numpy.testing.assert_array_equal(line[0], line[-1])
+            numpy.testing.assert_allclose(paraboloid(*line.T), level,
+                                          atol=1e-2)
+
+    def test_refined(self):
+        xs = numpy.linspace(-1., 1., 11)
+        values = paraboloid(*numpy.meshgrid(xs, xs))
+        contours = find_contours(values, [0.25], xs, xs, func=paraboloid)
+        numpy.testing.assert_allclose(paraboloid(*contours[0][0].T), 0.25,
+                                      atol=1e-9)
+
+    def test_open(self):
+        xs = numpy.linspace(0., 1., 11)
+        values = paraboloid(*numpy.meshgrid(xs, xs))
+        lines = find_contours(values, [0.5], xs, xs, func=paraboloid)[0]
+        self.assertEqual(len(lines), 1)
+        # the quarter circle ends on the sides of the domain
+        ends = sorted(map(tuple, lines[0][[0, -1]].round(9)))
+        self.assertEqual(ends, [(0., 0.707106781), (0.707106781, 0.)])
+
+    def test_saddle(self):
+        xs = numpy.linspace(-1., 1., 5)
+        values = numpy.multiply.outer(xs, xs)
+        lines = find_contours(values, [0.1], xs, xs)[0]
+        self.assertEqual(len(lines), 2)
+        for line in lines:
+            self.assertTrue(numpy.all(line[:, 0] * line[:, 1] > 0.))
+
+    def test_triangle(self):
+        # the domain x + y <= 1, with nan outside
+        xs = numpy.linspace(0., 1., 11)
+        X, Y = numpy.meshgrid(xs, xs)
+        values = numpy.where(numpy.add.outer(numpy.arange(11),
+                                             numpy.arange(11)) <= 10,
+                             X - Y, numpy.nan)
+        lines = find_contours(values, [0.], xs, xs)[0]
+        self.assertEqual(len(lines), 1)
+        numpy.testing.assert_allclose(lines[0], [[0.1 * i] * 2
+                                                 for i in range(6)],
+                                      atol=1e-12)
+        # the contour ends on the diagonal boundary
+        lines = find_contours(values, [0.4], xs, xs)[0]
+        self.assertAlmostEqual(lines[0][:, 0].max(), 0.7)
+        self.assertAlmostEqual(lines[0][:, 1].max(), 0.3)
+
+    def test_no_contours(self):
+        xs = numpy.linspace(0., 1., 5)
+        values = paraboloid(*numpy.meshgrid(xs, xs))
+        self.assertEqual(find_contours(values, [5.], xs, xs,
+                                       func=paraboloid), [[]])
+
+    def test_shape(self):
+        with self.assertRaises(ValueError):
+            find_contours(numpy.zeros((3, 4)), [0.], numpy.zeros(3),
+                          numpy.zeros(4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaAs, GaP, InP, GaInAs, AlGaInAs, GaInAsSb,
+                            Dual)
+from openbandparams.dual import where, select
+import numpy
+import unittest
+
+
+def central_difference(func, x, h=1e-4):
+    return (func(x + h) - func(x - h)) / (2. * h)
+
+
+class TestDual(unittest.TestCase):
+
+    def test_arithmetic(self):
+        x = Dual(0.3, {'x': 1.})
+        y = Dual(2., {'y': 1.})
+        z = (x * y + x / y - 1. / x + x ** 2 + 2. ** x - x ** y) * 3.
+        self.assertAlmostEqual(z.derivative('x'),
+                               3. * (2. + 0.5 + 1. / 0.09 + 0.6 +
+                                     numpy.log(2.) * 2. ** 0.3 - 0.6))
+        self.assertAlmostEqual(z.derivative('y'),
+                               3. * (0.3 - 0.3 / 4. -
+                                     0.09 * numpy.log(0.3)))
+        self.assertEqual(z.derivative('T'), 0.)
+
+    def test_ufuncs(self):
+        x = Dual(numpy.array([0.3, 0.6]), {'x': 1.})
+        z = numpy.tanh(x) + numpy.sqrt(x) + numpy.minimum(x, 0.5)
+        numpy.testing.assert_allclose(
+            z.derivative('x'),
+            1. - numpy.tanh(x.value) ** 2 + 0.5 / numpy.sqrt(x.value) +
+            numpy.array([1., 0.]))
+        z = numpy.array([1., 2.]) * x
+        numpy.testing.assert_allclose(z.derivative('x'), [1., 2.])
+
+    def test_where_select(self):
+        x = Dual(numpy.array([0., 0.5]), {'x': 1.})
+        z = where(x == 0., 2. * x, 3. * x)
+        numpy.testing.assert_allclose(z.derivative('x'), [2., 3.])
+        z = select([x == 0.], [2. * x], 1.)
+        numpy.testing.assert_allclose(z.value, [0., 1.])
+        numpy.testing.assert_allclose(z.derivative('x'), [2., 0.])
+
+    def test_comparisons(self):
+        x = Dual(0.5, {'x': 1.})
+        self.assertTrue(0. <= x <= 1.)
+        self.assertTrue(x == 0.5)
+        self.assertRaises(TypeError, hash, x)
+
+
+class Override(object):
+    '''
+    Overrides `where` and `select` by returning the function and arguments.
+    '''
+    def __obp_function__(self, function, args):
+        return function, args
+
+
+class TestOverride(unittest.TestCase):
+
+    def test_where(self):
+        value = Override()
+        self.assertEqual(where(True, value, 1.), (where, (True, value, 1.)))
+        self.assertEqual(where(value, 1., Dual(2.)),
+                         (where, (value, 1., Dual(2.))))
+
+    def test_select(self):
+        value = Override()
+        self.assertEqual(select([False, True], [1., 2.], value),
+                         (select, ([False, True], [1., 2.], value)))
+
+    def test_round(self):
+        rounded = numpy.round(Dual(0.12345678, {'x': 1.}), 6)
+        self.assertEqual(rounded.value, 0.123457)
+        self.assertEqual(rounded.derivatives, {'x': 1.})
+        rounded = Dual(numpy.array([0.1234564, 0.1234566]), {'x': 1.}).round(6)
+        self.assertTrue(numpy.array_equal(rounded.value, [0.123456, 0.123457]))
+
+
+class TestDifferentiate(unittest.TestCase):
+
+    def assert_derivatives(self, alloy, factory, name, composition, T=250.):
+        result = alloy.differentiate(name, T=T)
+        self.assertAlmostEqual(result.value, getattr(alloy, name)(T=T))
+        for variable, x in composition.items():
+            def func(value):
+                kwargs = dict(composition)
+                kwargs[variable] = value
+                return getattr(factory(**kwargs), name)(T=T)
+            self.assertAlmostEqual(result.derivative(variable),
+                                   central_difference(func, x), places=5)
+        self.assertAlmostEqual(
+            result.derivative('T'),
+            central_difference(lambda T: getattr(alloy, name)(T=T), T),
+            places=6)
+
+    def test_binary(self):
+        for binary in [GaAs, GaP, InP]:
+            for name in ['Eg', 'CBO', 'a', 'meff_e_Gamma']:
+                self.assert_derivatives(binary, None, name, {})
+        self.assertEqual(sorted(GaAs.differentiate('Eg').derivatives), ['T'])
+
+    def test_ternary(self):
+        for name in ['Eg', 'CBO', 'VBO', 'a', 'meff_e_Gamma', 'luttinger32',
+                     'nonparabolicity']:
+            self.assert_derivatives(GaInAs(x=0.4), GaInAs, name, {'x': 0.4})
+
+    def test_quaternary(self):
+        for quaternary in [AlGaInAs, GaInAsSb]:
+            for name in ['Eg', 'CBO', 'VBO', 'a', 'meff_e_Gamma']:
+                self.assert_derivatives(quaternary(x=0.3, y=0.4), quaternary,
+                                        name, {'x': 0.3, 'y': 0.4})
+
+    def test_strained(self):
+        def factory(x):
+            return GaInAs(x=x).strained_001(InP)
+        for name in ['Eg', 'Eg_hh', 'VBO_hh', 'VBO_lh', 'strain_in_plane']:
+            self.assert_derivatives(factory(0.4), factory, name, {'x': 0.4})
+
+    def test_arrays(self):
+        xs = numpy.linspace(0.1, 0.9, 5)
+        Ts = numpy.array([[77.], [300.]])
+        result = AlGaInAs(x=xs / 2., y=xs / 2.).differentiate('Eg', T=Ts)
+        for name in ['x', 'y', 'T']:
+            self.assertEqual(result.derivative(name).shape, (2, 5))
+        scalar = AlGaInAs(x=xs[1] / 2., y=xs[1] / 2.).differentiate('Eg',
+                                                                   T=77.)
+        self.assertAlmostEqual(result.derivative('x')[0, 1],
+                               scalar.derivative('x'))
+
+    def test_no_composition(self):
+        with self.assertRaises(TypeError):
+            GaInAs.differentiate('Eg')
+
+if __name__ == '__main__':
+    unittest.main()
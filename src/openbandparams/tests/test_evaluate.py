@@ -0,0 +1,196 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from openbandparams import (GaAs, GaInAs, AlGaInAs, GaInAsSb, InP, GaSb, AlN,
+                            AlGaN, MissingParameterError)
+
+from openbandparams import GaAs, GaInAs, AlGaInAs, GaInAsSb, InP, GaSb
+from openbandparams.parameter import MethodParameter
+import numpy
+import unittest
+
+NAMES = ['Eg', 'CBO', 'VBO', 'meff_e_Gamma', 'CBO_Gamma', 'CBO_L', 'CBO_X']
+
+
+class TestEvaluate(unittest.TestCase):
+
+    def test_values(self):
+        Ts = numpy.linspace(0., 800., 5)
+        for alloy in [GaAs, GaInAs(x=0.47), AlGaInAs(x=0.2, y=0.3),
+                      GaInAsSb(x=0.2, y=0.3),
+                      GaInAsSb(x=numpy.linspace(0., 1., 5), y=0.3),
+                      GaInAs(x=0.4).strained_001(InP)]:
+            for T in [77., Ts]:
+                values = alloy.evaluate(NAMES, T=T)
+                self.assertEqual(sorted(values), sorted(NAMES))
+                for name in NAMES:
+                    numpy.testing.assert_array_equal(
+                        values[name], getattr(alloy, name)(T=T))
+            for a in alloy._get_lineage():
+                self.assertIsNone(a._memo)
+
+    def test_evaluated_once(self):
+        calls = []
+
+        def Eg_Gamma(alloy, **kwargs):
+            calls.append(kwargs)
+            return 1.
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(MethodParameter('Eg_Gamma', Eg_Gamma,
+                                            dependencies=[], units='eV'))
+        values = alloy.evaluate(['Eg', 'CBO', 'CBO_Gamma', 'Eg_Gamma'],
+                                T=numpy.array([77., 300.]))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(values['Eg_Gamma'], 1.)
+        alloy.Eg()
+        self.assertEqual(len(calls), 2)
+
+    def test_evaluated_once_default_T(self):
+        # the default temperature is filled in, so that `Eg_Gamma()` and
+        # `Eg_Gamma(T=300.)` are the same call
+        calls = []
+
+        def Eg_Gamma(alloy, **kwargs):
+            calls.append(kwargs)
+            return 1.
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(MethodParameter('Eg_Gamma', Eg_Gamma,
+                                            dependencies=[], units='eV'))
+        alloy.set_parameter(MethodParameter(
+            'Eg_L', lambda alloy, **kwargs: alloy.Eg_Gamma(),
+            dependencies=['Eg_Gamma'], units='eV'))
+        alloy.set_parameter(MethodParameter(
+            'Eg_X', lambda alloy, **kwargs: alloy.Eg_Gamma(T=300.),
+            dependencies=['Eg_Gamma'], units='eV'))
+        alloy.evaluate(['Eg_L', 'Eg_X'])
+        self.assertEqual(len(calls), 1)
+
+    def test_plan(self):
+        alloy = GaInAsSb(x=0.2, y=0.3)
+        plan = alloy.get_evaluation_plan(['CBO', 'Eg'])
+        self.assertEqual(len(plan), len(set(plan)))
+        for i, name in enumerate(plan):
+            for dependency in getattr(alloy, name).dependencies:
+                if dependency != name and dependency in plan:
+                    self.assertLess(plan.index(dependency), i)
+        self.assertEqual(plan[-1], 'CBO')
+        self.assertIn('Eg_Gamma', plan)
+        self.assertIn('VBO', plan)
+
+    def test_plan_invalidated(self):
+        alloy = GaInAs(x=0.3)
+        self.assertNotIn('VBO_bowing', alloy.get_evaluation_plan(['VBO']))
+        alloy.set_parameter(MethodParameter(
+            'VBO', lambda alloy, **kwargs: alloy.VBO_bowing(**kwargs),
+            dependencies=['VBO_bowing'], units='eV'))
+        alloy.set_parameter(MethodParameter(
+            'VBO_bowing', lambda alloy, **kwargs: 0.1,
+            dependencies=[], units='eV'))
+        self.assertEqual(alloy.get_evaluation_plan(['VBO']),
+                         ['VBO_bowing', 'VBO'])
+        self.assertEqual(alloy.evaluate(['VBO'])['VBO'], 0.1)
+
+    def test_missing(self):
+        with self.assertRaises(AttributeError):
+            GaAs.evaluate(['Eg', 'not_a_parameter'])
+        # missing parameters, including those needed by other parameters,
+        # raise MissingParameterError
+        with self.assertRaises(MissingParameterError):
+            GaAs.evaluate(['Eg', 'not_a_parameter'])
+        with self.assertRaises(MissingParameterError):
+            AlN.thermal_expansion()
+        with self.assertRaises(MissingParameterError):
+            AlGaN(x=0.5).a()
+        # other attributes don't
+        try:
+            GaAs.not_an_attribute
+        except AttributeError as error:
+            self.assertNotIsInstance(error, MissingParameterError)
+        else:
+            self.fail('no AttributeError')
+
+class TestEvaluateTable(unittest.TestCase):
+
+    def assert_table(self, table, alloy, **kwargs):
+        self.assertEqual(table.dtype.names, tuple(NAMES))
+        for name in NAMES:
+            # parameters that don't depend on all of the conditions are
+            # broadcast to the shape of the table
+            expected = getattr(alloy, name)(**kwargs)
+            numpy.testing.assert_array_equal(
+                table[name], numpy.broadcast_to(expected, table.shape))
+
+    def test_binary(self):
+        T = numpy.array([0., 77., 300.])
+        table = GaAs.evaluate_table(NAMES, T=T)
+        self.assertEqual(table.shape, (3,))
+        self.assert_table(table, GaAs, T=T)
+        self.assertEqual(GaAs.evaluate_table(NAMES).shape, ())
+        with self.assertRaises(TypeError):
+            GaAs.evaluate_table(NAMES, x=0.5)
+
+    def test_ternary(self):
+        x = numpy.linspace(0., 1., 5)[:, numpy.newaxis]
+        T = numpy.array([77., 300.])
+        table = GaInAs.evaluate_table(NAMES, x=x, T=T)
+        self.assertEqual(table.shape, (5, 2))
+        self.assert_table(table, GaInAs(x=x), T=T)
+        table = GaInAs.evaluate_table(NAMES, a=InP.a(), T=77.)
+        self.assert_table(table, GaInAs(a=InP.a(), T=77.), T=77.)
+
+    def test_lattice_matched(self):
+        # the alloy is lattice matched at each temperature
+        T = numpy.array([77., 300.])
+        table = GaInAs.evaluate_table(['Eg', 'a'], a=InP.a(), T=list(T))
+        self.assertEqual(table.shape, (2,))
+        numpy.testing.assert_allclose(table['a'], InP.a(), rtol=1e-6)
+        alloy = GaInAs(a=InP.a(), T=T)
+        numpy.testing.assert_array_equal(table['Eg'], alloy.Eg(T=T))
+        table = AlGaInAs.evaluate_table(['a'], a=InP.a(T=T), x=0.1, T=T)
+        numpy.testing.assert_allclose(table['a'], InP.a(T=T), rtol=1e-6)
+
+    def test_lists(self):
+        table = GaAs.evaluate_table(['Eg'], T=[4, 300])
+        numpy.testing.assert_array_equal(table['Eg'],
+                                         GaAs.Eg(T=numpy.array([4., 300.])))
+        table = GaInAs.evaluate_table(['Eg'], x=[0.2, 0.5])
+        numpy.testing.assert_array_equal(table['Eg'],
+                                         [GaInAs(x=0.2).Eg(),
+                                          GaInAs(x=0.5).Eg()])
+
+    def test_quaternary(self):
+        x = numpy.linspace(0., 0.5, 4)
+        table = AlGaInAs.evaluate_table(NAMES, x=x, y=0.3)
+        self.assertEqual(table.shape, (4,))
+        self.assert_table(table, AlGaInAs(x=x, y=0.3))
+
+    def test_strained(self):
+        x = numpy.array([0.1, 0.2])
+        table = GaInAsSb.strained_001(GaSb).evaluate_table(NAMES, x=x, y=0.2,
+                                                           T=77.)
+        self.assert_table(table, GaInAsSb(x=x, y=0.2).strained_001(GaSb),
+                          T=77.)
+
+if __name__ == '__main__':
+    unittest.main()
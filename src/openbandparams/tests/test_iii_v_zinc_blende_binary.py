@@ -25,6 +25,7 @@ sys.path.insert(0,
 
 from openbandparams import iii_v_zinc_blende_binaries, GaAs, InAs
 from openbandparams import *
+import numpy
 import unittest
 
 
@@ -42,6 +43,11 @@ class TestIIIVZincBlendeBinary(unittest.TestCase):
         self.assertEqual(GaAs, GaAs)
         self.assertNotEqual(GaAs, InAs)
 
+    def test_bound_parameter_reused(self):
+        self.assertIs(GaAs.Eg, GaAs.Eg)
+        self.assertIs(GaAs.Eg.alloy, GaAs)
+        self.assertIsNot(GaAs.Eg, InAs.Eg)
+
     def test_a_300K(self):
         self.assertAlmostEqual(GaAs.a_300K(), 5.65325, places=5)
 
@@ -134,6 +140,34 @@ class TestIIIVZincBlendeBinary(unittest.TestCase):
         self.assert_(strained.VBO_strain_shift() > 0)
         self.assert_(strained.Eg_strain_shift() < 0)
         self.assert_(strained.Eg() < unstrained.Eg())
+
+    def test_Eg_X_zero_beta(self):
+        # InP has beta_X = 0, which must not divide by zero at T = 0
+        self.assertEqual(InP.Eg_X(T=0), InP.Eg_X_0())
+
+    def test_array_T(self):
+        Ts = numpy.linspace(0, 400, 9)
+        for binary in [GaAs, GaP, InP, GaSb]:
+            for name in ['Eg', 'Eg_Gamma', 'CBO', 'a', 'nonparabolicity']:
+                values = getattr(binary, name)(T=Ts)
+                self.assertEqual(values.shape, Ts.shape)
+                for T, value in zip(Ts, values):
+                    self.assertAlmostEqual(value,
+                                           getattr(binary, name)(T=T),
+                                           places=12)
+
+    def test_strained_array_T(self):
+        Ts = numpy.linspace(0, 400, 9)
+        for strained in [GaAs.strained_001(InAs), InAs.strained_001(GaAs),
+                         GaAs.strained_001(0.01)]:
+            for name in ['Eg', 'VBO', 'VBO_strain_shift', 'Eg_hh']:
+                # some of these don't depend on T, but they must broadcast
+                values = numpy.broadcast_to(getattr(strained, name)(T=Ts),
+                                            Ts.shape)
+                for T, value in zip(Ts, values):
+                    self.assertAlmostEqual(value,
+                                           getattr(strained, name)(T=T),
+                                           places=12)
         
 
 if __name__ == '__main__':
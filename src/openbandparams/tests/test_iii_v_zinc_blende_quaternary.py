@@ -27,6 +27,7 @@ from openbandparams import (iii_v_zinc_blende_quaternaries, GaAs, AlAs, GaSb,
                             AlGaInAs, AlPAsSb, AlGaAsSb, GaPAsSb, AlGaInSb,
                             AlGaPAs, AlInAsSb)
 from openbandparams import *
+import numpy
 import unittest
 
 
@@ -135,10 +136,150 @@ class TestIIIVZincBlendeQuaternary(unittest.TestCase):
         self.assertEqual(AlGaPAs(x=0, y=0).Eg(), GaAs.Eg())
         self.assertEqual(AlGaPAs(x=1, y=0).Eg(), AlAs.Eg())
 
+    def assert_array_matches_scalars(self, quaternary, x, y):
+        instance = quaternary(x=x, y=y)
+        for name in ['Eg', 'CBO', 'VBO', 'a', 'meff_e_Gamma', 'luttinger1']:
+            values = getattr(instance, name)(T=77)
+            self.assertEqual(values.shape, x.shape)
+            for xi, yi, value in zip(x.flat, y.flat, values.flat):
+                expected = getattr(quaternary(x=xi, y=yi), name)(T=77)
+                self.assertAlmostEqual(value, expected, places=12)
+
+    def test_quaternary1or2_array(self):
+        # includes the binary and ternary edges
+        x = numpy.array([[0., 0., 1., 0.2, 0.5], [0., 0.3, 0.1, 0.6, 0.]])
+        y = numpy.array([[0., 1., 0., 0.3, 0.5], [0.4, 0., 0.9, 0.1, 0.]])
+        self.assert_array_matches_scalars(AlGaInAs, x, y)
+        self.assert_array_matches_scalars(AlPAsSb, x, y)
+
+    def test_quaternary3_array(self):
+        x, y = numpy.meshgrid(numpy.linspace(0, 1, 5),
+                              numpy.linspace(0, 1, 4))
+        self.assert_array_matches_scalars(AlGaAsSb, x, y)
+        self.assert_array_matches_scalars(AlInAsSb, x, y)
+
+    def test_array_out_of_range(self):
+        with self.assertRaises(ValueError):
+            AlGaInAs(x=numpy.array([0.2, 0.6]), y=numpy.array([0.2, 0.6]))
+
     def test_non_instanced_lattice_matching(self):
         Eg1 = AlInAsSb(Al=0, a=GaSb.a()).Eg()
         Eg2 = AlInAsSb(Al=0, a=GaSb.a(), T=300.).Eg()
         self.assertEqual(Eg1, Eg2)
 
+    def test_array_lattice_matching(self):
+        Ts = numpy.array([300., 500., 700.])
+        xs = numpy.array([[0.], [0.1], [0.2]])
+        for quaternary, substrate in [(AlGaInAs, InP), (GaInAsSb, GaSb)]:
+            a = substrate.a(T=Ts)
+            instance = quaternary(x=xs, a=a, T=Ts)
+            ys = instance._xyz[1]
+            self.assertEqual(ys.shape, (3, 3))
+            for i, x in enumerate(xs.flat):
+                for j, T in enumerate(Ts):
+                    expected = quaternary(x=x, a=a[j], T=T)._xyz[1]
+                    self.assertEqual(ys[i, j], expected)
+
+    def test_iso_lattice_curve(self):
+        for quaternary, substrate in [(GaInAsSb, GaSb), (AlGaInAs, InP),
+                                      (GaInPAs, InP)]:
+            for axis in ['x', 'y']:
+                curve = quaternary.iso_lattice_curve(
+                    substrate.a(T=800.), T=800., n=11, axis=axis,
+                    parameters=['Eg', 'a'])
+                self.assertEqual(curve['x'].shape, (11,))
+                numpy.testing.assert_allclose(curve['a'],
+                                              substrate.a(T=800.),
+                                              rtol=1e-6)
+                # the interior points match scalar lattice matching
+                for x, y, Eg in list(zip(curve['x'], curve['y'],
+                                         curve['Eg']))[1:-1]:
+                    if axis == 'x':
+                        alloy = quaternary(x=x, a=substrate.a(T=800.),
+                                           T=800.)
+                    else:
+                        alloy = quaternary(y=y, a=substrate.a(T=800.),
+                                           T=800.)
+                    self.assertAlmostEqual(alloy._xyz[0], x)
+                    self.assertAlmostEqual(alloy._xyz[1], y)
+                    self.assertAlmostEqual(alloy.Eg(T=800.), Eg)
+
+    def test_iso_lattice_curve_ends(self):
+        # GaInPAs is lattice matched to InP from InP to GaInAs
+        curve = GaInPAs.iso_lattice_curve(InP.a(), n=5,
+                                          parameter_kwargs={'T': 77.},
+                                          parameters=['Eg'])
+        self.assertEqual((curve['x'][0], curve['y'][0]), (0., 1.))
+        self.assertEqual(curve['y'][-1], 0.)
+        self.assertAlmostEqual(curve['x'][-1], GaInAs(a=InP.a())._x,
+                               places=6)
+        self.assertAlmostEqual(curve['Eg'][0], InP.Eg(T=77.))
+
+    def test_iso_lattice_curve_no_match(self):
+        with self.assertRaises(ValueError):
+            AlGaInAs.iso_lattice_curve(InSb.a())
+        with self.assertRaises(ValueError):
+            AlGaInAs.iso_lattice_curve(InP.a(), axis='z')
+
+    def test_solve_lattice_matched(self):
+        for quaternary, substrate, Egs in [(GaInAsSb, GaSb, [0.3, 0.5, 0.7]),
+                                           (AlGaInAs, InP, [0.8, 1.0, 1.4]),
+                                           (GaInPAs, InP, [0.8, 1.0, 1.3])]:
+            for maxiter in [20, 0]:  # Newton's method, and bisection only
+                alloy = quaternary.solve_lattice_matched(
+                    'Eg', Egs, substrate.a(), maxiter=maxiter)
+                numpy.testing.assert_allclose(alloy.Eg(), Egs, atol=1e-5)
+                numpy.testing.assert_allclose(alloy.a(), substrate.a(),
+                                              atol=1e-5)
+
+    def test_solve_lattice_matched_boundary(self):
+        # values next to the ends of the iso-lattice curve, where the
+        # compositions are at their bounds
+        Egs = [InP.Eg() - 1e-3, GaInAs(a=InP.a()).Eg() + 1e-3]
+        alloy = GaInPAs.solve_lattice_matched('Eg', Egs, InP.a())
+        numpy.testing.assert_allclose(alloy.Eg(), Egs, atol=1e-5)
+        numpy.testing.assert_allclose(alloy.a(), InP.a(), atol=1e-5)
+
+    def test_solve_lattice_matched_shape(self):
+        CBOs = numpy.array([[0.5, 0.6], [0.7, 0.75]])
+        alloy = GaInAsSb.solve_lattice_matched('CBO', CBOs, GaSb.a(T=800.),
+                                               T=800., axis='y',
+                                               parameter_kwargs={'T': 77.})
+        self.assertEqual(alloy.element_fraction('Ga').shape, (2, 2))
+        numpy.testing.assert_allclose(alloy.CBO(T=77.), CBOs, atol=1e-5)
+        numpy.testing.assert_allclose(alloy.a(T=800.), GaSb.a(T=800.),
+                                      atol=1e-5)
+
+    def test_solve_lattice_matched_no_solution(self):
+        with self.assertRaises(ValueError):
+            GaInAsSb.solve_lattice_matched('Eg', [0.5, 2.], GaSb.a())
+
+    def test_array_lattice_matching_out_of_range(self):
+        with self.assertRaises(ValueError):
+            AlGaInAs(x=0.1, a=numpy.array([InP.a(), 7.]))
+
+    def test_iso_parameter_contours(self):
+        levels = [0.5, 1.0, 1.5]
+        for alloy in [AlGaInAs, GaInAsSb]:
+            contours = alloy.iso_parameter_contours('Eg', levels, n=21)
+            self.assertEqual(len(contours), len(levels))
+            for level, lines in zip(levels, contours):
+                for line in lines:
+                    self.assertEqual(line.shape[1], 2)
+                    x, y = line.T
+                    self.assertTrue(numpy.all(x >= 0.) and numpy.all(y >= 0.))
+                    if alloy is AlGaInAs:
+                        self.assertTrue(numpy.all(x + y <= 1. + 1e-9))
+                    numpy.testing.assert_allclose(
+                        alloy(x=x, y=y).Eg(), level, atol=1e-5)
+
+    def test_iso_parameter_contours_strained(self):
+        contours = GaInAsSb.iso_parameter_contours(
+            'strain_out_of_plane', [0.], n=21, substrate=GaSb,
+            parameter_kwargs={'T': 77.})
+        x, y = contours[0][0].T
+        numpy.testing.assert_allclose(GaInAsSb(x=x, y=y).a(T=77.),
+                                      GaSb.a(T=77.), atol=1e-5)
+
 if __name__ == '__main__':
     unittest.main()
@@ -26,6 +26,9 @@ sys.path.insert(0,
 from openbandparams import (iii_v_zinc_blende_ternaries,
                             GaAs, AlAs, AlGaAs, GaAsSb, AlPAs, GaInAs)
 from openbandparams import *
+from openbandparams.parameter import MethodParameter, FunctionParameter
+from openbandparams.roots import bisect
+import numpy
 import unittest
 
 
@@ -70,5 +73,124 @@ class TestIIIVZincBlendeTernary(unittest.TestCase):
         self.assertEqual(AlGaAs(x=0).Eg(), GaAs.Eg())
         self.assertEqual(AlGaAs(x=1).Eg(), AlAs.Eg())
 
+    def test_instance_shares_parameters(self):
+        instance = GaInAs(x=0.3)
+        self.assertIs(instance._parameters, GaInAs._parameters)
+        self.assertEqual(instance.Eg_Gamma_bowing(), 0.477)
+
+    def test_instance_copy_on_write(self):
+        prototype = IIIVZincBlendeTernary(name='AlGaAs',
+                                          elements=('Al', 'Ga', 'As'),
+                                          binaries=(AlAs, GaAs))
+        instance1 = prototype(x=0.3)
+        instance1.set_parameter(ValueParameter('Eg_Gamma_bowing', 1., 'eV'))
+        self.assertFalse(prototype.has_parameter('Eg_Gamma_bowing'))
+        # instancing an instance adopts its parameters
+        instance2 = instance1(x=0.3)
+        self.assertEqual(instance2.Eg_Gamma(), instance1.Eg_Gamma())
+        # changing the prototype only alters future instances
+        prototype.set_parameter(ValueParameter('Eg_Gamma_bowing', 2., 'eV'))
+        self.assertEqual(instance1.Eg_Gamma_bowing(), 1.)
+        self.assertEqual(instance2.Eg_Gamma_bowing(), 1.)
+        self.assertEqual(prototype(x=0.3).Eg_Gamma_bowing(), 2.)
+
+    def test_instance_method_parameter(self):
+        prototype = IIIVZincBlendeTernary(name='AlGaAs',
+                                          elements=('Al', 'Ga', 'As'),
+                                          binaries=(AlAs, GaAs))
+        prototype.set_parameter(MethodParameter(
+            'Al_fraction', lambda alloy, **kwargs: alloy._x,
+            dependencies=[], units='dimensionless', aliases=['xAl']))
+        self.assertEqual(prototype(x=0.3).Al_fraction(), 0.3)
+        self.assertEqual(prototype(x=0.4).Al_fraction(), 0.4)
+        self.assertEqual(prototype(x=0.4).xAl(), 0.4)
+
+    def test_array_x(self):
+        xs = numpy.linspace(0, 1, 11)
+        instance = AlGaAs(x=xs)
+        for name in ['Eg', 'CBO', 'VBO', 'a', 'meff_e_Gamma', 'luttinger3',
+                     'nonparabolicity', 'electron_affinity']:
+            values = getattr(instance, name)(T=77)
+            self.assertEqual(values.shape, xs.shape)
+            for x, value in zip(xs, values):
+                self.assertAlmostEqual(value,
+                                       getattr(AlGaAs(x=x), name)(T=77),
+                                       places=12)
+
+    def test_array_x_shape(self):
+        xs = numpy.linspace(0, 1, 6).reshape(2, 3)
+        self.assertEqual(GaInAs(x=xs).Eg().shape, (2, 3))
+        numpy.testing.assert_allclose(AlGaAs(Ga=1 - xs).Eg(),
+                                      AlGaAs(Al=xs).Eg())
+
+    def test_array_x_and_T(self):
+        xs = numpy.linspace(0, 1, 5)
+        Ts = numpy.linspace(0, 400, 3)
+        values = GaInAs(x=xs[:, numpy.newaxis]).Eg(T=Ts)
+        self.assertEqual(values.shape, (5, 3))
+        for i, x in enumerate(xs):
+            for j, T in enumerate(Ts):
+                self.assertAlmostEqual(values[i, j], GaInAs(x=x).Eg(T=T),
+                                       places=12)
+
+    def test_array_x_out_of_range(self):
+        with self.assertRaises(ValueError):
+            AlGaAs(x=numpy.array([0., 0.5, 1.1]))
+
+    def _assert_lattice_matched(self, alloy):
+        for T in [77., 300., 800.]:
+            a = 0.3 * InP.a(T=T) + 0.7 * InAs.a(T=T)
+            x = alloy(a=a, T=T)._x
+            self.assertAlmostEqual(alloy(x=x).a(T=T), a, places=12)
+            self.assertAlmostEqual(
+                x, bisect(func=lambda x: alloy(x=x).a(T=T) - a, a=0, b=1),
+                places=10)
+
+    def test_lattice_match(self):
+        self._assert_lattice_matched(InPAs)
+        self.assertAlmostEqual(GaInAs(a=InAs.a())._x, 0.)
+        self.assertAlmostEqual(GaInAs(a=GaAs.a())._x, 1.)
+
+    def test_lattice_match_value_bowing(self):
+        alloy = InPAs(x=0.5)
+        alloy.set_parameter(ValueParameter('a_300K_bowing', 0.1, 'angstrom'))
+        alloy.set_parameter(ValueParameter('thermal_expansion_bowing', 1e-5,
+                                           'angstrom/K'))
+        self.assertIsNotNone(alloy._get_lattice_coefficients(T=300.))
+        self._assert_lattice_matched(alloy)
+
+    def test_lattice_match_function_bowing(self):
+        alloy = InPAs(x=0.5)
+        alloy.set_parameter(FunctionParameter('a_300K_bowing',
+                                              lambda x, **kwargs: 0.1 * x,
+                                              'angstrom'))
+        self.assertIsNone(alloy._get_lattice_coefficients(T=300.))
+        self._assert_lattice_matched(alloy)
+
+    def test_array_lattice_matching(self):
+        Ts = numpy.linspace(300., 800., 6)
+        a = InP.a(T=Ts)
+        xs = GaInAs(a=a, T=Ts)._x
+        self.assertEqual(xs.shape, Ts.shape)
+        for x, ai, T in zip(xs, a, Ts):
+            self.assertEqual(x, GaInAs(a=ai, T=T)._x)
+        # broadcast a single lattice constant against the temperatures
+        xs = GaInAs(a=InP.a(), T=Ts[:, numpy.newaxis])._x
+        self.assertEqual(xs.shape, (6, 1))
+
+    def test_array_lattice_matching_function_bowing(self):
+        alloy = InPAs(x=0.5)
+        alloy.set_parameter(FunctionParameter('a_300K_bowing',
+                                              lambda x, **kwargs: 0.1 * x,
+                                              'angstrom'))
+        a = numpy.linspace(InAs.a(), InP.a(), 5)
+        xs = alloy(a=a)._x
+        for x, ai in zip(xs, a):
+            self.assertEqual(x, alloy(a=ai)._x)
+
+    def test_array_lattice_matching_out_of_range(self):
+        with self.assertRaises(ValueError):
+            GaInAs(a=numpy.array([InP.a(), 7.]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,152 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from openbandparams import GaInAs, AlGaInAs, GaInAsSb, Dual
+from openbandparams.dual import where, select, weighted_average
+from openbandparams.interval import Interval
+import numpy
+import unittest
+
+
+def contains(interval, values, tolerance=1e-12):
+    lower = numpy.min(values, axis=0)
+    upper = numpy.max(values, axis=0)
+    return numpy.all((interval.lower <= lower + tolerance) &
+                     (upper - tolerance <= interval.upper))
+
+
+class TestInterval(unittest.TestCase):
+
+    def setUp(self):
+        self.a = Interval(numpy.array([-0.5, 0.2, 1.]),
+                          numpy.array([0.3, 0.4, 2.]))
+        self.b = Interval(numpy.array([0.5, -2., 0.1]),
+                          numpy.array([1., -1., 0.1]))
+        # samples of values in a and b
+        t = numpy.linspace(0., 1., 11)[:, numpy.newaxis]
+        self.sa = self.a.lower + t * (self.a.upper - self.a.lower)
+        self.sb = self.b.lower + t[::-1] * (self.b.upper - self.b.lower)
+
+    def test_arithmetic(self):
+        a, b, sa, sb = self.a, self.b, self.sa, self.sb
+        for function in [lambda a, b: a + b, lambda a, b: a - b,
+                         lambda a, b: 2. - a * b, lambda a, b: b / a,
+                         lambda a, b: a / b, lambda a, b: a ** 2 * b,
+                         lambda a, b: b ** 3 - a ** -1, lambda a, b: -abs(a),
+                         lambda a, b: (a - b) * (a + b)]:
+            with numpy.errstate(divide='ignore'):
+                self.assertTrue(contains(function(a, b), function(sa, sb)))
+        # dividing by an interval that contains zero is unbounded
+        self.assertEqual((1. / a).upper[0], numpy.inf)
+        self.assertEqual((a ** 2).lower[0], 0.)
+
+    def test_ufuncs(self):
+        a, b, sa, sb = self.a, self.b, self.sa, self.sb
+        for function in [numpy.tanh, numpy.exp, numpy.sign,
+                         lambda a: numpy.sqrt(abs(a)),
+                         lambda a: numpy.minimum(a, 0.35),
+                         lambda a: numpy.maximum(a, [0., 1., 0.])]:
+            self.assertTrue(contains(function(a), function(sa)))
+        # values below the domain make the bounds unknown
+        self.assertTrue(numpy.all(numpy.isnan(numpy.sqrt(a)[0].lower)))
+        self.assertTrue(contains(numpy.sqrt(a)[1:], numpy.sqrt(sa[:, 1:])))
+        self.assertTrue(contains(numpy.log(a)[1:], numpy.log(sa[:, 1:])))
+        self.assertTrue(contains(a[1:] ** 0.5, sa[:, 1:] ** 0.5))
+
+    def test_comparisons(self):
+        x = Interval(0., 1.)
+        self.assertTrue((x < 2.).lower)
+        self.assertFalse((x < 0.5).lower)
+        self.assertTrue((x < 0.5).upper)
+        self.assertFalse((x > 1.).upper)
+        self.assertTrue((x == 0.5).upper)
+        self.assertFalse((x == 0.5).lower)
+        self.assertTrue((Interval(1., 1.) == 1.).lower)
+        self.assertTrue((x != 2.).lower)
+        unknown = Interval(numpy.nan, 1.)
+        self.assertFalse((unknown > 0.).lower)
+        self.assertTrue((unknown > 0.).upper)
+        self.assertTrue(((x < 2.) & (x <= 1.)).lower)
+        self.assertFalse(((x < 0.5) | (x > 2.)).lower)
+        self.assertTrue((~(x > 2.)).lower)
+        self.assertTrue(x < 2.)
+        self.assertFalse(x > 2.)
+        with self.assertRaises(TypeError):
+            bool(x < 0.5)
+
+    def test_where(self):
+        x = Interval(numpy.array([0., 1.]), numpy.array([1., 2.]))
+        y = where(x < 1., x, 10.)
+        numpy.testing.assert_array_equal(y.lower, [0., 10.])
+        numpy.testing.assert_array_equal(y.upper, [10., 10.])
+        y = select([x > 2., x <= 1.], [-x, x], 5.)
+        numpy.testing.assert_array_equal(y.lower, [0., 1.])
+        numpy.testing.assert_array_equal(y.upper, [1., 5.])
+
+    def test_weighted_average(self):
+        w = Interval(0., 1.)
+        v1, v2 = Interval(1., 2.), 3.
+        # the naive bounds are unbounded, as the weights may all be zero
+        value = weighted_average(w * v1 + w * v2, w + w, [v1, v2])
+        self.assertEqual((value.lower, value.upper), (1., 3.))
+        self.assertEqual(weighted_average(3., 2., [1., 2.]), 1.5)
+
+    def test_round(self):
+        x = numpy.round(Interval(0.1234567, 0.7654321), 6)
+        self.assertEqual((x.lower, x.upper), (0.123457, 0.765432))
+
+    def test_dual(self):
+        # a Dual with interval values bounds the derivatives
+        x = Dual(Interval(0.2, 0.4), {'x': 1.})
+        y = numpy.tanh(x) * x ** 2 - numpy.minimum(x, 0.3)
+        t = numpy.linspace(0.2, 0.4, 21)
+        self.assertTrue(contains(
+            y.value, numpy.tanh(t) * t ** 2 - numpy.minimum(t, 0.3)))
+        self.assertTrue(contains(
+            y.derivative('x'),
+            (1. - numpy.tanh(t) ** 2) * t ** 2 + 2. * t * numpy.tanh(t) -
+            numpy.where(t <= 0.3, 1., 0.)))
+
+    def test_alloys(self):
+        # the bounds of parameters over boxes contain their values
+        for alloy, n in [(GaInAs, 1), (AlGaInAs, 2), (GaInAsSb, 2)]:
+            lower = numpy.array([[0.1, 0.2], [0.5, 0.], [0., 0.]])[:, :n]
+            upper = lower + 0.05
+            variables = ['x', 'y'][:n]
+            columns = dict(zip(variables, zip(lower.T, upper.T)))
+            box, _ = alloy._with_composition_variables(
+                lambda name, value: Interval(*columns[name]))
+            t = numpy.linspace(0., 1., 6)
+            grid = [g.ravel() for g in numpy.meshgrid(*([t] * n))]
+            for name in ['Eg', 'a', 'CBO']:
+                bound = getattr(box, name)(T=77.)
+                for i in range(len(lower)):
+                    points = dict((v, lower[i, j] + 0.05 * grid[j])
+                                  for j, v in enumerate(variables))
+                    values = getattr(alloy(**points), name)(T=77.)
+                    self.assertTrue(contains(bound[i], values),
+                                    (alloy.name, name, i))
+
+if __name__ == '__main__':
+    unittest.main()
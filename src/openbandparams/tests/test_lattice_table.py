@@ -0,0 +1,109 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import GaAs, InAs, InP, GaInAs, AlGaAs, FunctionParameter
+from openbandparams.lattice_table import LatticeTable
+import numpy
+import unittest
+
+
+def bowed_GaInAs(bowing):
+    alloy = GaInAs._instance()
+    alloy.set_parameter(FunctionParameter('a_300K_bowing',
+                                          lambda **kwargs: bowing,
+                                          units='Angstrom'))
+    return alloy
+
+
+class TestLatticeTable(unittest.TestCase):
+
+    def test_lookup(self):
+        table = GaInAs.get_lattice_table()
+        a = numpy.linspace(InP.a() - 0.1, InP.a() + 0.1, 21)
+        T = numpy.array([[0.], [77.], [300.], [1000.]])
+        x = table(a=a, T=T)
+        self.assertEqual(x.shape, (4, 21))
+        numpy.testing.assert_allclose(x, GaInAs(a=a, T=T)._x, atol=1e-6)
+
+    def test_scalar(self):
+        table = GaInAs.get_lattice_table()
+        x = table(a=InP.a())
+        self.assertTrue(numpy.isscalar(x))
+        self.assertAlmostEqual(x, GaInAs(a=InP.a())._x, places=6)
+
+    def test_ends(self):
+        table = AlGaAs.get_lattice_table()
+        for T in [0., 1000.]:
+            self.assertAlmostEqual(table(a=GaAs.a(T=T), T=T),
+                                   AlGaAs(a=GaAs.a(T=T), T=T)._x, places=6)
+
+    def test_error_estimate(self):
+        # with a strongly bowed lattice parameter and a coarse table, the
+        # error estimate is large, and the compositions must be solved for
+        alloy = bowed_GaInAs(0.3)
+        table = LatticeTable(alloy, nx=11, nT=11, xtol=1e-6)
+        a = numpy.linspace(5.7, 6.0, 31)
+        T = numpy.linspace(0., 1000., 31)
+        exact = alloy._lattice_match(a, T)
+        estimate = table.get_error_estimate(a, T)
+        self.assertTrue(numpy.all(estimate > 1e-6))
+        interpolated = table._locate(a, T)[-1]
+        self.assertTrue(numpy.all(abs(interpolated - exact) <= estimate))
+        numpy.testing.assert_allclose(table(a, T), exact, atol=1e-6)
+
+    def test_default_bowed(self):
+        alloy = bowed_GaInAs(0.3)
+        table = alloy.get_lattice_table()
+        a = numpy.linspace(5.7, 6.0, 31)
+        numpy.testing.assert_allclose(table(a), alloy._lattice_match(a, 300.),
+                                      atol=1e-6)
+
+    def test_not_monotonic(self):
+        with self.assertRaises(ValueError):
+            LatticeTable(bowed_GaInAs(5.), nx=11, nT=2)
+
+    def test_out_of_range(self):
+        table = GaInAs.get_lattice_table()
+        with self.assertRaises(ValueError):
+            table(a=InAs.a() + 0.01)
+        with self.assertRaises(ValueError):
+            table(a=InP.a(), T=1001.)
+
+    def test_cached(self):
+        alloy = GaInAs._instance()
+        table = alloy.get_lattice_table()
+        self.assertIs(alloy.get_lattice_table(), table)
+        self.assertIsNot(alloy.get_lattice_table(nT=11), table)
+        alloy.set_parameter(FunctionParameter('a_300K_bowing',
+                                              lambda **kwargs: 0.1,
+                                              units='Angstrom'))
+        rebuilt = alloy.get_lattice_table()
+        self.assertIsNot(rebuilt, table)
+        self.assertAlmostEqual(rebuilt(a=InP.a()),
+                               alloy._lattice_match(InP.a(), 300.), places=6)
+
+if __name__ == '__main__':
+    unittest.main()
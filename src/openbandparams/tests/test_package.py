@@ -0,0 +1,98 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+import openbandparams
+from openbandparams import _alloy_index
+import subprocess
+import unittest
+
+
+class TestLazyAlloys(unittest.TestCase):
+
+    def test_all(self):
+        namespace = {}
+        exec('from openbandparams import *', namespace)
+        for name in openbandparams.__all__:
+            self.assertIn(name, namespace)
+        self.assertEqual(len(set(openbandparams.__all__)),
+                         len(openbandparams.__all__))
+        self.assertEqual(namespace['GaAs'].name, 'GaAs')
+        self.assertIs(namespace['GaInAsSb'], openbandparams.GaInAsSb)
+
+    def test_alloy_index(self):
+        # the generated index is up to date (see `_alloy_index.main`)
+        with open(_alloy_index.__file__.replace('.pyc', '.py')) as f:
+            self.assertIn(_alloy_index.get_source(), f.read())
+        self.assertEqual(openbandparams._alloy_modules,
+                         _alloy_index.get_alloy_modules())
+
+    def test_alloy_modules(self):
+        # the listed names match the alloys that each module defines
+        for module_name, names in openbandparams._alloy_modules:
+            alloys = getattr(openbandparams, module_name)
+            self.assertIsInstance(alloys, list)
+            module = sys.modules['openbandparams.' + module_name]
+            self.assertEqual(names, module.__all__)
+            self.assertEqual(names[1:], [alloy.name for alloy in alloys])
+            for alloy in alloys:
+                self.assertIs(getattr(openbandparams, alloy.name), alloy)
+
+    def test_missing(self):
+        self.assertFalse(hasattr(openbandparams, 'GaAsP'))
+        with self.assertRaises(ImportError):
+            exec('from openbandparams import GaAsP', {})
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'module __getattr__ requires Python 3.7')
+    def test_lazy(self):
+        code = '\n'.join([
+            'import sys',
+            'import openbandparams',
+            'def loaded():',
+            '    return sorted(name.split(".")[1] for name in sys.modules',
+            '                  if name.startswith("openbandparams.iii_v_")',
+            '                  and name.endswith("ies"))',
+            'print(loaded())',
+            'from openbandparams import GaAs',
+            'print(loaded())',
+            'print("GaInAs" in dir(openbandparams))',
+            'print(openbandparams.GaInAs.name)',
+            'print(loaded())',
+        ])
+        output = subprocess.check_output(
+            [sys.executable, '-c', code], universal_newlines=True,
+            cwd=os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                             '../..')))
+        self.assertEqual(output.splitlines(), [
+            "[]",
+            "['iii_v_zinc_blende_binaries']",
+            "True",
+            "GaInAs",
+            "['iii_v_zinc_blende_binaries', 'iii_v_zinc_blende_ternaries']",
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaAs, GaInAs, AlInAs, AlGaInAs, InP,
+                            IIIVZincBlendeTernary, ValueParameter)
+from openbandparams.parameter import (Parameter, FunctionParameter,
+                                      method_parameter)
+from openbandparams.reference import BibtexReference
+import unittest
+
+
+class TestParameter(unittest.TestCase):
+
+    def test_shared_metadata(self):
+        p1 = ValueParameter('Eg', 1., 'eV')
+        p2 = FunctionParameter('Eg', lambda: 1., 'eV')
+        self.assertIs(p1._metadata, p2._metadata)
+        self.assertEqual(p1.description, 'bandgap energy')
+        self.assertEqual(p1.aliases, ())
+        self.assertEqual(p1.get_references(), [])
+        p3 = ValueParameter('Eg', 1., 'eV', aliases=['Eg_alias'])
+        self.assertIsNot(p1._metadata, p3._metadata)
+        self.assertEqual(p3.aliases, ('Eg_alias',))
+
+    def test_bound_metadata(self):
+        a1 = GaInAs(x=0.1)
+        a2 = GaInAs(x=0.2)
+        self.assertIsNot(a1.Eg, a2.Eg)
+        self.assertIs(a1.Eg._metadata, a2.Eg._metadata)
+        self.assertIs(a1.Eg.alloy, a1)
+
+    def test_slots(self):
+        p = ValueParameter('Eg', 1., 'eV')
+        self.assertFalse(hasattr(p, '__dict__'))
+        self.assertFalse(hasattr(GaAs.Eg, '__dict__'))
+        self.assertRaises(AttributeError, setattr, p, 'foo', 1)
+
+
+
+class TestClassParameters(unittest.TestCase):
+
+    def test_unique_parameters(self):
+        for alloy in [GaAs, GaInAs(x=0.3), AlGaInAs(x=0.2, y=0.3),
+                      GaInAs(x=0.3).strained_001(InP)]:
+            # found by searching the added and class attributes of the alloy
+            expected = set(alloy._parameters.values())
+            for name in dir(alloy):
+                item = getattr(alloy, name)
+                if isinstance(item, Parameter):
+                    expected.add(item)
+            parameters = alloy.get_unique_parameters()
+            self.assertEqual(len(parameters), len(set(parameters)))
+            self.assertEqual(set(parameters), expected)
+
+    def test_has_parameter(self):
+        alloy = GaInAs(x=0.3)
+        self.assertTrue(alloy.has_parameter('Eg'))
+        self.assertTrue(alloy.has_parameter('Eg_Gamma_bowing'))
+        self.assertFalse(alloy.has_parameter('new_bowing'))
+        self.assertFalse(alloy.has_parameter('latex'))
+        self.assertFalse(alloy.has_parameter('name'))
+        self.assertIs(alloy.get_parameter('Eg'), alloy.Eg)
+        self.assertIsNone(alloy.get_parameter('latex'))
+        alloy.set_parameter(ValueParameter('new_bowing', 0.1, 'eV',
+                                           aliases=['new_b']))
+        self.assertTrue(alloy.has_parameter('new_b'))
+        self.assertIs(alloy.get_parameter('new_b'), alloy.new_bowing)
+
+    def test_subclass(self):
+        class Ternary(IIIVZincBlendeTernary):
+            @method_parameter(dependencies=[], units='eV')
+            def new_parameter(self, **kwargs):
+                return 1.
+
+            # replaces a parameter with an ordinary attribute
+            Eg_X = None
+
+        self.assertIn('new_parameter', Ternary._class_parameters)
+        self.assertIn('Eg', Ternary._class_parameters)
+        self.assertNotIn('Eg_X', Ternary._class_parameters)
+        self.assertIn('Eg_X', IIIVZincBlendeTernary._class_parameters)
+        self.assertNotIn('new_parameter',
+                         IIIVZincBlendeTernary._class_parameters)
+
+
+class TestReferences(unittest.TestCase):
+
+    def test_no_duplicates(self):
+        for alloy in [GaAs, GaInAs(x=0.3), AlGaInAs(x=0.2, y=0.3),
+                      GaInAs(x=0.3).strained_001(InP)]:
+            for name in ['Eg', 'CBO', 'VBO', 'meff_e_Gamma']:
+                refs = getattr(alloy, name).get_references()
+                self.assertTrue(refs)
+                self.assertEqual(len(refs), len(set(refs)))
+
+    def test_includes_dependencies(self):
+        refs = GaInAs(x=0.3).Eg.get_references()
+        for name in ['Eg_Gamma', 'Eg_Gamma_0', 'Eg_X']:
+            for alloy in [GaInAs] + list(GaInAs.binaries):
+                p = alloy.get_parameter(name)
+                if p is not None:
+                    for ref in p.get_references():
+                        self.assertIn(ref, refs)
+
+    def test_strained(self):
+        # the strained band edges depend on the unstrained ones, which have
+        # the same names
+        alloy = GaInAs(x=0.3).strained_001(InP)
+        self.assertIn(alloy.VBO_hh_strain_shift.get_references()[0],
+                      alloy.Eg_hh.get_references())
+
+    def test_set_parameter_invalidates(self):
+        alloy = GaInAs(x=0.3)
+        ref = BibtexReference('@misc{test}')
+        self.assertNotIn(ref, alloy.Eg.get_references())
+        alloy.set_parameter(ValueParameter('Eg_Gamma', 1., 'eV',
+                                           references=[ref]))
+        self.assertIn(ref, alloy.Eg.get_references())
+        self.assertNotIn(ref, GaInAs.Eg.get_references())
+
+    def test_parent_set_parameter_invalidates(self):
+        GaInAs_InP = GaInAs(a=InP.a())
+        AlInAs_InP = AlInAs(a=InP.a())
+        AlGaInAs_InP = IIIVZincBlendeTernary(
+            name='AlGaInAs/InP',
+            elements=('Al', 'Ga', 'InAs'),
+            binaries=(AlInAs_InP, GaInAs_InP),
+            parameters=[])
+        alloy = AlGaInAs_InP(Al=0.5)
+        ref = BibtexReference('@misc{test}')
+        self.assertNotIn(ref, alloy.Eg.get_references())
+        GaInAs_InP.set_parameter(ValueParameter('Eg_Gamma', 1., 'eV',
+                                                references=[ref]))
+        self.assertIn(ref, alloy.Eg.get_references())
+
+if __name__ == '__main__':
+    unittest.main()
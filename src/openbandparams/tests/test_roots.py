@@ -0,0 +1,150 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams.roots import bisect, brentq, itp
+import numpy
+import unittest
+
+
+def cubic(x):
+    return x ** 3 - 2. * x - 5.
+
+CUBIC_ROOT = 2.0945514815423265
+
+
+class TestRoots(unittest.TestCase):
+
+    methods = [bisect, brentq, itp]
+
+    def test_scalar(self):
+        for method in self.methods:
+            root = method(cubic, 2., 3.)
+            self.assertAlmostEqual(root, CUBIC_ROOT, places=11)
+            self.assertTrue(numpy.isscalar(root))
+
+    def test_reversed_brackets(self):
+        for method in self.methods:
+            self.assertAlmostEqual(method(cubic, 3., 2.), CUBIC_ROOT,
+                                   places=11)
+            self.assertAlmostEqual(method(lambda x: -cubic(x), 2., 3.),
+                                   CUBIC_ROOT, places=11)
+
+    def test_root_at_bracket(self):
+        for method in self.methods:
+            self.assertEqual(method(lambda x: x - 1., 1., 2.), 1.)
+            self.assertEqual(method(lambda x: x - 2., 1., 2.), 2.)
+
+    def test_arrays(self):
+        slopes = numpy.array([0.5, 1., 2., 4.])
+        for method in self.methods:
+            roots = method(lambda x, slope: numpy.cos(x) - slope * x,
+                           numpy.zeros(4), 2., args=(slopes,))
+            self.assertEqual(roots.shape, (4,))
+            numpy.testing.assert_allclose(numpy.cos(roots), slopes * roots,
+                                          atol=1e-11)
+            # each element converges as it would on its own
+            for root, slope in zip(roots, slopes):
+                self.assertEqual(
+                    root, method(lambda x: numpy.cos(x) - slope * x, 0., 2.))
+
+    def test_converged_not_evaluated(self):
+        # only the elements that haven't converged are evaluated
+        sizes = []
+
+        def func(x, offset):
+            sizes.append(numpy.size(x))
+            return x - offset
+        offsets = numpy.array([0., 1., 0.25, 0.3])
+        for method in self.methods:
+            del sizes[:]
+            roots, results = method(func, 0., 1., args=(offsets,),
+                                    full_output=True)
+            numpy.testing.assert_allclose(roots, offsets, atol=1e-11)
+            # the brackets, then one per iteration of each element
+            self.assertEqual(sum(sizes[2:]), results.iterations.sum())
+            self.assertEqual(len(sizes), results.evaluations)
+
+    def test_cached_endpoints(self):
+        calls = []
+
+        def func(x):
+            calls.append(x)
+            return cubic(x)
+        for method in self.methods:
+            del calls[:]
+            root = method(func, 2., 3., fa=cubic(2.), fb=cubic(3.))
+            self.assertAlmostEqual(root, CUBIC_ROOT, places=11)
+            self.assertNotIn(2., calls)
+            self.assertNotIn(3., calls)
+
+    def test_full_output(self):
+        for method in self.methods:
+            root, results = method(cubic, 2., 3., full_output=True)
+            self.assertEqual(results.root, root)
+            self.assertEqual(results.method, method.__name__)
+            self.assertTrue(results.converged)
+            # the brackets, plus one evaluation per iteration
+            self.assertEqual(results.evaluations, results.iterations + 2)
+        _, results = bisect(cubic, 2., 3., full_output=True)
+        self.assertEqual(results.iterations, 40)
+        _, results = brentq(cubic, 2., 3., full_output=True)
+        self.assertLess(results.iterations, 10)
+        _, results = itp(cubic, 2., 3., full_output=True)
+        self.assertLess(results.iterations, 10)
+
+    def test_full_output_arrays(self):
+        for method in self.methods:
+            root, results = method(cubic, numpy.array([2., 1.]), 3.,
+                                   full_output=True)
+            self.assertEqual(results.iterations.shape, (2,))
+            self.assertEqual(results.evaluations,
+                             results.iterations.max() + 2)
+            numpy.testing.assert_array_equal(results.converged, True)
+
+    def test_discontinuous(self):
+        for method in self.methods:
+            root = method(lambda x: numpy.round(x, 6) - 0.3, 0., 1.,
+                          xtol=1e-7)
+            self.assertAlmostEqual(root, 0.3, places=6)
+
+    def test_same_sign(self):
+        for method in self.methods:
+            with self.assertRaises(ValueError):
+                method(cubic, 3., 4.)
+            with self.assertRaises(ValueError):
+                method(cubic, numpy.array([2., 3.]), 4.)
+
+    def test_no_convergence(self):
+        for method in self.methods:
+            with self.assertRaises(RuntimeError):
+                method(cubic, 2., 3., maxiter=2)
+            root, results = method(cubic, 2., 3., maxiter=2,
+                                   full_output=True)
+            self.assertFalse(results.converged)
+            self.assertEqual(results.iterations, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#
+#   Copyright (c) 2013-2015, Scott J Maddox
+#
+#   This file is part of openbandparams.
+#
+#   openbandparams is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   openbandparams is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with openbandparams.  If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+# Make sure we import the local package
+import os
+import sys
+sys.path.insert(0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+from openbandparams import (GaSb, InP, GaInAs, AlGaN, GaInAsSb, AlGaInAs,
+                            GaInNAs, ValueParameter, FunctionParameter)
+from openbandparams.search import Constraint, lattice_matched, search
+import numpy
+import unittest
+
+
+def satisfied(alloy, constraints):
+    ok = True
+    for constraint in constraints:
+        value = constraint.evaluate(alloy)
+        ok = ok & (value >= constraint.minimum) & (value <= constraint.maximum)
+    return ok
+
+
+class TestSearch(unittest.TestCase):
+
+    def check_result(self, alloy, constraints, resolution):
+        result, = search(constraints, alloys=[alloy], resolution=resolution)
+        self.assertIs(result['alloy'], alloy)
+        fractions = numpy.linspace(0., 1., 101)
+        x, y = [g.ravel() for g in numpy.meshgrid(fractions, fractions)]
+        valid = (x + y <= 1. + 1e-12) | (alloy._type == 3)
+        x, y = x[valid], numpy.minimum(y[valid], 1. - x[valid])
+        ok = satisfied(alloy(x=x, y=y), constraints)
+        self.assertTrue(numpy.any(ok))
+        lower = numpy.stack([result['x'][:, 0], result['y'][:, 0]], axis=-1)
+        upper = numpy.stack([result['x'][:, 1], result['y'][:, 1]], axis=-1)
+        for point, point_ok in zip(numpy.stack([x, y], axis=-1), ok):
+            # the distance from the point to the nearest box
+            distance = numpy.maximum(lower - point, point - upper).max(axis=1)
+            if point_ok:
+                # every feasible point is within a box
+                self.assertLessEqual(distance.min(), 0.)
+            elif numpy.any((distance <= 0.) & result['certain']):
+                self.fail('infeasible point {} in a certain box'
+                          ''.format(point))
+
+    def test_quaternary3(self):
+        self.check_result(GaInAsSb,
+                          [Constraint('Eg', 0.45, 0.55, T=77.),
+                           lattice_matched(GaSb, tolerance=1e-2)],
+                          resolution=5e-3)
+
+    def test_quaternary1or2(self):
+        self.check_result(AlGaInAs, [Constraint('Eg', 1., 1.5),
+                                     Constraint('CBO', minimum=0.2)],
+                          resolution=5e-3)
+
+    def test_dilute_nitride(self):
+        # the bandgap changes quickly with the nitrogen fraction, and the
+        # feasible region is narrow near x = 0, y = 0.82
+        constraints = [Constraint('Eg', 1., 1.1, T=300.)]
+        self.check_result(GaInNAs, constraints, resolution=5e-3)
+        result, = search(constraints, alloys=[GaInNAs])
+        point = numpy.array([0., 0.82])
+        self.assertTrue(satisfied(GaInNAs(x=point[0], y=point[1]),
+                                  constraints))
+        self.assertTrue(numpy.any((result['x'][:, 0] <= point[0]) &
+                                  (result['x'][:, 1] >= point[0]) &
+                                  (result['y'][:, 0] <= point[1]) &
+                                  (result['y'][:, 1] >= point[1])))
+
+    def test_ternary(self):
+        results = search([lattice_matched(InP, tolerance=1e-4)],
+                         alloys=[GaInAs])
+        self.assertEqual(len(results), 1)
+        x = results[0]['x']
+        self.assertNotIn('y', results[0])
+        self.assertLess(x.min(), GaInAs(a=InP.a())._x)
+        self.assertGreater(x.max(), GaInAs(a=InP.a())._x)
+
+    def test_no_results(self):
+        self.assertEqual(search([Constraint('Eg', minimum=10.)],
+                                alloys=[GaInAs, GaInAsSb]), [])
+
+    def test_missing_parameter(self):
+        # the nitrides are missing thermal expansion coefficients, which
+        # are needed for the lattice parameter
+        results = search([lattice_matched(InP)], alloys=[AlGaN, GaInAs])
+        self.assertEqual([r['alloy'] for r in results], [GaInAs])
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            search([Constraint('Egg', 0.45, 0.55)], alloys=[GaInAs, AlGaN])
+        # alloys without the parameter are skipped
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(ValueParameter('new', 1., 'eV'))
+        results = search([Constraint('new', 0.5, 1.5)],
+                         alloys=[GaInAs, alloy])
+        self.assertEqual([r['alloy'] for r in results], [alloy])
+
+    def test_errors(self):
+        # other errors aren't hidden
+        alloy = GaInAs(x=0.3)
+        alloy.set_parameter(FunctionParameter(
+            'new', lambda **kwargs: kwargs['missing'].value, 'eV'))
+        with self.assertRaises(AttributeError):
+            search([Constraint('new', 0.5, 1.5, missing=None)],
+                   alloys=[alloy])
+
+    def test_constraint(self):
+        constraint = Constraint('Eg', maximum=1., T=77.)
+        self.assertEqual(constraint.minimum, -numpy.inf)
+        self.assertEqual(constraint.evaluate(GaInAs(x=0.47)),
+                         GaInAs(x=0.47).Eg(T=77.))
+        strained = Constraint('Eg', substrate=InP)
+        self.assertEqual(strained.evaluate(GaInAs(x=0.4)),
+                         GaInAs(x=0.4).strained_001(InP).Eg())
+
+if __name__ == '__main__':
+    unittest.main()